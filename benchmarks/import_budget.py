@@ -0,0 +1,104 @@
+"""
+Import-time budget for src.util and the pipeline entry points.
+
+Every case runs in a fresh interpreter that first imports numpy and pandas
+(needed by everything, so not counted). The case's statement is then timed
+and the modules it pulled in are checked against a list of heavy
+dependencies that only plotting and the Open-Meteo client may load.
+
+Usage:
+    python -m benchmarks.import_budget              # exit 1 if a budget is exceeded
+    python -m benchmarks.import_budget --repeat 9 --scale 2
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Loaded lazily: matplotlib by util.plotting, the rest by the first weather call
+HEAVY_MODULES = ("matplotlib", "geopy", "openmeteo_requests", "requests_cache", "retry_requests")
+
+
+class Case(NamedTuple):
+    name: str
+    statement: str
+    budget_s: float
+    forbidden: tuple[str, ...] = HEAVY_MODULES
+
+
+CASES = [
+    Case("import src.util", "from src import util", 0.05),
+    Case("import src.util.prices", "import src.util.prices", 0.25),
+    Case("import src.util.weather", "import src.util.weather", 0.05),
+    Case("import src.util.features", "import src.util.features", 0.05),
+    Case("util.fetch_electricity_prices", "from src import util; util.fetch_electricity_prices", 0.25),
+    Case("util.add_calendar_features", "from src import util; util.add_calendar_features", 0.05),
+    Case("import src.pipelines.ingest", "import src.pipelines.ingest", 0.05),
+]
+
+_PROBE = """
+import json, sys, time
+import numpy, pandas
+before = set(sys.modules)
+t0 = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def measure(case: Case) -> dict:
+    """Run one case in a fresh interpreter."""
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(statement=case.statement)],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run_case(case: Case, repeat: int, scale: float) -> dict:
+    runs = [measure(case) for _ in range(repeat)]
+    seconds = min(r["seconds"] for r in runs)
+    loaded = {m.split(".")[0] for m in runs[0]["modules"]}
+    heavy = sorted(loaded & set(case.forbidden))
+    budget = case.budget_s * scale
+    return {
+        "name": case.name,
+        "seconds": seconds,
+        "budget": budget,
+        "heavy": heavy,
+        "ok": seconds <= budget and not heavy,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per case (min is reported)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply all budgets (slow machines)")
+    args = parser.parse_args(argv)
+
+    results = [run_case(c, args.repeat, args.scale) for c in CASES]
+
+    width = max(len(r["name"]) for r in results)
+    for r in results:
+        status = "ok" if r["ok"] else "FAIL"
+        heavy = f"  loads {', '.join(r['heavy'])}" if r["heavy"] else ""
+        print(f"{r['name']:<{width}}  {r['seconds'] * 1e3:7.1f} ms  (budget {r['budget'] * 1e3:.0f} ms)  {status}{heavy}")
+
+    failed = [r["name"] for r in results if not r["ok"]]
+    if failed:
+        print(f"\n{len(failed)} case(s) over budget: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
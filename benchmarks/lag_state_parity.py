@@ -0,0 +1,83 @@
+"""
+Parity of util.PriceLagState with the batch add_feature_group_price_lags.
+
+Replays a synthetic hourly price series the way the daily pipelines see it:
+every day first the next 48 hours as forecast rows (price_sek NaN), then
+the actual prices of the next 24 hours. Each price area has one missing
+hour in the middle. The features of the actual rows must equal the batch
+path over the final series.
+
+Usage:
+    python -m benchmarks.lag_state_parity            # exit 1 on a mismatch
+    python -m benchmarks.lag_state_parity --days 60 --forecast-hours 72
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.util.features import FEATURE_PRICE_LAGS, PriceLagState, add_feature_group_price_lags
+
+FEATURE_COLUMNS = [f"price_lag_{lag}" for lag in FEATURE_PRICE_LAGS] + ["price_roll3d"]
+
+
+def _series(days: int, areas: list[str]) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = days * 24
+    start = pd.Timestamp("2025-01-01", tz="UTC").value // 10**6
+    frames = []
+    for area in areas:
+        prices = rng.gamma(2.0, 0.4, n).astype("float32")
+        prices[n // 2] = np.nan
+        frames.append(pd.DataFrame({
+            "price_area": area,
+            "unix_time": start + np.arange(n, dtype=np.int64) * 3_600_000,
+            "price_sek": prices,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def replay(df: pd.DataFrame, forecast_hours: int) -> pd.DataFrame:
+    """Features of the actual rows, fed day by day after forecast rows."""
+    state = PriceLagState()
+    times = df["unix_time"]
+    hours = np.sort(times.unique())
+    end = hours[-1] + 1
+
+    def window(i: int, n: int) -> pd.DataFrame:
+        return df[(times >= hours[i]) & (times < (hours[i + n] if i + n < len(hours) else end))]
+
+    out = [state.update(df[times < hours[72]])]
+    for i in range(72, len(hours), 24):
+        state.update(window(i, forecast_hours).assign(price_sek=np.nan))
+        out.append(state.update(window(i, 24)))
+    return pd.concat(out, ignore_index=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--forecast-hours", type=int, default=48)
+    args = parser.parse_args(argv)
+
+    df = _series(args.days, ["se3", "se4"])
+    batch = add_feature_group_price_lags(df).set_index(["price_area", "unix_time"])
+    incremental = replay(df, args.forecast_hours).set_index(["price_area", "unix_time"])
+
+    expected = batch.loc[incremental.index, FEATURE_COLUMNS]
+    failed = 0
+    for col in FEATURE_COLUMNS:
+        same = np.isclose(incremental[col], expected[col], equal_nan=True)
+        failed += int((~same).sum())
+        print(f"{col:<14} {int(same.sum())}/{len(same)} match")
+
+    if failed or len(incremental) != len(batch):
+        print(f"\nMismatch: {failed} value(s) differ, {len(incremental)} of {len(batch)} rows replayed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,534 @@
+"""
+Benchmark suite for src/util and src/inference.
+
+Runs the fetchers against local stand-ins (see benchmarks/stubs.py) and the
+transform, plotting and inference helpers on synthetic frames, at sizes from
+one day to three years, and writes the timings as JSON so runs on different
+commits can be compared.
+
+    python -m benchmarks.run                          # default sizes
+    python -m benchmarks.run --sizes 1,30 --latency-ms 20 --only fetch
+    python -m benchmarks.run --compare benchmarks/results/<base>.json
+
+Results go to benchmarks/results/<commit>.json unless --output is given.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+
+from src import inference, util, validation
+from src.util.schema import unix_time_ms
+from src.pipelines import common
+from benchmarks.stubs import ElprisStub, OpenMeteoStub, elpris_day_payload, openmeteo_message, patch_util
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+RESULTS_SCHEMA = 1
+
+# Sizes in days: one day, one month, one year, three years
+DEFAULT_SIZES = [1, 30, 365, 1095]
+
+# First day of every benchmark range
+BENCH_START = date(2023, 1, 1)
+
+BENCH_LATITUDE, BENCH_LONGITUDE = 59.3293, 18.0686
+
+
+# =============================================================================
+# Inputs
+# =============================================================================
+
+def _price_frame(days: int) -> pd.DataFrame:
+    """Hourly prices in the fetch_electricity_prices schema."""
+    ts = pd.date_range(pd.Timestamp(BENCH_START, tz="Europe/Stockholm"), periods=days * 24, freq="h").tz_convert("UTC")
+    local = ts.tz_convert("Europe/Stockholm")
+    price = (0.5 + 0.3 * np.sin(np.arange(len(ts)) / 24 * 2 * np.pi)).astype("float32")
+    return pd.DataFrame({
+        "timestamp": ts,
+        "date": local.tz_localize(None).normalize(),
+        "hour": local.hour.astype("int16"),
+        "price_area": "SE3",
+        "price_sek": price,
+        "price_eur": price / 11.2,
+        "exchange_rate": np.float32(11.2),
+    })
+
+
+def _hindcast_frame(days: int) -> pd.DataFrame:
+    """Input of plot_electricity_price_forecast in hindcast mode."""
+    df = _price_frame(days)[["timestamp", "price_sek"]].rename(columns={"timestamp": "date"})
+    df["predicted_price_sek"] = df["price_sek"] * 1.05
+    return df
+
+
+def _next_day_frame() -> pd.DataFrame:
+    """Input of plot_next_day_price_forecast (one day of hourly predictions)."""
+    df = _price_frame(1)
+    return df[["date", "hour"]].assign(predicted_price_sek=df["price_sek"].to_numpy())
+
+
+def _native_series(days: int):
+    """`days` of quarter-hour prices (SE3) as an intraday.PriceSeries."""
+    dates = [date(2025, 10, 1) + timedelta(days=i) for i in range(days)]
+    records = [elpris_day_payload(d, step_minutes=15) for d in dates]
+    return util.prices._price_records_to_series(dates, records, "SE3")
+
+
+BENCH_AREAS = ["SE1", "SE2", "SE3", "SE4"]
+
+# Columns of the feature view model (weather + electricity_prices_* features)
+MODEL_FEATURES = [
+    "hour",
+    *util.HOURLY_WEATHER_VARIABLES,
+    *(f"electricity_prices_{c}" for c in [
+        "unix_time", "weekday", "is_weekend", "month", "season", "is_holiday",
+        "price_lag_24", "price_lag_48", "price_lag_72", "price_roll3d",
+    ]),
+]
+
+
+def _model_frame(days: int, seed: int = 0) -> pd.DataFrame:
+    """Model inputs for `days` of hourly rows with synthetic weather."""
+    rng = np.random.default_rng(seed)
+    prices = _price_frame(days)
+    ts = prices["timestamp"]
+    df = pd.DataFrame({"hour": ts.dt.hour})
+    for col in util.HOURLY_WEATHER_VARIABLES:
+        df[col] = rng.normal(size=len(df)).astype("float32")
+    # Milliseconds whatever the timestamp unit (ns on pandas 2, s on pandas 3)
+    keys = unix_time_ms(ts)
+    assert (np.diff(keys) == 3_600_000).all(), "model frame keys are not unique hourly unix_time (ms)"
+    df["electricity_prices_unix_time"] = keys
+    df["electricity_prices_weekday"] = ts.dt.weekday
+    df["electricity_prices_is_weekend"] = (ts.dt.weekday >= 5).astype("int8")
+    df["electricity_prices_month"] = ts.dt.month
+    df["electricity_prices_season"] = ts.dt.month.map(util.SEASON_MAP)
+    df["electricity_prices_is_holiday"] = 0
+    for lag in (24, 48, 72):
+        df[f"electricity_prices_price_lag_{lag}"] = prices["price_sek"].shift(lag)
+    df["electricity_prices_price_roll3d"] = prices["price_sek"].rolling(72, min_periods=1).mean()
+    return df
+
+
+def _bench_model_path() -> str:
+    """Train (once) a model of the production size on synthetic rows and save it."""
+    path = os.path.join(tempfile.gettempdir(), "bench_model.json")
+    if not os.path.exists(path):
+        import xgboost
+
+        X = _model_frame(365)
+        y = X["electricity_prices_price_lag_24"].fillna(0.5) + 0.1 * X["temperature_2m"]
+        params = {"objective": "reg:squarederror", "tree_method": "hist", "max_depth": 6, "eta": 0.03}
+        booster = xgboost.train(params, xgboost.DMatrix(X[MODEL_FEATURES], label=y), num_boost_round=600)
+        booster.save_model(path)
+    return path
+
+
+def _hindcast_inputs(days: int) -> tuple[str, list[pd.DataFrame]]:
+    """Saved model and one model-input frame per price area."""
+    return _bench_model_path(), [_model_frame(days, seed=i) for i in range(len(BENCH_AREAS))]
+
+
+def _feature_group_frames(days: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Weather and price feature-group rows keyed by (price_area, unix_time)."""
+    model = _model_frame(days)
+    keys = pd.DataFrame({"price_area": "se3", "unix_time": model["electricity_prices_unix_time"]})
+    weather = pd.concat([keys, _price_frame(days)[["timestamp"]].rename(columns={"timestamp": "date"}),
+                         model[["hour", *util.HOURLY_WEATHER_VARIABLES]]], axis=1)
+    prices = pd.concat([keys, model[[c for c in MODEL_FEATURES if c.startswith("electricity_prices_")]]], axis=1)
+    prices["price_sek"] = _price_frame(days)["price_sek"]
+    return weather.sample(frac=1, random_state=0), prices.sample(frac=1, random_state=1)
+
+
+def _render_jobs(days: int) -> list:
+    """Hindcast and next-day plots of every bench area as render jobs."""
+    from src.render import RenderJob
+
+    out = Path(tempfile.gettempdir()) / f"bench_render_{days}"
+    out.mkdir(exist_ok=True)
+    jobs = []
+    for i, area in enumerate(BENCH_AREAS):
+        hindcast = _hindcast_frame(days)
+        hindcast["predicted_price_sek"] *= 1 + i / 100
+        jobs.append(RenderJob(
+            out / f"{area}_hindcast.png", util.plot_electricity_price_forecast,
+            (area, hindcast), {"hindcast": True, "window_days": None},
+        ))
+        jobs.append(RenderJob(out / f"{area}_next_day.png", util.plot_next_day_price_forecast, (_next_day_frame(), area)))
+    return jobs
+
+
+def _rendered_jobs(days: int) -> list:
+    """_render_jobs, already rendered once."""
+    from src.render import render
+
+    jobs = _render_jobs(days)
+    render(jobs, force=True)
+    return jobs
+
+
+def _archive_inputs(days: int):
+    """Forecast archive holding `days` days of forecasts and actuals, and the next day's frames."""
+    from src.forecast_archive import ForecastArchive
+
+    root = os.path.join(tempfile.gettempdir(), f"bench_forecast_archive_{days}")
+    shutil.rmtree(root, ignore_errors=True)
+    archive = ForecastArchive(root)
+    prices = _price_frame(days + 1).drop(columns=["date"]).rename(columns={"timestamp": "date"})
+    forecast = prices.assign(predicted_price_sek=prices["price_sek"] * 1.05)
+    archive.add_forecast("SE3", forecast.iloc[:-24])
+    archive.add_actuals("SE3", prices.iloc[:-24])
+    return archive, forecast.iloc[-24:], prices.iloc[-48:-24]
+
+
+def _matrix_store_inputs(days: int):
+    """Feature matrix of `days` hours in a fresh store, and its full time range."""
+    from src.matrix_store import FeatureMatrixStore
+
+    weather, prices = _feature_group_frames(days)
+    df = weather.merge(prices, on=["price_area", "unix_time"])
+    root = os.path.join(tempfile.gettempdir(), f"bench_matrix_store_{days}")
+    shutil.rmtree(root, ignore_errors=True)
+    store = FeatureMatrixStore(root)
+    store.write("SE3", df, columns=MODEL_FEATURES)
+    matrix = store.open("SE3")
+    assert len(matrix) == days * 24, f"matrix store holds {len(matrix)} rows for {days * 24} hours"
+    return matrix, int(matrix.unix_time[0]), int(matrix.unix_time[-1]) + 1
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+class Bench:
+    """
+    One benchmark case.
+
+    setup(days) returns the argument passed to run(arg); only run is timed.
+    run returns the number of rows processed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        setup: Callable[[int], object],
+        run: Callable[[object], int],
+        sizes: list[int] | None = None,
+        network: bool = False,
+    ):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.sizes = sizes
+        self.network = network
+
+
+def _days(days: int) -> tuple[date, date]:
+    return BENCH_START, BENCH_START + timedelta(days=days - 1)
+
+
+def _fresh_openmeteo_cache() -> None:
+    """Drop the cached Open-Meteo clients so requests_cache cannot serve repeats."""
+    util.weather._openmeteo_clients.clear()
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(".cache.sqlite")
+
+
+def build_benchmarks() -> list[Bench]:
+    def fetch_prices(max_workers: int, rps: float | None, adaptive: bool):
+        def run(rng):
+            df = util.fetch_electricity_prices(
+                *rng, show_progress=False, request_pause=0, max_workers=max_workers,
+                requests_per_second=rps, adaptive=adaptive,
+            )
+            return len(df)
+        return run
+
+    def fetch_weather(rng):
+        _fresh_openmeteo_cache()
+        df = util.get_hourly_historical_weather(BENCH_LATITUDE, BENCH_LONGITUDE, str(rng[0]), str(rng[1]))
+        return len(df)
+
+    def weather_payload(days):
+        start, end = _days(days)
+        return openmeteo_message(
+            BENCH_LATITUDE, BENCH_LONGITUDE, start, end, len(util.HOURLY_WEATHER_VARIABLES)
+        )
+
+    def decode_weather(payload):
+        response = WeatherApiResponse.GetRootAs(payload, 4)
+        return len(util.weather._hourly_to_frame(response, "Stockholm"))
+
+    def plot(fn):
+        def run(args):
+            df, path = args
+            fig = fn(df, path)
+            plt.close(fig)
+            return len(df)
+        return run
+
+    def plot_args(frame_fn):
+        def setup(days):
+            return frame_fn(days), os.path.join(tempfile.gettempdir(), "bench_plot.png")
+        return setup
+
+    def predict_per_area_day(args):
+        # As notebook 4 does today: load model.json, then one call per area and day
+        import xgboost
+
+        path, frames = args
+        for frame in frames:
+            for day in range(0, len(frame), 24):
+                booster = xgboost.Booster(model_file=path)
+                booster.predict(xgboost.DMatrix(frame.iloc[day:day + 24][MODEL_FEATURES]))
+        return sum(len(f) for f in frames)
+
+    def predict_batched(memo: bool):
+        predictors = {}
+
+        def run(args):
+            path, frames = args
+            booster = inference.load_booster(path)
+            predictor = predictors.get(id(frames)) if memo else None
+            if predictor is None:
+                predictor = predictors[id(frames)] = inference.BatchPredictor(booster)
+            return sum(len(p) for p in predictor.predict_frames(frames))
+        return run
+
+    def join_features(frames):
+        # What training does today: join the feature groups, sort, drop keys
+        weather, prices = frames
+        df = weather.merge(prices, on=["price_area", "unix_time"]).sort_values("date")
+        X = inference.feature_matrix(df.drop(columns=["price_area", "unix_time", "date"]), MODEL_FEATURES)
+        assert len(X) == len(weather), f"join gave {len(X)} rows for {len(weather)} hours"
+        return len(X)
+
+    def map_features(args):
+        matrix, start, end = args
+        view = matrix.between(start, end)
+        float(view.X.sum())     # touch every page
+        assert len(view) == len(matrix), f"range gave {len(view)} of {len(matrix)} rows"
+        return len(view)
+
+    def archive_day(args):
+        # What the daily run adds: tomorrow's forecast and yesterday's actuals
+        archive, forecast, actuals = args
+        archive.add_actuals("SE3", actuals)
+        return archive.add_forecast("SE3", forecast)
+
+    def archive_history(args):
+        archive = args[0]
+        aggregates = archive.aggregates("SE3")
+        end = date.fromisoformat(aggregates["last_day"]) + timedelta(days=1)
+        return len(archive.history("SE3", days=7, end_day=end))
+
+    def render_jobs(force: bool):
+        def run(jobs):
+            from src.render import render
+
+            render(jobs, force=force)
+            return len(jobs)
+        return run
+
+    return [
+        Bench("fetch_electricity_prices[serial]", _days, fetch_prices(1, None, False), network=True),
+        Bench("fetch_electricity_prices[workers=8]", _days, fetch_prices(8, None, False), network=True),
+        Bench("fetch_electricity_prices[workers=8,adaptive]", _days, fetch_prices(8, None, True), network=True),
+        Bench("get_hourly_historical_weather", _days, fetch_weather, network=True),
+        Bench("decode_hourly_weather", weather_payload, decode_weather),
+        Bench("align_electricity_price_schema", _price_frame, lambda df: len(util.align_electricity_price_schema(df))),
+        Bench("price_feature_rows", _price_frame, lambda df: len(common.price_feature_rows(df, "SE3"))),
+        Bench(
+            "validate[electricity_prices]",
+            lambda days: common.price_feature_rows(_price_frame(days), "SE3"),
+            lambda df: len(validation.validate(df, common.PRICES_FG).failures),
+        ),
+        Bench("PriceSeries.hourly[15-min]", _native_series, lambda series: len(series.hourly())),
+        Bench("PriceSeries.lag_features[15-min]", _native_series, lambda series: len(series.lag_features())),
+        Bench("add_time_features", _price_frame, lambda df: len(util.add_time_features(df))),
+        Bench("add_price_lag_features", _price_frame, lambda df: len(util.add_price_lag_features(df, roll_window=72))),
+        Bench(
+            "plot_electricity_price_forecast",
+            plot_args(_hindcast_frame),
+            plot(lambda df, p: util.plot_electricity_price_forecast("SE3", df, p, hindcast=True, window_days=None)),
+        ),
+        Bench(
+            "plot_next_day_price_forecast",
+            plot_args(lambda days: _next_day_frame()),
+            plot(lambda df, p: util.plot_next_day_price_forecast(df, "SE3", p)),
+            sizes=[1],
+        ),
+        Bench("render[4 areas x 2 plots]", _render_jobs, render_jobs(force=True), sizes=[30, 365]),
+        Bench("render[4 areas x 2 plots, unchanged]", _rendered_jobs, render_jobs(force=False), sizes=[30, 365]),
+        Bench("predict_hindcast[4 areas, per area-day]", _hindcast_inputs, predict_per_area_day, sizes=[1, 30]),
+        Bench("predict_hindcast[4 areas, BatchPredictor]", _hindcast_inputs, predict_batched(memo=False)),
+        Bench("predict_hindcast[4 areas, BatchPredictor memo]", _hindcast_inputs, predict_batched(memo=True)),
+        Bench("forecast_archive[add day]", _archive_inputs, archive_day, sizes=[30, 365, 1095]),
+        Bench("forecast_archive[7-day history + aggregates]", _archive_inputs, archive_history, sizes=[30, 365, 1095]),
+        Bench("feature_matrix[join feature groups]", _feature_group_frames, join_features),
+        Bench("feature_matrix[FeatureMatrixStore range]", _matrix_store_inputs, map_features),
+    ]
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _metadata(args) -> dict:
+    return {
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+        "error_rate": args.error_rate,
+        "rate_limit_rps": args.rate_limit_rps,
+        "retry_after": args.retry_after,
+        "proxy_down": args.proxy_down,
+    }
+
+
+def time_case(bench: Bench, days: int, repeat: int, warmup: int) -> dict:
+    arg = bench.setup(days)
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        for _ in range(warmup):
+            bench.run(arg)
+        timings = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            rows = bench.run(arg)
+            timings.append(time.perf_counter() - t0)
+
+    median = statistics.median(timings)
+    return {
+        "benchmark": bench.name,
+        "size_days": days,
+        "rows": rows,
+        "repeat": repeat,
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "stdev_s": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rows_per_s": rows / median if median > 0 else None,
+    }
+
+
+def compare(base_path: Path, results: list[dict]) -> None:
+    """Print median timings of this run relative to a saved result file."""
+    base = {(r["benchmark"], r["size_days"]): r for r in json.loads(base_path.read_text())["results"]}
+    print(f"\nCompared with {base_path}:")
+    print(f"{'benchmark':<40} {'days':>5} {'base (s)':>10} {'new (s)':>10} {'ratio':>7}")
+    for r in results:
+        old = base.get((r["benchmark"], r["size_days"]))
+        if old is None:
+            continue
+        ratio = r["median_s"] / old["median_s"] if old["median_s"] else float("nan")
+        print(f"{r['benchmark']:<40} {r['size_days']:>5} {old['median_s']:>10.4f} {r['median_s']:>10.4f} {ratio:>6.2f}x")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated sizes in days")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per stand-in response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform jitter on top of --latency-ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of elpris requests answered with 503")
+    parser.add_argument("--rate-limit-rps", type=float, default=None, help="Elpris stand-in answers 429 above this rate")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds sent with injected 429s")
+    parser.add_argument("--proxy-down", action="store_true", help="Elpris proxy path always answers 503")
+    parser.add_argument("--quarter-hour", action="store_true", help="Serve 15-minute prices on the direct endpoint")
+    parser.add_argument("--fixtures", type=Path, default=None, help="Recorded responses to replay")
+    parser.add_argument("--record", action="store_true", help="Fetch and save missing fixtures from the real APIs")
+    parser.add_argument("--only", default=None, help="Run benchmarks whose name contains this substring")
+    parser.add_argument("--skip-network", action="store_true", help="Skip benchmarks that go through the stand-ins")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None, help="Result file to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    benches = [
+        b for b in build_benchmarks()
+        if (args.only is None or args.only in b.name) and not (args.skip_network and b.network)
+    ]
+
+    fixtures = args.fixtures.resolve() if args.fixtures is not None else None
+    output = args.output.resolve() if args.output is not None else None
+    stub_kwargs = dict(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, fixtures_dir=fixtures, record=args.record)
+    workdir = tempfile.mkdtemp(prefix="elprice-bench-")
+    cwd = os.getcwd()
+    results = []
+    try:
+        # requests_cache writes its SQLite file to the working directory
+        os.chdir(workdir)
+        faults = dict(
+            error_rate=args.error_rate,
+            rate_limit_rps=args.rate_limit_rps,
+            retry_after=args.retry_after,
+            failing_paths=("/proxy/",) if args.proxy_down else (),
+        )
+        with ElprisStub(quarter_hour=args.quarter_hour, **stub_kwargs, **faults) as elpris, OpenMeteoStub(**stub_kwargs) as meteo:
+            patch_util(util, elpris, meteo)
+            for bench in benches:
+                for days in bench.sizes or sizes:
+                    result = time_case(bench, days, args.repeat, args.warmup)
+                    results.append(result)
+                    print(
+                        f"{result['benchmark']:<40} {days:>5}d  median {result['median_s']:.4f}s  "
+                        f"min {result['min_s']:.4f}s  rows {result['rows']}"
+                    )
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    meta = _metadata(args)
+    output = output or RESULTS_DIR / f"{(meta['git_commit'] or 'unknown')[:12]}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"schema": RESULTS_SCHEMA, "meta": meta, "results": results}, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare is not None:
+        compare(args.compare, results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
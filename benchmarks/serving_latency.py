@@ -0,0 +1,124 @@
+"""
+Latency of the local forecast service (src/serving.py) under concurrent load.
+
+Starts the service in-process on a free port with the production-size
+synthetic model from benchmarks/run.py and one forecast day per price area,
+then lets N client threads poll it over keep-alive connections and reports
+p50/p99 latency and throughput per endpoint. The clients share the server's
+interpreter, so with many clients on few cores the numbers include their
+own GIL contention (an upper bound for external clients).
+
+    python -m benchmarks.serving_latency
+    python -m benchmarks.serving_latency --clients 32 --requests 500 --max-wait-ms 0.5
+    python -m benchmarks.serving_latency --p99-budget-ms 5      # exit 1 if exceeded
+"""
+
+import argparse
+import http.client
+import sys
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.run import BENCH_AREAS, _bench_model_path, _model_frame, _price_frame
+from src import inference, metrics, serving
+
+
+def _forecast_day(area_index: int):
+    """Last local day of a short synthetic history, with its 'date' column."""
+    days = 4
+    frame = _model_frame(days, seed=area_index)
+    frame["date"] = _price_frame(days)["timestamp"]
+    return frame.tail(24).reset_index(drop=True)
+
+
+def _client(port: int, paths: list[str], latencies: list[float], errors: list[str]) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    for path in paths:
+        t0 = time.perf_counter()
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        resp.read()
+        latencies.append(time.perf_counter() - t0)
+        if resp.status != 200:
+            errors.append(f"{path}: {resp.status}")
+    conn.close()
+
+
+def run_load(port: int, paths: list[str], clients: int, requests: int) -> dict:
+    """Every client requests `requests` paths, cycling through `paths`."""
+    latencies: list[list[float]] = [[] for _ in range(clients)]
+    errors: list[str] = []
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(port, [paths[(c + i) % len(paths)] for i in range(requests)], latencies[c], errors),
+        )
+        for c in range(clients)
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    lat = np.concatenate([np.asarray(l) for l in latencies]) * 1e3
+    return {
+        "requests": len(lat),
+        "errors": len(errors),
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p99_ms": float(np.percentile(lat, 99)),
+        "max_ms": float(lat.max()),
+        "rps": len(lat) / wall,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16, help="concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=300, help="requests per client")
+    parser.add_argument("--max-wait-ms", type=float, default=serving.MAX_WAIT_MS, help="micro-batching window")
+    parser.add_argument("--p99-budget-ms", type=float, help="exit 1 if any endpoint's p99 is above this")
+    args = parser.parse_args(argv)
+
+    metrics.enable()
+    features = {area: _forecast_day(i) for i, area in enumerate(BENCH_AREAS)}
+    predictor = inference.BatchPredictor(inference.load_booster(_bench_model_path()), memo_size=0)
+    service = serving.ForecastService(
+        predictor, features.__getitem__, BENCH_AREAS, refresh_seconds=0, max_wait_ms=args.max_wait_ms
+    )
+    server = serving.make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    scenarios = {
+        "forecast": [f"/forecast/{a}" for a in BENCH_AREAS],
+        "hour": [f"/forecast/{a}/{h}" for a in BENCH_AREAS for h in range(24)],
+    }
+
+    failed = False
+    try:
+        # Warm-up: connection setup, first inplace_predict
+        run_load(port, scenarios["forecast"], 2, 20)
+        t0 = time.perf_counter()
+        service.refresh()
+        print(f"refresh ({len(BENCH_AREAS)} areas, one batch): {(time.perf_counter() - t0) * 1e3:.2f} ms")
+        print(f"{args.clients} clients x {args.requests} requests, max wait {args.max_wait_ms} ms")
+        for name, paths in scenarios.items():
+            r = run_load(port, paths, args.clients, args.requests)
+            print(f"  {name:<9} p50 {r['p50_ms']:6.2f} ms  p99 {r['p99_ms']:6.2f} ms  max {r['max_ms']:6.2f} ms  "
+                  f"{r['rps']:8.0f} req/s  errors {r['errors']}")
+            if r["errors"] or (args.p99_budget_ms is not None and r["p99_ms"] > args.p99_budget_ms):
+                failed = True
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+"""
+Local stand-ins for the elpris and Open-Meteo APIs used by the benchmarks.
+
+Both servers answer the same URL shapes as the real services, so src/util can
+be pointed at them by swapping its base URL constants (see `patch_util`):
+
+- ElprisStub serves the per-day JSON price lists
+  (/api/v1/prices/YYYY/MM-DD_SE3.json and the legacy=1 proxy path).
+- OpenMeteoStub serves Open-Meteo FlatBuffers payloads for /v1/archive and
+  /v1/forecast, one size-prefixed message per requested location.
+
+Responses are replayed from a fixtures directory when a recording exists and
+synthesized in the same wire format otherwise. With record=True a missing
+fixture is fetched once from the real upstream and saved, so later runs
+replay real responses offline.
+
+Every response can be delayed by a fixed latency plus uniform jitter to
+approximate network round trips, and faults can be injected: random error
+responses, a server-side rate limit answering 429 (optionally with
+Retry-After), and paths that always fail (e.g. a dead proxy).
+"""
+
+import datetime as dt
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+from zoneinfo import ZoneInfo
+
+import flatbuffers
+import numpy as np
+
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+LOCAL_TZ = ZoneInfo("Europe/Stockholm")
+
+ELPRIS_UPSTREAM = "https://www.elprisetjustnu.se"
+OPENMETEO_ARCHIVE_UPSTREAM = "https://archive-api.open-meteo.com"
+OPENMETEO_FORECAST_UPSTREAM = "https://api.open-meteo.com"
+
+# Last day the elpris stand-in has prices for (later days answer 404)
+ELPRIS_LAST_DAY = dt.date(2030, 12, 31)
+
+# First forecast day served by the Open-Meteo stand-in
+FORECAST_START = dt.date(2025, 1, 10)
+
+
+# =============================================================================
+# Payload synthesis
+# =============================================================================
+
+def elpris_day_payload(day: dt.date, step_minutes: int = 60) -> list[dict]:
+    """
+    Price records for one local delivery day in the elprisetjustnu.se format.
+
+    DST days get 23/25 hourly records like the real API.
+    """
+    t = dt.datetime(day.year, day.month, day.day, tzinfo=LOCAL_TZ)
+    step = dt.timedelta(minutes=step_minutes)
+    records = []
+    while t.date() == day:
+        end = (t.astimezone(dt.timezone.utc) + step).astimezone(LOCAL_TZ)
+        sek = round(0.4 + 0.3 * np.sin((t.hour + t.minute / 60) / 24 * 2 * np.pi) + day.day / 100, 5)
+        records.append({
+            "SEK_per_kWh": sek,
+            "EUR_per_kWh": round(sek / 11.2, 5),
+            "EXR": 11.2,
+            "time_start": t.isoformat(),
+            "time_end": end.isoformat(),
+        })
+        t = end
+    return records
+
+
+def _variables_with_time(builder, start: int, end: int, interval: int, arrays) -> int:
+    """Build an Open-Meteo VariablesWithTime table holding float32 arrays."""
+    offsets = []
+    for i, values in enumerate(arrays):
+        vec = builder.CreateNumpyVector(np.asarray(values, dtype=np.float32))
+        builder.StartObject(7)
+        builder.PrependUint8Slot(0, i, 0)                   # variable
+        builder.PrependUOffsetTRelativeSlot(3, vec, 0)      # values
+        offsets.append(builder.EndObject())
+
+    builder.StartVector(4, len(offsets), 4)
+    for off in reversed(offsets):
+        builder.PrependUOffsetTRelative(off)
+    variables = builder.EndVector()
+
+    builder.StartObject(4)
+    builder.PrependInt64Slot(0, start, 0)                   # time
+    builder.PrependInt64Slot(1, end, 0)                     # time_end
+    builder.PrependInt32Slot(2, interval, 0)                # interval
+    builder.PrependUOffsetTRelativeSlot(3, variables, 0)    # variables
+    return builder.EndObject()
+
+
+def openmeteo_message(
+    latitude: float,
+    longitude: float,
+    start: dt.date,
+    end: dt.date,
+    n_variables: int,
+    kind: str = "hourly",
+) -> bytes:
+    """
+    One size-prefixed Open-Meteo WeatherApiResponse for [start, end].
+
+    Hourly blocks span local (Europe/Stockholm) days, daily blocks UTC days,
+    matching how the client requests them.
+    """
+    if kind == "hourly":
+        interval = 3600
+        t0 = int(dt.datetime(start.year, start.month, start.day, tzinfo=LOCAL_TZ).timestamp())
+        stop = end + dt.timedelta(days=1)
+        t1 = int(dt.datetime(stop.year, stop.month, stop.day, tzinfo=LOCAL_TZ).timestamp())
+    else:
+        interval = 86400
+        t0 = int(dt.datetime(start.year, start.month, start.day, tzinfo=dt.timezone.utc).timestamp())
+        t1 = t0 + interval * ((end - start).days + 1)
+
+    steps = t0 / interval + np.arange((t1 - t0) // interval)
+    arrays = [np.sin(steps / 24 * (k + 1) + latitude) * 10 + k + longitude / 10 for k in range(n_variables)]
+
+    builder = flatbuffers.Builder(1024 + len(steps) * n_variables * 4)
+    block = _variables_with_time(builder, t0, t1, interval, arrays)
+    builder.StartObject(16)
+    builder.PrependFloat32Slot(0, latitude, 0)
+    builder.PrependFloat32Slot(1, longitude, 0)
+    builder.PrependFloat32Slot(2, 20.0, 0)                  # elevation
+    builder.PrependUOffsetTRelativeSlot(11 if kind == "hourly" else 10, block, 0)
+    builder.FinishSizePrefixed(builder.EndObject())
+    return bytes(builder.Output())
+
+
+# =============================================================================
+# Servers
+# =============================================================================
+
+class _StubServer:
+    """
+    Threaded HTTP server on 127.0.0.1 with latency/fault injection and replay.
+
+    Args:
+        latency_ms: Delay added to every response
+        jitter_ms: Uniform random delay on top of latency_ms
+        fixtures_dir: Recorded responses to replay (default: benchmarks/fixtures)
+        record: Fetch and save missing fixtures from the real upstream
+        error_rate: Fraction of requests answered with error_status
+        error_status: Status code of injected random errors
+        rate_limit_rps: Answer 429 to requests above this rate
+        retry_after: Retry-After seconds sent with injected 429s (None = no header)
+        failing_paths: Requests whose path contains one of these substrings
+            always get a 503
+    """
+
+    handler_name = "stub"
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        fixtures_dir: Optional[Path | str] = None,
+        record: bool = False,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        rate_limit_rps: Optional[float] = None,
+        retry_after: Optional[float] = None,
+        failing_paths: tuple[str, ...] = (),
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir is not None else FIXTURES_DIR
+        self.record = record
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit_rps = rate_limit_rps
+        self.retry_after = retry_after
+        self.failing_paths = tuple(failing_paths)
+        self.requests = 0
+        self.bytes_sent = 0
+        self.faults: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    # -- subclass hooks --------------------------------------------------------
+
+    def fixture_path(self, path: str, query: dict) -> Optional[Path]:
+        raise NotImplementedError
+
+    def upstream_url(self, path: str, raw_query: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def synthesize(self, path: str, query: dict) -> tuple[int, bytes]:
+        raise NotImplementedError
+
+    # -- serving -----------------------------------------------------------------
+
+    def respond(self, raw_path: str) -> tuple[int, bytes]:
+        parsed = urlparse(raw_path)
+        query = parse_qs(parsed.query)
+        fixture = self.fixture_path(parsed.path, query)
+
+        if fixture is not None and fixture.exists():
+            return 200, fixture.read_bytes()
+
+        if self.record and fixture is not None:
+            url = self.upstream_url(parsed.path, parsed.query)
+            if url is not None:
+                try:
+                    with urllib.request.urlopen(url, timeout=30) as resp:
+                        body = resp.read()
+                except urllib.error.HTTPError as e:
+                    # Not recorded: the upstream has no data for this request
+                    return e.code, b""
+                fixture.parent.mkdir(parents=True, exist_ok=True)
+                fixture.write_bytes(body)
+                return 200, body
+
+        return self.synthesize(parsed.path, query)
+
+    def fault(self, raw_path: str) -> Optional[tuple[int, dict]]:
+        """Injected (status, headers) for this request, or None to answer normally."""
+        if any(p in raw_path for p in self.failing_paths):
+            return 503, {}
+        if self.rate_limit_rps:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(1.0, self._tokens + (now - self._updated) * self.rate_limit_rps)
+                self._updated = now
+                limited = self._tokens < 1.0
+                if not limited:
+                    self._tokens -= 1.0
+            if limited:
+                headers = {"Retry-After": f"{self.retry_after:g}"} if self.retry_after is not None else {}
+                return 429, headers
+        if self.error_rate and random.random() < self.error_rate:
+            return self.error_status, {}
+        return None
+
+    def _delay(self) -> None:
+        delay = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def start(self) -> "_StubServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; avoid delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._delay()
+                headers = {}
+                injected = stub.fault(self.path)
+                if injected is not None:
+                    status, headers = injected
+                    body = b""
+                else:
+                    status, body = stub.respond(self.path)
+                with stub._lock:
+                    stub.requests += 1
+                    stub.bytes_sent += len(body)
+                    if injected is not None:
+                        stub.faults[status] = stub.faults.get(status, 0) + 1
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, name=self.handler_name, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.bytes_sent = 0
+            self.faults = {}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class ElprisStub(_StubServer):
+    """
+    Stand-in for elprisetjustnu.se and the elpris.eu proxy.
+
+    Args:
+        quarter_hour: Serve 15-minute records on the direct endpoint (as the
+            real API does from October 2025); the legacy=1 proxy path always
+            answers hourly.
+    """
+
+    handler_name = "elpris-stub"
+    _PATH = re.compile(r"/(\d{4})/(\d{2})-(\d{2})_(SE\d)\.json$")
+
+    def __init__(self, *args, quarter_hour: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.quarter_hour = quarter_hour
+
+    def _parse(self, path: str) -> Optional[tuple[dt.date, str]]:
+        m = self._PATH.search(path)
+        if m is None:
+            return None
+        return dt.date(int(m[1]), int(m[2]), int(m[3])), m[4]
+
+    def fixture_path(self, path, query):
+        parsed = self._parse(path)
+        if parsed is None:
+            return None
+        day, area = parsed
+        return self.fixtures_dir / "elpris" / f"{day.year}" / f"{day:%m-%d}_{area}.json"
+
+    def upstream_url(self, path, raw_query):
+        parsed = self._parse(path)
+        if parsed is None:
+            return None
+        day, area = parsed
+        return f"{ELPRIS_UPSTREAM}/api/v1/prices/{day.year}/{day:%m-%d}_{area}.json"
+
+    def synthesize(self, path, query):
+        parsed = self._parse(path)
+        if parsed is None or parsed[0] > ELPRIS_LAST_DAY:
+            return 404, b""
+        step = 15 if self.quarter_hour and "legacy" not in query else 60
+        return 200, json.dumps(elpris_day_payload(parsed[0], step)).encode()
+
+
+class OpenMeteoStub(_StubServer):
+    """Stand-in for the Open-Meteo archive and forecast APIs (FlatBuffers)."""
+
+    handler_name = "openmeteo-stub"
+
+    @staticmethod
+    def _key(path: str, query: dict) -> str:
+        canonical = json.dumps([path, sorted((k, v) for k, v in query.items() if k != "format")])
+        return hashlib.sha1(canonical.encode()).hexdigest()
+
+    def fixture_path(self, path, query):
+        return self.fixtures_dir / "openmeteo" / f"{self._key(path, query)}.bin"
+
+    def upstream_url(self, path, raw_query):
+        host = OPENMETEO_ARCHIVE_UPSTREAM if "archive" in path else OPENMETEO_FORECAST_UPSTREAM
+        return f"{host}{path}?{raw_query}"
+
+    def synthesize(self, path, query):
+        kind = "hourly" if "hourly" in query else "daily"
+        n_variables = sum(len(v.split(",")) for v in query.get(kind, []))
+        lats = [float(v) for x in query["latitude"] for v in x.split(",")]
+        lons = [float(v) for x in query["longitude"] for v in x.split(",")]
+
+        if "start_date" in query:
+            start = dt.date.fromisoformat(query["start_date"][0])
+            end = dt.date.fromisoformat(query["end_date"][0])
+        else:
+            start = FORECAST_START
+            end = start + dt.timedelta(days=int(query.get("forecast_days", ["7"])[0]) - 1)
+
+        body = b"".join(openmeteo_message(la, lo, start, end, n_variables, kind) for la, lo in zip(lats, lons))
+        return 200, body
+
+
+def patch_util(util, elpris: Optional[ElprisStub] = None, openmeteo: Optional[OpenMeteoStub] = None) -> None:
+    """Point src/util's API base URLs at running stand-ins."""
+    if elpris is not None:
+        util.prices.ELPRICE_BASE_URL = f"{elpris.base_url}/api/v1/prices"
+        util.prices.ELPRICE_PROXY_BASE_URL = f"{elpris.base_url}/proxy/api/v1/prices"
+    if openmeteo is not None:
+        util.weather.OPENMETEO_ARCHIVE_URL = f"{openmeteo.base_url}/v1/archive"
+        util.weather.OPENMETEO_FORECAST_URL = f"{openmeteo.base_url}/v1/forecast"
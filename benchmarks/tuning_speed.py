@@ -0,0 +1,91 @@
+"""
+Wall time of the hyperparameter search: sequential XGBRegressor loop (as in
+the training notebook) against src.tuning.search on the same candidates.
+
+Runs on synthetic model inputs from benchmarks/run.py with a target that
+depends on the price lags, hour and weather, so early stopping behaves like
+on real data.
+
+    python -m benchmarks.tuning_speed
+    python -m benchmarks.tuning_speed --days 730 --n-iter 20 --n-jobs 8
+    python -m benchmarks.tuning_speed --skip-sequential
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.run import MODEL_FEATURES, _model_frame
+from src import tuning
+from src.pipelines import train
+
+
+def _dataset(days: int):
+    X = _model_frame(days)[MODEL_FEATURES]
+    rng = np.random.default_rng(1)
+    y = (
+        X["electricity_prices_price_lag_24"].fillna(0.5)
+        + 0.2 * np.sin(X["hour"] / 24 * 2 * np.pi)
+        + 0.1 * X["temperature_2m"]
+        + 0.05 * rng.normal(size=len(X))
+    )
+    return X, y
+
+
+def sequential(X_tr, y_tr, X_val, y_val, candidates, early_stopping_rounds: int) -> dict:
+    """The notebook's loop: one XGBRegressor.fit per candidate, DMatrix rebuilt each time."""
+    from sklearn.metrics import mean_squared_error
+    from xgboost import XGBRegressor
+
+    best = None
+    for params in candidates:
+        model = XGBRegressor(**train.BASE_PARAMS, **params, early_stopping_rounds=early_stopping_rounds)
+        model.fit(X_tr, y_tr, eval_set=[(X_val, y_val)], verbose=False)
+        rmse = float(np.sqrt(mean_squared_error(y_val, model.predict(X_val))))
+        if best is None or rmse < best["rmse"]:
+            best = {"rmse": rmse, "params": params, "best_n_estimators": model.best_iteration + 1}
+    return best
+
+
+def main(argv=None) -> int:
+    from sklearn.model_selection import ParameterSampler
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=365 * 2, help="hourly rows = days * 24")
+    parser.add_argument("--n-iter", type=int, default=20)
+    parser.add_argument("--n-jobs", type=int, help="cores (default: all)")
+    parser.add_argument("--early-stopping-rounds", type=int, default=50)
+    parser.add_argument("--skip-sequential", action="store_true")
+    args = parser.parse_args(argv)
+
+    X, y = _dataset(args.days)
+    split = int(len(X) * 0.9)
+    X_tr, X_val, y_tr, y_val = X.iloc[:split], X.iloc[split:], y.iloc[:split], y.iloc[split:]
+    candidates = list(ParameterSampler(train.PARAM_DISTRIBUTIONS, n_iter=args.n_iter, random_state=42))
+    print(f"{len(X_tr)} training rows, {len(candidates)} candidates")
+
+    results = {}
+    if not args.skip_sequential:
+        t0 = time.perf_counter()
+        results["sequential"] = (sequential(X_tr, y_tr, X_val, y_val, candidates, args.early_stopping_rounds),
+                                 time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    results["tuning.search"] = (
+        tuning.search(X_tr, y_tr, X_val, y_val, candidates, train.BASE_PARAMS,
+                      early_stopping_rounds=args.early_stopping_rounds, n_jobs=args.n_jobs),
+        time.perf_counter() - t0,
+    )
+
+    for name, (best, seconds) in results.items():
+        print(f"  {name:<14} {seconds:7.1f} s  best RMSE {best['rmse']:.5f}  "
+              f"n_estimators {best['best_n_estimators']}  params {best['params']}")
+    if "sequential" in results:
+        print(f"  speed-up {results['sequential'][1] / results['tuning.search'][1]:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+Walk-forward (rolling-origin) backtesting.
+
+Replays the daily cycle of the pipelines over the whole history: at every
+retrain origin a model is trained on the data available at that time and
+used to forecast the following day(s), which are then scored against the
+observed prices. Retraining can be daily (every forecast day gets a fresh
+model, as a daily retrain would) or every N days (e.g. weekly).
+
+The features are converted once into a time-sorted float32 matrix; a fold is
+then just a pair of row ranges into it (train rows before the origin, test
+rows of the forecast days), so no frame is copied or re-encoded per fold.
+Folds run in parallel worker processes that receive the matrix once, or,
+for a FeatureMatrix from src/matrix_store.py, map the same file.
+
+    folds, predictions = backtest(df, feature_cols, params, n_estimators=300, retrain_every=7)
+    folds, predictions = backtest_matrix(FeatureMatrixStore().open("SE3"), params, n_estimators=300)
+    summary(predictions)
+"""
+
+import json
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import metrics
+from .inference import feature_matrix
+from .matrix_store import FeatureMatrix
+from .tuning import native_params, worker_layout
+
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TZ = "Europe/Stockholm"
+
+# First day with prices in the feature groups
+HISTORY_START = "2022-11-01"
+MIN_TRAIN_DAYS = 90
+
+# At forecast time (02:00 UTC, see the workflow) the feature store holds
+# prices up to the day before yesterday: one day between train and test data
+GAP_DAYS = 1
+
+NAIVE_COLUMN = "electricity_prices_price_lag_24"
+
+# Per-process training data: (X, y)
+_data: Optional[tuple[np.ndarray, np.ndarray]] = None
+
+
+# =============================================================================
+# Folds
+# =============================================================================
+
+def local_days(dates, tz: str = LOCAL_TZ) -> np.ndarray:
+    """Local calendar day of every timestamp as days since 1970-01-01 (int64)."""
+    local = pd.DatetimeIndex(pd.to_datetime(dates, utc=True)).tz_convert(tz).tz_localize(None)
+    return local.to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def make_folds(
+    days: np.ndarray,
+    retrain_every: int = 1,
+    min_train_days: int = MIN_TRAIN_DAYS,
+    window_days: Optional[int] = None,
+    gap_days: int = GAP_DAYS,
+    start: Optional[str] = None,
+) -> list[dict]:
+    """
+    Rolling-origin folds over time-sorted rows.
+
+    Args:
+        days: Local day of every row (see local_days), ascending
+        retrain_every: Days between retrains; each model forecasts that many days
+        min_train_days: Days of history before the first origin
+        window_days: Train on the last window_days only (default: expanding window)
+        gap_days: Days between the last training day and the first forecast day
+        start: First forecast day (default: first day with min_train_days of history)
+
+    Returns:
+        Dicts with the origin day and the train/test row ranges
+    """
+    if not len(days):
+        return []
+    first, last = int(days[0]), int(days[-1])
+    origin = first + min_train_days + gap_days
+    if start is not None:
+        origin = max(origin, int(np.datetime64(start, "D").astype(np.int64)))
+
+    folds = []
+    while origin <= last:
+        train_end_day = origin - gap_days
+        train_start_day = train_end_day - window_days if window_days else first
+        test_end_day = origin + retrain_every
+
+        train = np.searchsorted(days, [train_start_day, train_end_day])
+        test = np.searchsorted(days, [origin, test_end_day])
+        if test[1] > test[0] and train[1] > train[0]:
+            folds.append({
+                "fold": len(folds),
+                "origin": origin,
+                "train": (int(train[0]), int(train[1])),
+                "test": (int(test[0]), int(test[1])),
+            })
+        origin = test_end_day
+    return folds
+
+
+# =============================================================================
+# Model parameters
+# =============================================================================
+
+def params_from_model(path: Path | str) -> tuple[dict, int]:
+    """
+    Training parameters and number of trees of a saved model.json, so the
+    backtest retrains the model that is in production.
+
+    Returns:
+        (xgboost.train params, boosting rounds)
+    """
+    import xgboost
+
+    booster = xgboost.Booster()
+    booster.load_model(str(path))
+    config = json.loads(booster.save_config())["learner"]
+
+    tree_params = config["gradient_booster"]["tree_train_param"]
+    # Tuned in src.pipelines.train (plus the bins of the hist method)
+    keep = ("eta", "max_depth", "min_child_weight", "subsample", "colsample_bytree", "lambda", "alpha", "gamma", "max_bin")
+    params = {"objective": config["objective"]["name"], "tree_method": "hist"}
+    params.update({k: float(tree_params[k]) for k in keep if k in tree_params})
+    for k in ("max_depth", "max_bin"):
+        if k in params:
+            params[k] = int(params[k])
+    return params, booster.num_boosted_rounds()
+
+
+# =============================================================================
+# Workers
+# =============================================================================
+
+def _init_worker(source, columns: Optional[list[str]] = None) -> None:
+    """Keep the training data of this process: (X, y) arrays or a FeatureMatrix to map."""
+    global _data
+    if isinstance(source, FeatureMatrix):
+        _data = (source.features(columns), source.y)
+    else:
+        _data = source
+
+
+def _run_fold(task: dict) -> dict:
+    """Train on the fold's train rows and predict its test rows."""
+    import xgboost
+
+    X, y = _data
+    (a, b), (c, d) = task["train"], task["test"]
+
+    dtrain = xgboost.QuantileDMatrix(X[a:b], label=y[a:b], nthread=task["params"]["nthread"])
+    booster = xgboost.train(task["params"], dtrain, num_boost_round=task["n_estimators"])
+    predicted = booster.inplace_predict(X[c:d], missing=np.nan)
+    return {"fold": task["fold"], "predicted": np.asarray(predicted, dtype=np.float32)}
+
+
+# =============================================================================
+# Backtest
+# =============================================================================
+
+def _scores(actual: np.ndarray, predicted: np.ndarray, naive: Optional[np.ndarray]) -> dict[str, float]:
+    err = predicted - actual
+    out = {
+        "MAE": float(np.mean(np.abs(err))),
+        "RMSE": float(np.sqrt(np.mean(err ** 2))),
+        "bias": float(np.mean(err)),
+    }
+    if naive is not None:
+        ok = ~np.isnan(naive)
+        mae_naive = float(np.mean(np.abs(naive[ok] - actual[ok]))) if ok.any() else math.nan
+        out["MAE_naive"] = mae_naive
+        out["skill"] = 1 - out["MAE"] / mae_naive if mae_naive else math.nan
+    return out
+
+
+def backtest(
+    df: pd.DataFrame,
+    feature_cols: Sequence[str],
+    params: dict,
+    n_estimators: int,
+    target_col: str = "price_sek",
+    date_col: str = "date",
+    naive_col: Optional[str] = NAIVE_COLUMN,
+    **options,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Walk-forward backtest of one model configuration.
+
+    Args:
+        df: Feature rows with target_col and date_col (any order)
+        feature_cols: Model columns, in training order
+        params: xgboost.train params (see params_from_model) or XGBRegressor
+            keyword arguments
+        n_estimators: Boosting rounds per fold
+        target_col: Observed price column
+        date_col: UTC timestamp of every row
+        naive_col: Baseline prediction column for the skill score (yesterday's
+            price at the same hour); skipped if None or missing
+        **options: retrain_every, min_train_days, window_days, gap_days,
+            start and n_jobs (see walk_forward)
+
+    Returns:
+        (folds, predictions): one row per fold with its dates, sizes and
+        MAE/RMSE/bias (and MAE_naive/skill), and one row per forecast hour
+        with date, price_sek, predicted_price_sek, fold (and naive_price_sek)
+    """
+    df = df.sort_values(date_col, kind="stable").reset_index(drop=True)
+    with metrics.timer("elprice_stage_seconds", pipeline="backtest", stage="matrix"):
+        X = feature_matrix(df, feature_cols)
+        y = df[target_col].to_numpy(dtype=np.float32, na_value=np.nan)
+    naive = None
+    if naive_col is not None and naive_col in df.columns:
+        naive = df[naive_col].to_numpy(dtype=np.float32, na_value=np.nan)
+
+    return walk_forward((X, y), pd.to_datetime(df[date_col], utc=True), params, n_estimators,
+                        naive=naive, target_col=target_col, **options)
+
+
+def backtest_matrix(
+    matrix: FeatureMatrix,
+    params: dict,
+    n_estimators: int,
+    feature_cols: Optional[Sequence[str]] = None,
+    naive_col: Optional[str] = NAIVE_COLUMN,
+    **options,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Walk-forward backtest on a memory-mapped feature matrix (see backtest).
+
+    With feature_cols None (all stored columns) the workers train directly on
+    the mapped rows; other column selections are copied once per worker.
+    """
+    if matrix.target is None:
+        raise ValueError("The feature matrix has no target column")
+    naive = matrix.column(naive_col) if naive_col in matrix.columns else None
+    columns = list(feature_cols) if feature_cols is not None else None
+    return walk_forward(matrix, matrix.dates, params, n_estimators, naive=naive,
+                        target_col=matrix.target, columns=columns, **options)
+
+
+def walk_forward(
+    source: tuple[np.ndarray, np.ndarray] | FeatureMatrix,
+    dates: pd.DatetimeIndex | pd.Series,
+    params: dict,
+    n_estimators: int,
+    naive: Optional[np.ndarray] = None,
+    target_col: str = "price_sek",
+    columns: Optional[list[str]] = None,
+    retrain_every: int = 1,
+    min_train_days: int = MIN_TRAIN_DAYS,
+    window_days: Optional[int] = None,
+    gap_days: int = GAP_DAYS,
+    start: Optional[str] = HISTORY_START,
+    n_jobs: Optional[int] = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Run the folds over time-sorted rows.
+
+    Args:
+        source: (X, y) arrays or a FeatureMatrix, rows sorted by time
+        dates: UTC timestamp of every row
+        params: Training params (see backtest)
+        n_estimators: Boosting rounds per fold
+        naive: Baseline predictions per row (for MAE_naive/skill)
+        target_col: Name of the target in the output
+        columns: Feature columns of a FeatureMatrix source (default: all)
+        retrain_every: Days between retrains (1 = daily, 7 = weekly)
+        min_train_days: Days of history before the first forecast
+        window_days: Rolling training window in days (default: all history)
+        gap_days: Days between the training data and the forecast day
+        start: Earliest forecast day
+        n_jobs: Cores to use (default: all)
+    """
+    dates = pd.DatetimeIndex(dates)
+    y = source.y if isinstance(source, FeatureMatrix) else source[1]
+    folds = make_folds(local_days(dates), retrain_every, min_train_days, window_days, gap_days, start)
+    if not folds:
+        raise ValueError("Not enough history for a single fold")
+
+    workers, nthread = worker_layout(len(folds), n_jobs)
+    train_params = native_params(params, nthread)
+    train_params.pop("eval_metric", None)
+    logger.info(
+        f"Backtesting {len(folds)} fold(s) ({retrain_every}-day retrain, {n_estimators} rounds) "
+        f"with {workers} worker(s) x {nthread} thread(s)"
+    )
+
+    # Largest folds first so the pool is not left waiting on them at the end
+    tasks = [
+        {**f, "params": train_params, "n_estimators": n_estimators}
+        for f in sorted(folds, key=lambda f: f["train"][1] - f["train"][0], reverse=True)
+    ]
+    with metrics.timer("elprice_stage_seconds", pipeline="backtest", stage="folds"):
+        if workers > 1:
+            with ProcessPoolExecutor(
+                workers, mp_context=get_context("spawn"), initializer=_init_worker, initargs=(source, columns)
+            ) as pool:
+                results = list(pool.map(_run_fold, tasks))
+        else:
+            _init_worker(source, columns)
+            results = [_run_fold(t) for t in tasks]
+    predicted = {r["fold"]: r["predicted"] for r in results}
+
+    rows, pred_frames = [], []
+    for f in folds:
+        (a, b), (c, d) = f["train"], f["test"]
+        pred = predicted[f["fold"]]
+        actual = np.asarray(y[c:d])
+        rows.append({
+            "fold": f["fold"],
+            "origin": pd.Timestamp(np.datetime64(f["origin"], "D")).date(),
+            "train_start": dates[a],
+            "train_end": dates[b - 1],
+            "test_start": dates[c],
+            "test_end": dates[d - 1],
+            "train_rows": b - a,
+            "test_rows": d - c,
+            **_scores(actual, pred, naive[c:d] if naive is not None else None),
+        })
+        frame = pd.DataFrame({
+            "date": dates[c:d],
+            target_col: actual,
+            f"predicted_{target_col}": pred,
+            "fold": f["fold"],
+        })
+        if naive is not None:
+            frame[f"naive_{target_col}"] = naive[c:d]
+        pred_frames.append(frame)
+
+    return pd.DataFrame(rows), pd.concat(pred_frames, ignore_index=True)
+
+
+def summary(predictions: pd.DataFrame, target_col: str = "price_sek") -> dict:
+    """Scores over all forecast hours of a backtest (see backtest)."""
+    actual = predictions[target_col].to_numpy(dtype=np.float64)
+    predicted = predictions[f"predicted_{target_col}"].to_numpy(dtype=np.float64)
+    naive_col = f"naive_{target_col}"
+    naive = predictions[naive_col].to_numpy(dtype=np.float64) if naive_col in predictions else None
+    out = _scores(actual, predicted, naive)
+    local = pd.to_datetime(predictions["date"], utc=True).dt.tz_convert(LOCAL_TZ)
+    out.update({
+        "folds": int(predictions["fold"].nunique()),
+        "hours": int(len(predictions)),
+        "first_day": str(local.min().date()),
+        "last_day": str(local.max().date()),
+    })
+    return out
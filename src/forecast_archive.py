@@ -0,0 +1,274 @@
+"""
+Archive of issued forecasts and their actual prices.
+
+One record per price area and delivery hour, kept as Parquet files
+partitioned by area and month of the local delivery day, next to a JSON
+file of aggregates:
+
+    docs/PricesDashboard/assets/data/archive/price_area=SE3/
+        2026-01.parquet     unix_time, delivery_day, hour_local, issued_at,
+                            predicted_price_sek, actual_price_sek
+        aggregates.json     per-day min/max/mean and error sums, rolling
+                            7/30-day MAE/RMSE/bias
+
+Records are only added: a forecast fills predicted_price_sek (a re-issued
+forecast for the same hour replaces it) and the prices of a later day fill
+actual_price_sek of the hours that were forecast. A write touches only the
+partitions of the hours it carries and recomputes the aggregates of the days
+it touched, so the daily run stays small however long the archive gets, and
+the dashboard reads aggregates.json and the last month or two instead of
+re-querying the feature store.
+"""
+
+import json
+import os
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+FORECAST_ARCHIVE_DIR = Path(
+    os.getenv(
+        "ELPRICE_ARCHIVE_DIR",
+        Path(__file__).resolve().parent.parent / "docs" / "PricesDashboard" / "assets" / "data" / "archive",
+    )
+)
+
+LOCAL_TZ = "Europe/Stockholm"
+
+ARCHIVE_DTYPES = {
+    "unix_time": "int64",
+    "hour_local": "int8",
+    "issued_at": "datetime64[ns, UTC]",
+    "predicted_price_sek": "float32",
+    "actual_price_sek": "float32",
+}
+
+# Trailing calendar windows (days up to the last archived day) of the rolling error stats
+ROLLING_WINDOWS = (7, 30)
+
+
+def _records(times: pd.Series) -> pd.DataFrame:
+    """unix_time, delivery_day and hour_local of UTC timestamps."""
+    times = pd.to_datetime(times, utc=True)
+    local = times.dt.tz_convert(LOCAL_TZ)
+    return pd.DataFrame({
+        "unix_time": ((times - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)).to_numpy(dtype="int64"),
+        "delivery_day": local.dt.date.to_numpy(),
+        "hour_local": local.dt.hour.astype("int8").to_numpy(),
+    })
+
+
+def _day_aggregates(day_rows: pd.DataFrame) -> dict:
+    """Aggregates of one delivery day (error sums over hours with both prices)."""
+    predicted = day_rows["predicted_price_sek"].astype("float64")
+    actual = day_rows["actual_price_sek"].astype("float64")
+    both = predicted.notna() & actual.notna()
+    err = (predicted - actual)[both]
+
+    def stats(values: pd.Series) -> dict:
+        values = values.dropna()
+        if values.empty:
+            return {"min": None, "max": None, "mean": None}
+        return {"min": float(values.min()), "max": float(values.max()), "mean": float(values.mean())}
+
+    return {
+        "hours": int(predicted.notna().sum()),
+        "hours_with_actual": int(both.sum()),
+        "predicted": stats(predicted),
+        "actual": stats(actual[predicted.notna()]),
+        "abs_err_sum": float(err.abs().sum()),
+        "sq_err_sum": float((err ** 2).sum()),
+        "err_sum": float(err.sum()),
+    }
+
+
+def _error_stats(days: list[dict]) -> dict:
+    """MAE/RMSE/bias over the hours of several days' aggregates."""
+    hours = sum(d["hours_with_actual"] for d in days)
+    if not hours:
+        return {"days": len(days), "hours": 0, "mae": None, "rmse": None, "bias": None}
+    return {
+        "days": len(days),
+        "hours": hours,
+        "mae": sum(d["abs_err_sum"] for d in days) / hours,
+        "rmse": float(np.sqrt(sum(d["sq_err_sum"] for d in days) / hours)),
+        "bias": sum(d["err_sum"] for d in days) / hours,
+    }
+
+
+class ForecastArchive:
+    """
+    Parquet forecast archive partitioned by price area and month.
+
+    Args:
+        root: Directory of the archive (default: the dashboard data
+            directory, or ELPRICE_ARCHIVE_DIR if set)
+    """
+
+    def __init__(self, root: Optional[Path | str] = None):
+        self.root = Path(root) if root is not None else FORECAST_ARCHIVE_DIR
+
+    def _area_dir(self, price_area: str) -> Path:
+        return self.root / f"price_area={price_area.upper()}"
+
+    def _partition_path(self, price_area: str, month: str) -> Path:
+        return self._area_dir(price_area) / f"{month}.parquet"
+
+    def _aggregates_path(self, price_area: str) -> Path:
+        return self._area_dir(price_area) / "aggregates.json"
+
+    def read(self, price_area: str, start_day: date, end_day: date) -> pd.DataFrame:
+        """
+        Records of the delivery days in [start_day, end_day], sorted by hour
+        (empty if nothing is archived).
+        """
+        months = pd.period_range(start_day, end_day, freq="M").strftime("%Y-%m")
+        paths = [self._partition_path(price_area, m) for m in months]
+        parts = [pd.read_parquet(p) for p in paths if p.exists()]
+        if not parts:
+            return pd.DataFrame(columns=["unix_time", "delivery_day", *list(ARCHIVE_DTYPES)[1:]])
+
+        df = pd.concat(parts, ignore_index=True)
+        df = df[(df["delivery_day"] >= start_day) & (df["delivery_day"] <= end_day)]
+        return df.sort_values("unix_time").reset_index(drop=True)
+
+    def aggregates(self, price_area: str) -> dict:
+        """Contents of aggregates.json ({"days": {}, "rolling": {}} if empty)."""
+        path = self._aggregates_path(price_area)
+        if not path.exists():
+            return {"days": {}, "rolling": {}}
+        return json.loads(path.read_text())
+
+    def add_forecast(
+        self,
+        price_area: str,
+        forecast_df: pd.DataFrame,
+        price_col: str = "predicted_price_sek",
+        issued_at: Optional[pd.Timestamp] = None,
+    ) -> int:
+        """
+        Archive issued forecast hours.
+
+        Args:
+            price_area: Area partition to write to
+            forecast_df: Forecast rows with 'date' (UTC) and price_col
+            price_col: Column with predicted prices
+            issued_at: Issue time (default: now; naive = UTC)
+
+        Returns:
+            Number of hours written
+        """
+        if forecast_df.empty:
+            return 0
+        rows = _records(forecast_df["date"])
+        issued = pd.Timestamp.now(tz="UTC") if issued_at is None else pd.Timestamp(issued_at)
+        rows["issued_at"] = issued.tz_localize("UTC") if issued.tzinfo is None else issued.tz_convert("UTC")
+        rows["predicted_price_sek"] = forecast_df[price_col].to_numpy(dtype="float32")
+        return self._merge(price_area, rows, ["issued_at", "predicted_price_sek"], insert=True)
+
+    def add_actuals(
+        self,
+        price_area: str,
+        prices_df: pd.DataFrame,
+        price_col: str = "price_sek",
+        time_col: str = "date",
+    ) -> int:
+        """
+        Fill in the actual prices of archived forecast hours.
+
+        Hours that were never forecast are ignored.
+
+        Args:
+            price_area: Area partition to write to
+            prices_df: Hourly prices with time_col (UTC) and price_col
+            price_col: Column with actual prices
+            time_col: Column with the hour's UTC timestamp
+
+        Returns:
+            Number of archived hours updated
+        """
+        prices_df = prices_df.dropna(subset=[price_col])
+        if prices_df.empty:
+            return 0
+        rows = _records(prices_df[time_col])
+        rows["actual_price_sek"] = prices_df[price_col].to_numpy(dtype="float32")
+        return self._merge(price_area, rows, ["actual_price_sek"], insert=False)
+
+    def history(self, price_area: str, days: int = 7, end_day: Optional[date] = None) -> pd.DataFrame:
+        """
+        Records of the `days` local delivery days before end_day (default:
+        today in Europe/Stockholm), with a 'local_time' column.
+        """
+        end_day = end_day or pd.Timestamp.now(tz=LOCAL_TZ).date()
+        start_day = end_day - pd.Timedelta(days=days)
+        df = self.read(price_area, start_day, end_day - pd.Timedelta(days=1))
+        df["local_time"] = pd.to_datetime(df["unix_time"], unit="ms", utc=True).dt.tz_convert(LOCAL_TZ)
+        return df
+
+    # -------------------------------------------------------------------------
+
+    def _merge(self, price_area: str, rows: pd.DataFrame, columns: list[str], insert: bool) -> int:
+        """Write `columns` of rows into the partitions, keyed by unix_time."""
+        rows = rows.drop_duplicates("unix_time", keep="last")
+        month = pd.to_datetime(rows["delivery_day"]).dt.strftime("%Y-%m")
+        written = 0
+        touched_days = []
+
+        for m, new_rows in rows.groupby(month):
+            path = self._partition_path(price_area, m)
+            if path.exists():
+                stored = pd.read_parquet(path).set_index("unix_time")
+            elif insert:
+                stored = pd.DataFrame(columns=["delivery_day", *list(ARCHIVE_DTYPES)[1:]])
+                stored.index.name = "unix_time"
+            else:
+                continue
+
+            new_rows = new_rows.set_index("unix_time")
+            if not insert:
+                new_rows = new_rows[new_rows.index.isin(stored.index)]
+                if new_rows.empty:
+                    continue
+
+            # New values win; the other columns of stored hours are kept
+            stored = new_rows[["delivery_day", "hour_local", *columns]].combine_first(stored)
+            stored = stored.sort_index().reset_index()
+            stored = stored.astype(ARCHIVE_DTYPES)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".parquet.tmp")
+            stored.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+
+            written += len(new_rows)
+            days = set(new_rows["delivery_day"])
+            touched_days.append(stored[stored["delivery_day"].isin(days)])
+
+        if touched_days:
+            self._update_aggregates(price_area, pd.concat(touched_days, ignore_index=True))
+        return written
+
+    def _update_aggregates(self, price_area: str, day_rows: pd.DataFrame) -> None:
+        """Recompute the aggregates of the days in day_rows and the rolling windows."""
+        aggregates = self.aggregates(price_area)
+        days = aggregates["days"]
+        for day, rows in day_rows.groupby("delivery_day"):
+            days[str(day)] = _day_aggregates(rows)
+        aggregates["days"] = dict(sorted(days.items()))
+
+        last_day = next(reversed(aggregates["days"]), None)
+        aggregates["rolling"] = {}
+        for n in ROLLING_WINDOWS:
+            # Calendar window last_day - n < day <= last_day (ISO dates sort as strings)
+            first = str(date.fromisoformat(last_day) - timedelta(days=n)) if last_day else ""
+            window = [d for day, d in aggregates["days"].items() if day > first and d["hours_with_actual"]]
+            aggregates["rolling"][f"{n}d"] = _error_stats(window)
+        aggregates["last_day"] = last_day
+
+        path = self._aggregates_path(price_area)
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(aggregates, indent=2))
+        os.replace(tmp_path, path)
@@ -0,0 +1,246 @@
+"""
+Batched price inference with cached XGBoost boosters.
+
+Boosters are parsed once per process and kept in a cache keyed by model
+version (registry name + version, or file path + modification time for local
+model.json files). Feature rows for any number of price areas and days are
+packed into one contiguous float32 matrix and predicted with a single
+Booster.inplace_predict call. Predictions are memoised per feature row,
+keyed by a 64-bit hash of the row, so re-forecasting overlapping windows only
+predicts rows that have not been seen before.
+
+    predictor = BatchPredictor(load_booster("electricity_prices_model/model.json"))
+    per_area = predictor.predict_frames([features_se1, features_se2, features_se3])
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import metrics
+
+if TYPE_CHECKING:
+    import xgboost
+
+
+logger = logging.getLogger(__name__)
+
+# Metrics tried in order when picking the best registered model
+METRIC_PREFERENCES = [
+    ("RMSE", "min"),
+    ("MSE", "min"),
+    ("MAE", "min"),
+    ("R squared", "max"),
+]
+
+# Upper bound on memoised rows per predictor (oldest rows are evicted first)
+MEMO_MAX_ROWS = 1_000_000
+
+_boosters: dict[tuple, "xgboost.Booster"] = {}
+_boosters_lock = threading.Lock()
+
+
+# =============================================================================
+# Booster cache
+# =============================================================================
+
+def load_booster(path: Path | str, version: Optional[tuple] = None) -> "xgboost.Booster":
+    """
+    Parse a saved model (model.json) once per process.
+
+    Args:
+        path: Path to the saved model
+        version: Cache key of the model (default: resolved path and mtime, so
+            a retrained file is picked up)
+
+    Returns:
+        Cached xgboost.Booster
+    """
+    import xgboost
+
+    path = Path(path).resolve()
+    key = version if version is not None else (str(path), path.stat().st_mtime_ns)
+
+    booster = _boosters.get(key)
+    if booster is None:
+        with _boosters_lock:
+            booster = _boosters.get(key)
+            if booster is None:
+                booster = xgboost.Booster()
+                booster.load_model(str(path))
+                _boosters[key] = booster
+                logger.info(f"Loaded booster {key} ({booster.num_boosted_rounds()} rounds)")
+    return booster
+
+
+def load_registry_booster(
+    project,
+    model_name: str,
+    metric_preferences: Sequence[tuple[str, str]] = METRIC_PREFERENCES,
+) -> tuple["xgboost.Booster", int]:
+    """
+    Best registered version of model_name as a cached booster.
+
+    The first metric in metric_preferences that the registry can rank by
+    decides the version. The artifacts are only downloaded when that version
+    is not cached yet.
+
+    Returns:
+        (booster, model version)
+    """
+    mr = project.get_model_registry()
+
+    retrieved_model = None
+    for metric_name, direction in metric_preferences:
+        retrieved_model = mr.get_best_model(model_name, metric_name, direction)
+        if retrieved_model is not None:
+            logger.info(f"Selected best model: {model_name} v{retrieved_model.version} ({metric_name} / {direction})")
+            break
+
+    if retrieved_model is None:
+        raise ValueError(f"No registered model named {model_name}")
+
+    key = (model_name, retrieved_model.version)
+    booster = _boosters.get(key)
+    if booster is None:
+        booster = load_booster(Path(retrieved_model.download()) / "model.json", version=key)
+    return booster, retrieved_model.version
+
+
+def clear_booster_cache() -> None:
+    with _boosters_lock:
+        _boosters.clear()
+
+
+# =============================================================================
+# Feature matrix
+# =============================================================================
+
+def feature_matrix(frames: pd.DataFrame | Sequence[pd.DataFrame], feature_names: Sequence[str]) -> np.ndarray:
+    """
+    Stack feature frames into one C-contiguous float32 matrix.
+
+    Args:
+        frames: One frame or several (e.g. one per price area and day); rows
+            keep their order, frame after frame
+        feature_names: Model columns, in booster order
+
+    Returns:
+        Array of shape (total rows, len(feature_names)); missing values are NaN
+    """
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+
+    for frame in frames:
+        missing = [c for c in feature_names if c not in frame.columns]
+        if missing:
+            raise ValueError(f"Missing features: {missing}")
+
+    X = np.empty((sum(len(f) for f in frames), len(feature_names)), dtype=np.float32)
+    offset = 0
+    for frame in frames:
+        rows = slice(offset, offset + len(frame))
+        for j, col in enumerate(feature_names):
+            X[rows, j] = frame[col].to_numpy(dtype=np.float32, na_value=np.nan)
+        offset += len(frame)
+    return X
+
+
+def row_hashes(X: np.ndarray) -> np.ndarray:
+    """64-bit hash of every row of a feature matrix."""
+    return pd.util.hash_pandas_object(pd.DataFrame(X, copy=False), index=False).to_numpy()
+
+
+# =============================================================================
+# Predictor
+# =============================================================================
+
+class BatchPredictor:
+    """
+    Memoising batch predictor around one booster.
+
+    Args:
+        booster: Parsed booster (see load_booster)
+        feature_names: Model columns in training order (default: the names
+            stored in the booster)
+        memo_size: Max rows kept in the prediction memo (0 disables it)
+    """
+
+    def __init__(
+        self,
+        booster: "xgboost.Booster",
+        feature_names: Optional[Sequence[str]] = None,
+        memo_size: int = MEMO_MAX_ROWS,
+    ):
+        names = feature_names if feature_names is not None else booster.feature_names
+        if not names:
+            raise ValueError("feature_names are required for a booster saved without them")
+
+        self.booster = booster
+        self.feature_names = list(names)
+        self.memo_size = memo_size
+        self._memo: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict a float32 feature matrix with one inplace_predict call.
+
+        Rows already in the memo are not predicted again; duplicate rows in X
+        are predicted once.
+        """
+        if not len(X):
+            return np.empty(0, dtype=np.float32)
+        if not self.memo_size:
+            with metrics.timer("elprice_stage_seconds", pipeline="inference", stage="predict"):
+                return self._predict(X)
+
+        keys = row_hashes(X)
+        with self._lock:
+            cached = [self._memo.get(k) for k in keys.tolist()]
+        miss = np.fromiter((c is None for c in cached), dtype=bool, count=len(cached))
+
+        out = np.array([np.nan if c is None else c for c in cached], dtype=np.float32)
+        if miss.any():
+            miss_keys, first, inverse = np.unique(keys[miss], return_index=True, return_inverse=True)
+            with metrics.timer("elprice_stage_seconds", pipeline="inference", stage="predict"):
+                predicted = self._predict(np.ascontiguousarray(X[miss][first]))
+            out[miss] = predicted[inverse]
+            self._remember(miss_keys, predicted)
+
+        metrics.inc("elprice_inference_rows_total", int(len(X) - miss.sum()), result="memo")
+        metrics.inc("elprice_inference_rows_total", int(miss.sum()), result="predicted")
+        return out
+
+    def predict(self, frames: pd.DataFrame | Sequence[pd.DataFrame]) -> np.ndarray:
+        """Predictions for the rows of one or several feature frames, in row order."""
+        with metrics.timer("elprice_stage_seconds", pipeline="inference", stage="matrix"):
+            X = feature_matrix(frames, self.feature_names)
+        return self.predict_matrix(X)
+
+    def predict_frames(self, frames: Sequence[pd.DataFrame]) -> list[np.ndarray]:
+        """Predict several frames in one batch and split the result per frame."""
+        if not frames:
+            return []
+        out = self.predict(list(frames))
+        return np.split(out, np.cumsum([len(f) for f in frames])[:-1])
+
+    def clear_memo(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+    def _predict(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(self.booster.inplace_predict(X, missing=np.nan), dtype=np.float32)
+
+    def _remember(self, keys: np.ndarray, values: np.ndarray) -> None:
+        with self._lock:
+            self._memo.update(zip(keys.tolist(), values.tolist()))
+            overflow = len(self._memo) - self.memo_size
+            if overflow > 0:
+                # dicts keep insertion order: drop the oldest rows
+                for k in list(self._memo)[:overflow]:
+                    del self._memo[k]
@@ -0,0 +1,352 @@
+"""
+Memory-mapped on-disk feature matrix per price area.
+
+The joined weather + price features are kept as raw little-endian arrays in
+a versioned data directory next to a JSON manifest, one directory per price
+area:
+
+    data/features/price_area=SE3/
+        manifest.json         columns, target, rows, time unit, data directory
+        v1/unix_time.bin      int64 [rows], sorted (ms since epoch)
+        v1/features.bin       float32 [rows, columns], row-major
+        v1/target.bin         float32 [rows] (price_sek)
+
+Readers map the files with np.memmap: a date range is a binary search on
+unix_time and a zero-copy view of rows, and features.bin rows are already
+the C-contiguous float32 layout xgboost predicts and trains from. Rows newer
+than the last stored hour are appended to the end of each file; the manifest
+(written last, atomically) decides how many rows are valid, so an
+interrupted append is ignored and truncated on the next write. Filling a gap
+re-sorts the rows into a new data directory (v2, ...) that only becomes
+current when the manifest naming it replaces the old one, so an interrupted
+rewrite leaves the previous version intact. Manifests of version 1 keep
+their files in the area directory itself.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .inference import feature_matrix
+
+
+MATRIX_STORE_DIR = Path(
+    os.getenv(
+        "ELPRICE_MATRIX_DIR",
+        Path(__file__).resolve().parent.parent / "data" / "features",
+    )
+)
+
+TIME_COLUMN = "unix_time"
+TARGET_COLUMN = "price_sek"
+MANIFEST_VERSION = 2
+
+_TIME_DTYPE = np.dtype("<i8")
+_VALUE_DTYPE = np.dtype("<f4")
+
+
+def _to_unix_ms(value) -> int:
+    """unix_time (ms) of an int, date string or timestamp (naive = UTC)."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.value // 10**6)
+
+
+def _map(path: Path, dtype: np.dtype, shape: tuple) -> np.ndarray:
+    """Read-only memmap (np.memmap cannot map zero bytes)."""
+    if not shape[0]:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+class FeatureMatrix:
+    """
+    Read-only, memory-mapped rows [start, stop) of one area's matrix.
+
+    Pickles as its file location, so worker processes map the same pages
+    instead of receiving a copy.
+
+    Attributes:
+        unix_time: int64 row keys (ms), ascending
+        X: float32 features, shape (rows, len(columns))
+        y: float32 target (None if the store has no target column)
+        columns: Feature names of X's columns
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Sequence[str],
+        target: Optional[str],
+        rows: int,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.target = target
+        self._rows = rows
+        self.start = start
+        self.stop = rows if stop is None else stop
+
+        window = slice(self.start, self.stop)
+        self.unix_time = _map(self.path / "unix_time.bin", _TIME_DTYPE, (rows,))[window]
+        self.X = _map(self.path / "features.bin", _VALUE_DTYPE, (rows, len(self.columns)))[window]
+        self.y = _map(self.path / "target.bin", _VALUE_DTYPE, (rows,))[window] if target else None
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __reduce__(self):
+        return FeatureMatrix, (self.path, self.columns, self.target, self._rows, self.start, self.stop)
+
+    def index_range(self, start=None, end=None) -> tuple[int, int]:
+        """Row positions of [start, end) (unix ms, date strings or timestamps)."""
+        a = 0 if start is None else int(np.searchsorted(self.unix_time, _to_unix_ms(start), "left"))
+        b = len(self) if end is None else int(np.searchsorted(self.unix_time, _to_unix_ms(end), "left"))
+        return a, max(a, b)
+
+    def between(self, start=None, end=None) -> "FeatureMatrix":
+        """Rows with start <= unix_time < end, as a view of the same maps."""
+        a, b = self.index_range(start, end)
+        view = object.__new__(FeatureMatrix)
+        view.__dict__.update(self.__dict__)
+        view.start, view.stop = self.start + a, self.start + b
+        view.unix_time, view.X = self.unix_time[a:b], self.X[a:b]
+        view.y = self.y[a:b] if self.y is not None else None
+        return view
+
+    def features(self, columns: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Feature block in the given column order: the mapped X itself when
+        columns is None or all columns in stored order, else a copy.
+        """
+        if columns is None or list(columns) == self.columns:
+            return self.X
+        missing = [c for c in columns if c not in self.columns]
+        if missing:
+            raise ValueError(f"Missing features: {missing}")
+        return np.ascontiguousarray(self.X[:, [self.columns.index(c) for c in columns]])
+
+    def column(self, name: str) -> np.ndarray:
+        if name == self.target:
+            return self.y
+        return self.X[:, self.columns.index(name)]
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.to_datetime(self.unix_time, unit="ms", utc=True)
+
+    def to_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame(np.asarray(self.X), columns=self.columns)
+        df.insert(0, TIME_COLUMN, np.asarray(self.unix_time))
+        df.insert(1, "date", self.dates)
+        if self.target:
+            df[self.target] = np.asarray(self.y)
+        return df
+
+
+class FeatureMatrixStore:
+    """
+    Feature matrices partitioned by price area.
+
+    Args:
+        root: Directory of the store (default: data/features in the repo, or
+            ELPRICE_MATRIX_DIR if set)
+    """
+
+    def __init__(self, root: Optional[Path | str] = None):
+        self.root = Path(root) if root is not None else MATRIX_STORE_DIR
+
+    def _area_dir(self, price_area: str) -> Path:
+        return self.root / f"price_area={price_area.upper()}"
+
+    def _data_dir(self, price_area: str, manifest: dict) -> Path:
+        """Directory of the .bin files the manifest describes."""
+        return self._area_dir(price_area) / manifest.get("data", "")
+
+    def manifest(self, price_area: str) -> Optional[dict]:
+        path = self._area_dir(price_area) / "manifest.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def open(self, price_area: str) -> FeatureMatrix:
+        """Map the stored matrix of an area."""
+        manifest = self.manifest(price_area)
+        if manifest is None:
+            raise FileNotFoundError(f"No feature matrix for {price_area} in {self.root}")
+        return FeatureMatrix(
+            self._data_dir(price_area, manifest), manifest["columns"], manifest["target"], manifest["rows"]
+        )
+
+    def last_unix_time(self, price_area: str) -> Optional[int]:
+        manifest = self.manifest(price_area)
+        return manifest["last_unix_time"] if manifest and manifest["rows"] else None
+
+    def write(
+        self,
+        price_area: str,
+        df: pd.DataFrame,
+        columns: Optional[Sequence[str]] = None,
+        target: Optional[str] = TARGET_COLUMN,
+    ) -> int:
+        """
+        Merge feature rows into the store.
+
+        Rows after the last stored hour are appended; rows for stored hours
+        overwrite them in place. Only rows that fall between stored hours
+        (a gap being filled) rewrite the files.
+
+        Args:
+            price_area: Area partition to write to
+            df: Rows with unix_time (ms), the feature columns and the target
+            columns: Feature columns of a new matrix (default: every numeric
+                column except unix_time and the target); an existing matrix
+                keeps its manifest columns
+            target: Target column of a new matrix (None for features only)
+
+        Returns:
+            Number of rows written
+        """
+        if df.empty:
+            return 0
+
+        area_dir = self._area_dir(price_area)
+        manifest = self.manifest(price_area)
+        if manifest is None:
+            if columns is None:
+                columns = [
+                    c for c in df.select_dtypes(include=["number", "bool"]).columns
+                    if c not in (TIME_COLUMN, target)
+                ]
+            if target is not None and target not in df.columns:
+                target = None
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "columns": list(columns),
+                "target": target,
+                "time_unit": "ms",
+                "rows": 0,
+                "last_unix_time": None,
+                "data": "v1",
+            }
+
+        if manifest["target"] and manifest["target"] not in df.columns:
+            raise ValueError(f"Missing target column: {manifest['target']}")
+
+        df = df.sort_values(TIME_COLUMN).drop_duplicates(TIME_COLUMN, keep="last")
+        times = df[TIME_COLUMN].to_numpy(dtype=np.int64)
+        X = feature_matrix(df, manifest["columns"])
+        y = df[manifest["target"]].to_numpy(dtype=np.float32, na_value=np.nan) if manifest["target"] else None
+
+        data_dir = self._data_dir(price_area, manifest)
+        rows = manifest["rows"]
+        stored = _map(data_dir / "unix_time.bin", _TIME_DTYPE, (rows,))
+        last = int(stored[-1]) if rows else None
+
+        tail = times > last if last is not None else np.ones(len(times), dtype=bool)
+        head = ~tail
+        if head.any():
+            pos = np.searchsorted(stored, times[head])
+            exact = (pos < rows) & (stored[np.minimum(pos, rows - 1)] == times[head])
+            if not exact.all():
+                self._rewrite(price_area, manifest, times, X, y)
+                return len(times)
+            self._update(data_dir, manifest, pos, X[head], None if y is None else y[head])
+
+        if tail.any():
+            self._append(area_dir, data_dir, manifest, times[tail], X[tail], None if y is None else y[tail])
+        return len(times)
+
+    # -------------------------------------------------------------------------
+
+    def _files(self, data_dir: Path, manifest: dict) -> list[tuple[Path, int]]:
+        """(file, bytes per row) of every array in the matrix."""
+        files = [
+            (data_dir / "unix_time.bin", _TIME_DTYPE.itemsize),
+            (data_dir / "features.bin", _VALUE_DTYPE.itemsize * len(manifest["columns"])),
+        ]
+        if manifest["target"]:
+            files.append((data_dir / "target.bin", _VALUE_DTYPE.itemsize))
+        return files
+
+    def _commit(self, area_dir: Path, manifest: dict, last_unix_time: int) -> None:
+        manifest["last_unix_time"] = int(last_unix_time)
+        tmp = area_dir / "manifest.json.tmp"
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, area_dir / "manifest.json")
+
+    def _append(self, area_dir: Path, data_dir: Path, manifest: dict, times: np.ndarray, X: np.ndarray, y) -> None:
+        data_dir.mkdir(parents=True, exist_ok=True)
+        arrays = [times.astype(_TIME_DTYPE), X.astype(_VALUE_DTYPE)] + ([y.astype(_VALUE_DTYPE)] if y is not None else [])
+        for (path, row_bytes), values in zip(self._files(data_dir, manifest), arrays):
+            with open(path, "ab") as f:
+                # Drop rows of an interrupted append that the manifest never counted
+                f.truncate(manifest["rows"] * row_bytes)
+                f.write(np.ascontiguousarray(values).tobytes())
+        manifest["rows"] += len(times)
+        self._commit(area_dir, manifest, times[-1])
+
+    def _update(self, data_dir: Path, manifest: dict, pos: np.ndarray, X: np.ndarray, y) -> None:
+        shape = (manifest["rows"], len(manifest["columns"]))
+        features = np.memmap(data_dir / "features.bin", dtype=_VALUE_DTYPE, mode="r+", shape=shape)
+        features[pos] = X
+        features.flush()
+        if y is not None:
+            target = np.memmap(data_dir / "target.bin", dtype=_VALUE_DTYPE, mode="r+", shape=(shape[0],))
+            target[pos] = y
+            target.flush()
+
+    def _rewrite(self, price_area: str, manifest: dict, times: np.ndarray, X: np.ndarray, y) -> None:
+        """
+        Merge new rows into the stored ones and write all files to a new data
+        directory, made current by the manifest commit; older versions are
+        removed afterwards.
+        """
+        area_dir = self._area_dir(price_area)
+        old_dir = self._data_dir(price_area, manifest)
+        if manifest["rows"]:
+            old = self.open(price_area)
+            keep = ~np.isin(old.unix_time, times)
+            times = np.concatenate([old.unix_time[keep], times])
+            X = np.concatenate([old.X[keep], X])
+            if y is not None:
+                y = np.concatenate([old.y[keep], y])
+            order = np.argsort(times, kind="stable")
+            times, X = times[order], X[order]
+            y = y[order] if y is not None else None
+            del old
+
+        current = manifest.get("data", "")
+        version = int(current[1:]) + 1 if current.startswith("v") else 1
+        new_dir = area_dir / f"v{version}"
+        # Left over from an interrupted rewrite (never referenced by a manifest)
+        shutil.rmtree(new_dir, ignore_errors=True)
+        new_dir.mkdir(parents=True)
+
+        arrays = [times.astype(_TIME_DTYPE), X.astype(_VALUE_DTYPE)] + ([y.astype(_VALUE_DTYPE)] if y is not None else [])
+        for (path, _), values in zip(self._files(new_dir, manifest), arrays):
+            with open(path, "wb") as f:
+                np.ascontiguousarray(values).tofile(f)
+                f.flush()
+                os.fsync(f.fileno())
+
+        old_files = self._files(old_dir, manifest)
+        manifest.update(version=MANIFEST_VERSION, data=new_dir.name, rows=len(times))
+        self._commit(area_dir, manifest, times[-1])
+
+        # Old maps stay readable (POSIX keeps unlinked files alive while mapped)
+        if old_dir == area_dir:
+            for path, _ in old_files:
+                path.unlink(missing_ok=True)
+        else:
+            shutil.rmtree(old_dir, ignore_errors=True)
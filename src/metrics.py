@@ -0,0 +1,217 @@
+"""
+In-process metrics for the API clients and pipelines in src/util.
+
+Counters, histograms and stage timers are recorded into one registry that is
+disabled by default; every recording call then returns immediately. Enable it
+with ELPRICE_METRICS=1 or metrics.enable(), and export with to_json() or
+to_prometheus() (Prometheus text exposition format).
+
+Metric names:
+    elprice_http_request_seconds      histogram  api, source
+    elprice_http_responses_total      counter    api, status
+    elprice_http_retries_total        counter    api, reason
+    elprice_http_response_bytes_total counter    api
+    elprice_cache_requests_total      counter    api, result (hit/miss)
+    elprice_stage_seconds             histogram  pipeline, stage
+    elprice_inference_rows_total      counter    result (memo/predicted)
+    elprice_validation_failures_total counter    rules, column
+    elprice_serving_requests_total    counter    endpoint, status
+    elprice_serving_request_seconds   histogram  endpoint
+"""
+
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Optional
+
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_NULL_TIMER = nullcontext()
+
+
+def _escape(value) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "labels", "start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: dict):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of labelled counters and histograms.
+
+    Args:
+        enabled: Record metrics (when False all recording calls are no-ops)
+        buckets: Histogram bucket upper bounds in seconds
+    """
+
+    def __init__(self, enabled: bool = False, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._counters: dict[tuple, float] = {}
+        self._histograms: dict[tuple, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Add `value` to a counter."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record one observation (seconds) in a histogram."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram(self.buckets)
+            hist.observe(value)
+
+    def timer(self, name: str, **labels):
+        """Context manager observing the wall time of its block in a histogram."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        """
+        Current values as plain data.
+
+        Returns:
+            {"counters": [...], "histograms": [...]} with one entry per name and
+            label set; histogram bucket counts are per bucket (not cumulative)
+        """
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "buckets": list(hist.buckets) + [math.inf],
+                    "counts": list(hist.counts),
+                    "sum": hist.sum,
+                    "count": hist.count,
+                }
+                for (name, labels), hist in sorted(self._histograms.items())
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        snap = self.snapshot()
+        for hist in snap["histograms"]:
+            hist["buckets"] = [b if math.isfinite(b) else "+Inf" for b in hist["buckets"]]
+        return json.dumps(snap, indent=indent)
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        snap = self.snapshot()
+        lines: list[str] = []
+        typed: set[str] = set()
+
+        def _labels(labels: dict, extra: Optional[tuple[str, str]] = None) -> str:
+            items = list(labels.items()) + ([extra] if extra else [])
+            if not items:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+        for c in snap["counters"]:
+            if c["name"] not in typed:
+                lines.append(f"# TYPE {c['name']} counter")
+                typed.add(c["name"])
+            lines.append(f"{c['name']}{_labels(c['labels'])} {c['value']:g}")
+
+        for h in snap["histograms"]:
+            if h["name"] not in typed:
+                lines.append(f"# TYPE {h['name']} histogram")
+                typed.add(h["name"])
+            cumulative = 0
+            for bound, count in zip(h["buckets"], h["counts"]):
+                cumulative += count
+                le = "+Inf" if math.isinf(bound) else f"{bound:g}"
+                lines.append(f"{h['name']}_bucket{_labels(h['labels'], ('le', le))} {cumulative}")
+            lines.append(f"{h['name']}_sum{_labels(h['labels'])} {h['sum']:.6f}")
+            lines.append(f"{h['name']}_count{_labels(h['labels'])} {h['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry used by src/util
+METRICS = MetricsRegistry(enabled=os.getenv("ELPRICE_METRICS", "").lower() in ("1", "true", "yes"))
+
+inc = METRICS.inc
+observe = METRICS.observe
+timer = METRICS.timer
+
+
+def enable() -> None:
+    METRICS.enabled = True
+
+
+def disable() -> None:
+    METRICS.enabled = False
+
+
+def to_json(indent: Optional[int] = 2) -> str:
+    return METRICS.to_json(indent)
+
+
+def to_prometheus() -> str:
+    return METRICS.to_prometheus()
+
+
+def write(path: Path | str) -> Path:
+    """Write the registry to `path`; .prom/.txt as Prometheus text, else JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = to_prometheus() if path.suffix in (".prom", ".txt") else to_json()
+    path.write_text(text)
+    return path
@@ -0,0 +1,24 @@
+"""
+Command-line entry points for the feature, training and inference pipelines.
+
+Each pipeline is a plain module with a run() function and a main() CLI that
+replaces the matching notebook in NotebooksElectricity:
+
+    python -m src.pipelines backfill   # notebook 1: backfill + create feature groups
+    python -m src.pipelines ingest     # notebook 2: daily feature ingestion
+    python -m src.pipelines train      # notebook 3: training + model registry
+    python -m src.pipelines infer      # notebook 4: batch inference + dashboard assets
+    python -m src.pipelines backtest   # walk-forward backtest over the full history
+
+Heavy dependencies (hopsworks, xgboost, matplotlib, sklearn) are imported
+inside the functions that need them, so importing this package is cheap.
+"""
+
+# Sub-command -> module under src.pipelines
+COMMANDS = {
+    "backfill": "backfill",
+    "ingest": "ingest",
+    "train": "train",
+    "infer": "infer",
+    "backtest": "backtest",
+}
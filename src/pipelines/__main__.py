@@ -0,0 +1,31 @@
+"""
+Dispatch `python -m src.pipelines <command> [options]` to a pipeline module.
+"""
+
+import importlib
+import sys
+from typing import Optional
+
+from . import COMMANDS
+
+
+USAGE = "usage: python -m src.pipelines {%s} [options]" % ",".join(COMMANDS)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(USAGE)
+        return 0 if argv else 2
+
+    command, *rest = argv
+    if command not in COMMANDS:
+        print(f"unknown command: {command}\n{USAGE}", file=sys.stderr)
+        return 2
+
+    module = importlib.import_module(f"{__package__}.{COMMANDS[command]}")
+    return module.main(rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
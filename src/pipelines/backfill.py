@@ -0,0 +1,173 @@
+"""
+Historical backfill (replaces notebook 1).
+
+Fetches all prices since ELPRICE_EARLIEST_DATE (reusing the local price
+store) and the matching weather, creates the electricity_prices and
+weather_hourly feature groups with their feature descriptions, checks the
+rows against the src.validation rules, inserts them and saves the location
+secret.
+
+    python -m src.pipelines backfill [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+"""
+
+import logging
+from datetime import date
+from typing import Optional
+
+from . import common
+
+
+logger = logging.getLogger(__name__)
+
+PRICE_DESCRIPTIONS = {
+    "unix_time": "Timestamp in unix epoch milliseconds (Primary Key)",
+    "date": "Timestamp of the price period start (hourly)",
+    "hour": "Hour of the day (0-23)",
+    "price_area": "Swedish electricity price area (SE1-SE4)",
+    "price_sek": "Electricity price in SEK per kWh (excl. VAT)",
+    "weekday": "0=Mon ... 6=Sun",
+    "is_weekend": "1 if Saturday/Sunday else 0",
+    "month": "Month number 1-12",
+    "season": "0 winter, 1 spring, 2 summer, 3 autumn",
+    "is_holiday": "1 if Swedish public holiday else 0",
+    "price_lag_24": "Price 24h ago",
+    "price_lag_48": "Price 48h ago",
+    "price_lag_72": "Price 72h ago",
+    "price_roll3d": "Rolling mean over last 72h",
+}
+
+WEATHER_DESCRIPTIONS = {
+    "unix_time": "Timestamp in unix epoch milliseconds (Primary Key)",
+    "date": "Timestamp of the weather measurement (hourly)",
+    "hour": "Hour of the day (0-23)",
+    "price_area": "Swedish electricity price area (SE1-SE4)",
+    "temperature_2m": "Air temperature at 2m height in °C",
+    "apparent_temperature": "Feels-like temperature in °C (affects heating/cooling demand)",
+    "precipitation": "Total precipitation (rain + snow) in mm",
+    "rain": "Rainfall in mm",
+    "snowfall": "Snowfall in cm",
+    "cloud_cover": "Total cloud cover in % (affects solar power generation)",
+    "wind_speed_10m": "Wind speed at 10m in km/h",
+    "wind_speed_100m": "Wind speed at 100m (turbine height) in km/h - key for wind power",
+    "wind_direction_10m": "Wind direction at 10m in degrees",
+    "wind_direction_100m": "Wind direction at 100m in degrees",
+    "wind_gusts_10m": "Wind gusts at 10m in km/h (can cause turbine shutdowns)",
+    "surface_pressure": "Surface pressure in hPa (weather patterns)",
+    "weekday": "0=Mon ... 6=Sun",
+    "is_weekend": "1 if Saturday/Sunday else 0",
+    "month": "Month number 1-12",
+    "season": "0 winter, 1 spring, 2 summer, 3 autumn",
+    "is_holiday": "1 if Swedish public holiday else 0",
+}
+
+
+def build_rows(start_date: date, end_date: date, location: dict) -> tuple:
+    """(prices, weather) feature-group rows for [start_date, end_date]."""
+    from src import util
+
+    price_area = location["price_area"]
+
+    raw_prices = util.fetch_electricity_prices(start_date, end_date, price_area, store=util.PriceStore())
+    df_prices = common.price_feature_rows(raw_prices, price_area)
+
+    weather = util.get_hourly_historical_weather(
+        latitude=location["latitude"],
+        longitude=location["longitude"],
+        start_date=str(df_prices["date"].min().date()),
+        end_date=str(end_date),
+        city=price_area.lower(),
+    )
+    df_weather = common.weather_feature_rows(weather, price_area)
+
+    # Drop rows with missing values after lag/holiday computation
+    return df_prices.dropna().reset_index(drop=True), df_weather.dropna().reset_index(drop=True)
+
+
+def _describe(fg, descriptions: dict[str, str]) -> None:
+    for name, description in descriptions.items():
+        fg.update_feature_description(name, description)
+
+
+def run(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    location: Optional[dict] = None,
+) -> dict[str, int]:
+    """
+    Backfill both feature groups.
+
+    Args:
+        start_date: First day (default: ELPRICE_EARLIEST_DATE)
+        end_date: Last day (default: today)
+        location: price_area/city/latitude/longitude (default: DEFAULT_LOCATION)
+
+    Returns:
+        Number of rows inserted per feature group
+    """
+    from src import util
+
+    start_date = start_date or util.ELPRICE_EARLIEST_DATE
+    end_date = end_date or date.today()
+    location = location or dict(common.DEFAULT_LOCATION)
+
+    logger.info(f"Price Area: {location['price_area']}")
+    logger.info(f"City: {location['city']} ({location['latitude']}, {location['longitude']})")
+    logger.info(f"Date range: {start_date} to {end_date}")
+
+    df_prices, df_weather = build_rows(start_date, end_date, location)
+
+    project = common.login()
+    fs = project.get_feature_store()
+
+    prices_fg = fs.get_or_create_feature_group(
+        name=common.PRICES_FG,
+        description="Hourly electricity prices for Swedish price areas (SEK only)",
+        version=common.FG_VERSION,
+        primary_key=["price_area", "unix_time"],
+        event_time="date",
+        online_enabled=True,
+    )
+    common.insert_rows(prices_fg, df_prices, common.PRICES_FG, wait=True)
+    _describe(prices_fg, PRICE_DESCRIPTIONS)
+    logger.info(f"Feature group ready: {prices_fg.name} v{prices_fg.version} ({len(df_prices):,} rows)")
+
+    weather_fg = fs.get_or_create_feature_group(
+        name=common.WEATHER_FG,
+        description="Hourly weather data for electricity price prediction",
+        version=common.FG_VERSION,
+        primary_key=["price_area", "unix_time"],
+        event_time="date",
+        online_enabled=True,
+    )
+    common.insert_rows(weather_fg, df_weather, common.WEATHER_FG, wait=True)
+    _describe(weather_fg, WEATHER_DESCRIPTIONS)
+    logger.info(f"Feature group ready: {weather_fg.name} v{weather_fg.version} ({len(df_weather):,} rows)")
+
+    common.save_location(location)
+
+    return {common.PRICES_FG: len(df_prices), common.WEATHER_FG: len(df_weather)}
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = common.build_parser("backfill", __doc__.strip().splitlines()[0])
+    parser.add_argument("--start", type=common.parse_date, help="first day (default: 2022-11-01)")
+    parser.add_argument("--end", type=common.parse_date, help="last day (default: today)")
+    parser.add_argument("--price-area", default=common.DEFAULT_LOCATION["price_area"])
+    parser.add_argument("--city", default=common.DEFAULT_LOCATION["city"])
+    parser.add_argument("--latitude", type=float, default=common.DEFAULT_LOCATION["latitude"])
+    parser.add_argument("--longitude", type=float, default=common.DEFAULT_LOCATION["longitude"])
+    args = parser.parse_args(argv)
+
+    location = {
+        "price_area": args.price_area,
+        "city": args.city,
+        "latitude": args.latitude,
+        "longitude": args.longitude,
+    }
+    with common.cli_session(args):
+        run(start_date=args.start, end_date=args.end, location=location)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
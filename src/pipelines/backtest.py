@@ -0,0 +1,193 @@
+"""
+Walk-forward backtest over the full history.
+
+Loads the training feature view (or a local Parquet export of it), retrains
+the production model configuration every --retrain-every days on the data
+available at that time and scores the next days' forecasts, from 2022-11
+onwards. Writes the per-fold metrics table and, optionally, every forecast.
+
+With --matrix-store the rows go through the local memory-mapped feature
+matrix (src/matrix_store.py): only rows newer than the stored ones are
+fetched, and the folds train on the mapped file.
+
+    python -m src.pipelines backtest [--retrain-every 7] [--out folds.csv] [--predictions-out preds.parquet]
+    python -m src.pipelines backtest --features features.parquet --retrain-every 1 --n-jobs 8
+    python -m src.pipelines backtest --matrix-store data/features [--no-sync]
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+from . import common
+
+
+logger = logging.getLogger(__name__)
+
+
+def load_features(location: dict, features_path: Optional[Path] = None):
+    """Feature view rows (model columns, date, price_sek), from Hopsworks or a Parquet file."""
+    import pandas as pd
+
+    from .train import get_feature_view
+
+    if features_path is not None:
+        return pd.read_parquet(features_path)
+
+    project = common.login()
+    feature_view = get_feature_view(project.get_feature_store(), location["price_area"])
+    X, y = feature_view.training_data(description="walk-forward backtest")
+    df = X.copy()
+    df["price_sek"] = y.iloc[:, 0].to_numpy()
+    return df
+
+
+def load_matrix(price_area: str, store_dir: Path, features_path: Optional[Path] = None, sync: bool = True):
+    """
+    Mapped feature matrix of an area, after merging new rows into it (from
+    features_path, or from Hopsworks when sync is set).
+    """
+    import pandas as pd
+
+    from src.matrix_store import FeatureMatrixStore
+
+    from .train import feature_columns, get_feature_view, sync_feature_matrix
+
+    store = FeatureMatrixStore(store_dir)
+    if features_path is not None:
+        df = pd.read_parquet(features_path)
+        store.write(price_area, df, columns=[c for c in feature_columns(df.columns) if c != "price_sek"])
+    elif sync:
+        project = common.login()
+        return sync_feature_matrix(get_feature_view(project.get_feature_store(), price_area), price_area, store)
+    return store.open(price_area)
+
+
+def run(
+    location: Optional[dict] = None,
+    features_path: Optional[Path] = None,
+    matrix_store: Optional[Path] = None,
+    sync: bool = True,
+    model_path: Optional[Path] = None,
+    n_estimators: Optional[int] = None,
+    retrain_every: int = 7,
+    min_train_days: Optional[int] = None,
+    window_days: Optional[int] = None,
+    start: Optional[str] = None,
+    n_jobs: Optional[int] = None,
+    out: Optional[Path] = None,
+    predictions_out: Optional[Path] = None,
+):
+    """
+    Backtest the model configuration of model_path.
+
+    Args:
+        location: Location config (default: the ELECTRICITY_LOCATION_JSON secret,
+            or common.DEFAULT_LOCATION when nothing is read from Hopsworks)
+        features_path: Parquet file with the feature view rows instead of Hopsworks
+        matrix_store: Backtest on the memory-mapped feature matrix in this directory
+        sync: With matrix_store, first append new feature view rows from Hopsworks
+        model_path: model.json whose parameters and tree count are backtested
+        n_estimators: Override the number of trees
+        retrain_every: Days between retrains (1 = daily, 7 = weekly)
+        min_train_days: History before the first forecast
+        window_days: Rolling training window (default: expanding)
+        start: First forecast day (default: backtest.HISTORY_START)
+        n_jobs: Cores to use (default: all)
+        out: CSV file for the per-fold metrics
+        predictions_out: Parquet/CSV file for every forecast hour
+
+    Returns:
+        (folds, summary)
+    """
+    from src import backtest
+
+    from .train import MODEL_DIR, feature_columns
+
+    model_path = Path(model_path or MODEL_DIR / "model.json")
+    offline = features_path is not None or (matrix_store is not None and not sync)
+    if location is None:
+        location = common.DEFAULT_LOCATION if offline else common.load_location()
+
+    params, rounds = backtest.params_from_model(model_path)
+    options = dict(
+        retrain_every=retrain_every,
+        min_train_days=min_train_days if min_train_days is not None else backtest.MIN_TRAIN_DAYS,
+        window_days=window_days,
+        start=start or backtest.HISTORY_START,
+        n_jobs=n_jobs,
+    )
+
+    if matrix_store is not None:
+        matrix = load_matrix(location["price_area"], matrix_store, features_path, sync)
+        logger.info(f"Backtesting {model_path} ({rounds} trees, {params}) on {len(matrix)} mapped rows")
+        folds, predictions = backtest.backtest_matrix(matrix, params, n_estimators or rounds, **options)
+    else:
+        df = load_features(location, features_path)
+        logger.info(f"Backtesting {model_path} ({rounds} trees, {params}) on {len(df)} rows")
+        folds, predictions = backtest.backtest(
+            df,
+            [c for c in feature_columns(df.columns) if c != "price_sek"],
+            params,
+            n_estimators or rounds,
+            **options,
+        )
+    summary = backtest.summary(predictions)
+    for name, value in summary.items():
+        logger.info(f"{name}: {value}")
+
+    if out is not None:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        folds.to_csv(out, index=False)
+        logger.info(f"Wrote {len(folds)} folds to {out}")
+    if predictions_out is not None:
+        predictions_out = Path(predictions_out)
+        predictions_out.parent.mkdir(parents=True, exist_ok=True)
+        if predictions_out.suffix == ".csv":
+            predictions.to_csv(predictions_out, index=False)
+        else:
+            predictions.to_parquet(predictions_out, index=False)
+        logger.info(f"Wrote {len(predictions)} forecasts to {predictions_out}")
+
+    return folds, summary
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = common.build_parser("backtest", __doc__.strip().splitlines()[0])
+    parser.add_argument("--price-area", help="price area (default: the configured location)")
+    parser.add_argument("--features", type=Path, help="Parquet export of the feature view (default: Hopsworks)")
+    parser.add_argument("--matrix-store", type=Path, help="use the memory-mapped feature matrix in this directory")
+    parser.add_argument("--no-sync", action="store_true", help="with --matrix-store: use the stored rows as they are")
+    parser.add_argument("--model", type=Path, help="model.json to backtest (default: the training output)")
+    parser.add_argument("--n-estimators", type=int, help="trees per fold (default: as in the model)")
+    parser.add_argument("--retrain-every", type=int, default=7, help="days between retrains (1 = daily, 7 = weekly)")
+    parser.add_argument("--min-train-days", type=int, help="history before the first forecast")
+    parser.add_argument("--window-days", type=int, help="rolling training window (default: all history)")
+    parser.add_argument("--start", help="first forecast day (YYYY-MM-DD)")
+    parser.add_argument("--n-jobs", type=int, help="cores (default: all)")
+    parser.add_argument("--out", type=Path, help="CSV file for the per-fold metrics")
+    parser.add_argument("--predictions-out", type=Path, help="Parquet/CSV file for every forecast hour")
+    args = parser.parse_args(argv)
+
+    with common.cli_session(args):
+        location = {**common.DEFAULT_LOCATION, "price_area": args.price_area} if args.price_area else None
+        run(
+            location=location,
+            features_path=args.features,
+            matrix_store=args.matrix_store,
+            sync=not args.no_sync,
+            model_path=args.model,
+            n_estimators=args.n_estimators,
+            retrain_every=args.retrain_every,
+            min_train_days=args.min_train_days,
+            window_days=args.window_days,
+            start=args.start,
+            n_jobs=args.n_jobs,
+            out=args.out,
+            predictions_out=args.predictions_out,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,528 @@
+"""
+Batch inference (replaces notebook 4).
+
+Loads the best registered model (cached per version, see src/inference.py),
+predicts tomorrow's hourly prices from the weather forecast and recent price
+lags and writes the dashboard assets: forecast_summary.json plus the price
+signal, feature importance and price trend plots under
+docs/PricesDashboard/assets (rendered in parallel and only when their inputs
+change, see src/render.py).
+
+Every forecast and, a day later, its actual prices go into the forecast
+archive (src/forecast_archive.py, under assets/data/archive). The trend plot
+shows last week's issued forecasts from the archive; until the archive covers
+the week, those hours are predicted again in the same batch as tomorrow.
+
+    python -m src.pipelines infer [--assets-root DIR]
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+
+from src.util.schema import ELECTRICITY_PRICES, WEATHER_HOURLY, conform
+
+from . import common
+
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TZ = "Europe/Stockholm"
+
+# Days of price history read for the lag features
+LAG_BUFFER_DAYS = 4
+
+# Feature-group columns exposed to the model under the feature view prefix
+PREFIXED_FEATURES = [
+    "unix_time",
+    "weekday",
+    "is_weekend",
+    "month",
+    "season",
+    "is_holiday",
+    "price_lag_24",
+    "price_lag_48",
+    "price_lag_72",
+    "price_roll3d",
+]
+
+STAGE_COLORS = {
+    "Low": "#22c55e",     # green
+    "Medium": "#f59e0b",  # amber
+    "High": "#ef4444",    # red
+}
+
+
+# =============================================================================
+# Model + features
+# =============================================================================
+
+def add_model_columns(df):
+    """Copy feature-group columns to the electricity_prices_* names used by the model."""
+    for col in PREFIXED_FEATURES:
+        df[f"electricity_prices_{col}"] = df[col]
+    return df
+
+
+def recent_prices(prices_fg, price_area: str):
+    """Prices of the last LAG_BUFFER_DAYS days (price_area, date, hour, unix_time, price_sek)."""
+    import pandas as pd
+
+    lookback_start = (pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=LAG_BUFFER_DAYS)).normalize()
+    hist_prices = prices_fg.filter(
+        (prices_fg.price_area == price_area.lower()) & (prices_fg.date >= lookback_start)
+    ).read()
+    hist_prices = conform(hist_prices, ELECTRICITY_PRICES, copy=False)
+    return hist_prices.sort_values("unix_time")[["price_area", "date", "hour", "unix_time", "price_sek"]]
+
+
+def build_forecast_features(prices_fg, location: dict, hist_prices=None):
+    """
+    Model inputs for tomorrow (UTC day): weather forecast, calendar and price lags.
+
+    Args:
+        prices_fg: electricity_prices feature group (for the lag history)
+        location: Location config (price_area, latitude, longitude)
+        hist_prices: recent_prices() if already read
+
+    Returns:
+        DataFrame with one row per forecast hour, keys and model columns
+    """
+    import numpy as np
+    import pandas as pd
+
+    from src import util
+
+    price_area = location["price_area"]
+    area = price_area.lower()
+
+    if hist_prices is None:
+        hist_prices = recent_prices(prices_fg, price_area)
+
+    forecast = util.get_hourly_weather_forecast(
+        latitude=location["latitude"],
+        longitude=location["longitude"],
+        city=area,
+        forecast_days=2,
+    )
+    forecast = common._add_keys(forecast, price_area, WEATHER_HOURLY)
+
+    forecast_day = (pd.Timestamp.now(tz="UTC").normalize() + pd.Timedelta(days=1)).date()
+    forecast = forecast[forecast["date"].dt.date == forecast_day].copy()
+    forecast = util.add_calendar_features(forecast, time_col="date")
+
+    # Lags: append the forecast hours (price unknown) to the history
+    future = forecast[["price_area", "date", "hour", "unix_time"]].copy()
+    future["price_sek"] = np.nan
+    lag_base = pd.concat([hist_prices, future], ignore_index=True)
+    lag_base = util.add_feature_group_price_lags(lag_base)
+
+    lags = lag_base[lag_base["price_sek"].isna()][
+        ["unix_time", "price_lag_24", "price_lag_48", "price_lag_72", "price_roll3d"]
+    ]
+    forecast = forecast.merge(lags, on="unix_time", how="left")
+    return add_model_columns(forecast)
+
+
+# =============================================================================
+# Dashboard assets
+# =============================================================================
+
+def _hour_price_records(df, price_col: str) -> list[dict]:
+    return [
+        {"hour_local": int(r["hour_local"]), "price": float(r[price_col])}
+        for r in df[["hour_local", price_col]].to_dict("records")
+    ]
+
+
+def forecast_summary(forecast_df, price_area: str, price_col: str = "predicted_price_sek", window: int = 4) -> dict:
+    """
+    Small JSON summary of tomorrow's forecast used by docs/index.md.
+
+    Args:
+        forecast_df: Forecast rows with 'date' (UTC) and price_col
+        price_area: Region label
+        price_col: Column with predicted prices
+        window: Length (hours) of the cheapest consecutive window
+
+    Returns:
+        Summary dict (empty lists/None fields if there are no rows)
+    """
+    import pandas as pd
+
+    summary = {
+        "generated_at_utc": pd.Timestamp.now(tz="UTC").isoformat(),
+        "timezone": LOCAL_TZ,
+        "region": price_area,
+        "date_local": None,
+        "predicted_prices": [],
+        "cheapest_hours": [],
+        "most_expensive_hours": [],
+        "best_window_hours": None,
+    }
+
+    plot_df = forecast_df.sort_values("date").copy()
+    plot_df["local_time"] = plot_df["date"].dt.tz_convert(LOCAL_TZ)
+    if not len(plot_df):
+        return summary
+
+    tomorrow_local_date = plot_df["local_time"].dt.date.mode().iloc[0]
+    day_df = plot_df[plot_df["local_time"].dt.date == tomorrow_local_date].copy()
+    day_df["hour_local"] = day_df["local_time"].dt.hour.astype(int)
+    day_df = day_df.sort_values("hour_local")
+    s = day_df[price_col].astype(float).reset_index(drop=True)
+
+    roll = s.rolling(window, min_periods=window).mean()
+    best_end = int(roll.idxmin()) if roll.notna().any() else None
+    best_start = (best_end - (window - 1)) if best_end is not None else None
+
+    best_window = None
+    if best_start is not None and best_start >= 0:
+        best_window = {
+            "start_hour": int(day_df.iloc[best_start]["hour_local"]),
+            "end_hour": int(day_df.iloc[best_end]["hour_local"]),
+            "avg_price": float(roll.iloc[best_end]),
+        }
+
+    summary.update(
+        date_local=str(tomorrow_local_date),
+        predicted_prices=_hour_price_records(day_df, price_col),
+        cheapest_hours=_hour_price_records(day_df.nsmallest(3, price_col), price_col),
+        most_expensive_hours=_hour_price_records(day_df.nlargest(3, price_col), price_col),
+        best_window_hours=best_window,
+    )
+    return summary
+
+
+def plot_price_signal(forecast_df, file_path: Path, price_col: str = "predicted_price_sek") -> None:
+    """Bar chart of tomorrow's (local day) predicted prices coloured by low/medium/high tertile."""
+    import matplotlib.dates as mdates
+    import pandas as pd
+    import seaborn as sns
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Patch
+
+    forecast_plot = forecast_df.sort_values("date").copy()
+    forecast_plot["local_time"] = forecast_plot["date"].dt.tz_convert(LOCAL_TZ)
+
+    # Pick tomorrow in local time to avoid UTC/local off-by-one hour/day confusion
+    tomorrow_local_date = (pd.Timestamp.now(tz=LOCAL_TZ).floor("D") + pd.Timedelta(days=1)).date()
+    day_plot = forecast_plot[forecast_plot["local_time"].dt.date == tomorrow_local_date].copy()
+
+    # Fallback (in case upstream filtering produced a different day)
+    if day_plot.empty:
+        day_plot = forecast_plot
+        tomorrow_local_date = day_plot["local_time"].dt.date.mode().iloc[0]
+
+    day_plot = day_plot.sort_values("local_time")
+
+    q_low, q_high = day_plot[price_col].quantile([0.33, 0.66])
+    stage = pd.Series("High", index=day_plot.index)
+    stage[day_plot[price_col] <= q_high] = "Medium"
+    stage[day_plot[price_col] <= q_low] = "Low"
+    colors = stage.map(STAGE_COLORS)
+
+    mean_price = day_plot[price_col].mean()
+
+    fig = Figure(figsize=(14, 7))
+    ax = fig.subplots()
+    ax.bar(
+        day_plot["local_time"],
+        day_plot[price_col],
+        color=colors,
+        alpha=0.92,
+        width=0.03,
+        edgecolor="white",
+        linewidth=0.6,
+    )
+
+    # Reference lines
+    ax.axhline(
+        y=mean_price,
+        color="#64748b",
+        linestyle="--",
+        alpha=0.7,
+        linewidth=1.5,
+        label=f"Average: {mean_price:.2f} SEK/kWh",
+    )
+    ax.axhline(y=q_low, color="#94a3b8", linestyle=":", alpha=0.6, linewidth=1.2)
+    ax.axhline(y=q_high, color="#94a3b8", linestyle=":", alpha=0.6, linewidth=1.2)
+
+    ax.set_title(f"Predicted prices for tomorrow ({tomorrow_local_date})", fontsize=22, pad=18)
+    ax.set_xlabel("Hour (local time)", fontsize=16)
+    ax.set_ylabel("Price (SEK/kWh)", fontsize=16)
+    ax.tick_params(axis="both", labelsize=12)
+
+    ax.text(
+        0.01,
+        0.98,
+        f"Date: {tomorrow_local_date}",
+        transform=ax.transAxes,
+        va="top",
+        ha="left",
+        fontsize=13,
+        bbox=dict(facecolor="white", alpha=0.9, edgecolor="none"),
+    )
+
+    stage_handles = [
+        Patch(facecolor=STAGE_COLORS[k], edgecolor="none", label=f"{k} price") for k in ["Low", "Medium", "High"]
+    ]
+    handles, _ = ax.get_legend_handles_labels()
+    ax.legend(handles=stage_handles + handles, loc="upper right", fontsize=12, frameon=True)
+
+    # Full local day, 00:00 -> 00:00
+    ax.xaxis.set_major_locator(mdates.HourLocator(interval=2))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M", tz=day_plot["local_time"].dt.tz))
+    start_local = pd.Timestamp(tomorrow_local_date, tz=LOCAL_TZ)
+    ax.set_xlim(start_local, start_local + pd.Timedelta(days=1))
+
+    fig.autofmt_xdate(rotation=0)
+    sns.despine(ax=ax)
+    fig.tight_layout()
+    fig.savefig(file_path, dpi=150)
+
+
+def plot_feature_importance(importance: dict, file_path: Path, top_n: int = 12) -> None:
+    """
+    Horizontal bar chart of split-count feature importance
+    (booster.get_score(importance_type="weight")).
+    """
+    import pandas as pd
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    imp_df = pd.DataFrame(list(importance.items()), columns=["Feature", "Score"])
+    imp_df["Feature"] = (
+        imp_df["Feature"]
+        .str.replace("electricity_prices_", "")
+        .str.replace("weather_", "")
+    )
+    imp_df = imp_df.sort_values(by="Score", ascending=False).head(top_n)
+
+    fig = Figure(figsize=(14, 10))
+    ax = fig.subplots()
+    sns.barplot(x="Score", y="Feature", data=imp_df, palette="viridis", ax=ax)
+    ax.set_title("The current model values these features most", fontsize=18, pad=20)
+    ax.set_xlabel("Importance (weight)", fontsize=14)
+    ax.set_ylabel("", fontsize=14)
+    fig.tight_layout()
+    fig.savefig(file_path, dpi=150)
+
+
+def history_features(fs, prices_fg, price_area: str, days: int = 7):
+    """
+    Model inputs and actual prices for the last `days` complete local days.
+
+    Returns:
+        (features, actual_prices, last_complete_day); features has 'local_time'
+        and the model columns, actual_prices has 'local_time' and 'price_sek'
+    """
+    import pandas as pd
+
+    from src import util
+
+    # Local (Sweden) day boundaries: the plot ends at yesterday 24:00 local time
+    plot_end_local = pd.Timestamp.now(tz=LOCAL_TZ).floor("D")
+    plot_start = (plot_end_local - pd.Timedelta(days=days)).tz_convert("UTC")
+    plot_end = plot_end_local.tz_convert("UTC")
+    fetch_start = plot_start - pd.Timedelta(days=LAG_BUFFER_DAYS)
+    last_complete_day = (plot_end_local - pd.Timedelta(days=1)).date()
+
+    logger.info(f"Fetching price data from {fetch_start.date()}...")
+    hist_prices = prices_fg.filter(
+        (prices_fg.price_area == price_area.lower()) & (prices_fg.date >= fetch_start)
+    ).read(online=True)
+    hist_prices = conform(hist_prices, ELECTRICITY_PRICES, copy=False)
+    hist_prices = hist_prices.sort_values("unix_time").drop_duplicates(subset=["unix_time"])
+    hist_prices = hist_prices[["unix_time", "price_sek", "price_area", "date"]]
+
+    weather_fg = fs.get_feature_group(common.WEATHER_FG, version=common.FG_VERSION)
+    hist_weather = weather_fg.filter(weather_fg.date >= fetch_start).read(online=True)
+    hist_weather = conform(hist_weather, WEATHER_HOURLY, copy=False)
+    hist_weather = hist_weather.sort_values("unix_time").drop_duplicates(subset=["unix_time"])
+
+    full_df = hist_weather.merge(hist_prices.drop(columns=["date"]), on="unix_time", how="left")
+    full_df["date"] = pd.to_datetime(full_df["unix_time"], unit="ms", utc=True)
+    full_df["local_time"] = full_df["date"].dt.tz_convert(LOCAL_TZ)
+    full_df["hour"] = full_df["date"].dt.hour.astype("int8")
+
+    # Fill gaps from the same hour on earlier days before lagging
+    for _ in range(3):
+        full_df["price_sek"] = full_df["price_sek"].fillna(full_df["price_sek"].shift(24))
+
+    full_df["price_lag_24"] = full_df["price_sek"].shift(24)
+    full_df["price_lag_48"] = full_df["price_sek"].shift(48)
+    full_df["price_lag_72"] = full_df["price_sek"].shift(72)
+    full_df["price_roll3d"] = full_df["price_sek"].rolling(72, min_periods=1).mean()
+
+    full_df["weekday"] = full_df["date"].dt.weekday.astype("int8")
+    full_df["is_weekend"] = full_df["weekday"].isin([5, 6]).astype("int8")
+    full_df["month"] = full_df["date"].dt.month.astype("int8")
+    full_df["season"] = full_df["month"].map(util.SEASON_MAP).astype("int8")
+    full_df["is_holiday"] = 0
+    full_df["price_area"] = price_area.lower()
+    full_df = add_model_columns(full_df)
+
+    window = (full_df["date"] >= plot_start) & (full_df["date"] < plot_end)
+    features = full_df[window].copy()
+
+    actual = hist_prices[(hist_prices["date"] >= plot_start) & (hist_prices["date"] < plot_end)].copy()
+    actual["local_time"] = actual["date"].dt.tz_convert(LOCAL_TZ)
+
+    return features, actual, last_complete_day
+
+
+def archived_history(archive, price_area: str, days: int = 7):
+    """
+    The history window of history_features from the forecast archive, or
+    None unless every hour of it has an archived forecast and actual price.
+
+    Returns:
+        (features, actual_prices, last_complete_day) as from history_features,
+        with the issued forecasts in 'predicted_price'
+    """
+    import pandas as pd
+
+    plot_end_local = pd.Timestamp.now(tz=LOCAL_TZ).floor("D")
+    start_local = plot_end_local - pd.Timedelta(days=days)
+    expected_hours = int((plot_end_local - start_local) / pd.Timedelta(hours=1))
+
+    records = archive.history(price_area, days=days, end_day=plot_end_local.date())
+    if len(records) < expected_hours or records[["predicted_price_sek", "actual_price_sek"]].isna().any().any():
+        return None
+
+    features = records.rename(columns={"predicted_price_sek": "predicted_price"})
+    actual = records.rename(columns={"actual_price_sek": "price_sek"})[["local_time", "price_sek"]]
+    return features[["local_time", "predicted_price"]], actual, (plot_end_local - pd.Timedelta(days=1)).date()
+
+
+def plot_price_trend(plot_df, actual, price_area: str, last_complete_day, file_path: Path) -> None:
+    """Predicted vs actual prices over the history window."""
+    import matplotlib.dates as mdates
+    import matplotlib.ticker as mticker
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(16, 8))
+    ax = fig.subplots()
+
+    sns.lineplot(
+        x="local_time", y="predicted_price", data=plot_df,
+        label="Model prediction", color="#f97316", linewidth=2, linestyle="--", ax=ax
+    )
+    sns.lineplot(
+        x="local_time", y="price_sek", data=actual,
+        label="Actual price", color="#1e293b", linewidth=3, alpha=0.8, ax=ax
+    )
+
+    tzinfo = plot_df["local_time"].dt.tz
+    ax.xaxis.set_major_locator(mdates.DayLocator(interval=1))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %d", tz=tzinfo))
+    ax.xaxis.set_minor_locator(mdates.HourLocator(interval=6))
+    ax.xaxis.set_minor_formatter(mticker.NullFormatter())
+
+    ax.set_title(
+        f"Predicted vs actual electricity price: {price_area} (through {last_complete_day})",
+        fontsize=22,
+        pad=18,
+    )
+    ax.set_ylabel("Price (SEK/kWh)", fontsize=16)
+    ax.set_xlabel("Date (local time)", fontsize=16)
+    ax.tick_params(axis="both", labelsize=12)
+    ax.legend(loc="upper left", fontsize=13)
+    ax.grid(True, alpha=0.3)
+
+    fig.autofmt_xdate(rotation=0)
+    fig.tight_layout()
+    fig.savefig(file_path, dpi=150)
+
+
+# =============================================================================
+# Pipeline
+# =============================================================================
+
+def run(location: Optional[dict] = None, assets_root: Optional[Path] = None) -> dict:
+    """
+    Predict tomorrow's prices and refresh the dashboard assets.
+
+    Args:
+        location: Location config (default: the ELECTRICITY_LOCATION_JSON secret)
+        assets_root: Repo root whose docs/PricesDashboard/assets are written
+            (default: this checkout)
+
+    Returns:
+        The forecast summary written to forecast_summary.json
+    """
+    from src import inference, render
+    from src.forecast_archive import ForecastArchive
+
+    from .train import model_name
+
+    project = common.login()
+    fs = project.get_feature_store()
+    location = location or common.load_location()
+    price_area = location["price_area"]
+
+    booster, _ = inference.load_registry_booster(project, model_name(price_area))
+    predictor = inference.BatchPredictor(booster)
+    prices_fg, _ = common.get_feature_groups(fs)
+    img_dir, data_dir = common.dashboard_dirs(assets_root)
+
+    archive = ForecastArchive(data_dir / "archive")
+    hist_prices = recent_prices(prices_fg, price_area)
+    archive.add_actuals(price_area, hist_prices)
+
+    forecast_df = build_forecast_features(prices_fg, location, hist_prices)
+    archived = archived_history(archive, price_area)
+    if archived is not None:
+        history, actual, last_complete_day = archived
+        (forecast_df["predicted_price_sek"],) = predictor.predict_frames([forecast_df])
+    else:
+        # Archive does not cover the window yet: re-predict it, with tomorrow in the same batch
+        logger.info("Forecast archive does not cover the last 7 days, predicting them from the feature store")
+        history, actual, last_complete_day = history_features(fs, prices_fg, price_area)
+        forecast_df["predicted_price_sek"], history["predicted_price"] = predictor.predict_frames([forecast_df, history])
+
+    archive.add_forecast(price_area, forecast_df)
+
+    summary = forecast_summary(forecast_df, price_area)
+    summary_path = data_dir / "forecast_summary.json"
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    logger.info(f"Saving summary to: {summary_path}")
+
+    # Independent plots, rendered in parallel and skipped when their inputs are unchanged
+    render.render(
+        [
+            render.RenderJob(img_dir / "electricity_price_signal.png", plot_price_signal, (forecast_df,)),
+            render.RenderJob(
+                img_dir / "feature_importance.png",
+                plot_feature_importance,
+                (booster.get_score(importance_type="weight"),),
+            ),
+            # Predicted vs actual over the last 7 days, ending yesterday
+            render.RenderJob(
+                img_dir / "price_trend.png",
+                plot_price_trend,
+                (history, actual, price_area, last_complete_day),
+            ),
+        ],
+        style=render.dashboard_style(),
+    )
+
+    return summary
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = common.build_parser("infer", __doc__.strip().splitlines()[0])
+    parser.add_argument("--assets-root", type=Path, help="repo root to write dashboard assets under")
+    args = parser.parse_args(argv)
+
+    with common.cli_session(args):
+        run(assets_root=args.assets_root)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+"""
+Daily feature ingestion (replaces notebook 2).
+
+Fetches yesterday's prices and weather, builds the feature-group rows,
+checks them against the src.validation rules and inserts them into the
+electricity_prices and weather_hourly feature groups.
+
+The price lags come from a util.PriceLagState saved between runs
+(data/price_lag_state.npz, or ELPRICE_LAG_STATE), so a daily run fetches
+one day of prices. Without a state that ends right before the day (first
+run, a skipped day, a re-run) three days of history are fetched instead
+and the lags computed from them.
+
+    python -m src.pipelines ingest [--date YYYY-MM-DD] [--dry-run] [--lag-state PATH]
+"""
+
+import logging
+import os
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Optional
+
+from . import common
+
+
+logger = logging.getLogger(__name__)
+
+# Days of history fetched before the ingested day so price_lag_72 is complete
+LAG_HISTORY_DAYS = 3
+
+LAG_STATE_PATH = Path(os.getenv("ELPRICE_LAG_STATE", common.ROOT_DIR / "data" / "price_lag_state.npz"))
+
+# Delivery days of the price API are local days
+PRICE_TZ = "Europe/Stockholm"
+
+_HOUR_MS = 3_600_000
+
+
+def load_lag_state(path: Optional[Path]):
+    """PriceLagState saved at path (a new one if missing or unreadable, None if path is None)."""
+    from src import util
+
+    if path is None:
+        return None
+    if Path(path).exists():
+        try:
+            return util.PriceLagState.load(str(path))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable lag state {path}: {e}")
+    return util.PriceLagState()
+
+
+def save_lag_state(state, path: Path) -> None:
+    """Write the state atomically (np.savez needs the .npz suffix on the tmp file)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.tmp.npz")
+    state.save(str(tmp))
+    os.replace(tmp, path)
+
+
+def build_price_rows(day: date, price_area: str, lag_state=None):
+    """
+    electricity_prices rows for one day (complete rows only).
+
+    Args:
+        day: Day to build
+        price_area: Price area (SE1-SE4)
+        lag_state: Optional util.PriceLagState. If it ends at the hour before
+            the day, only the day is fetched and the state advanced; if it is
+            empty or behind, the history is fetched and the area's state
+            rebuilt from it; if it is already past the day it is left alone
+    """
+    import pandas as pd
+
+    from src import util
+
+    area_key = price_area.lower()
+    day_start = pd.Timestamp(day).tz_localize(PRICE_TZ).value // 10**6
+    last = lag_state.last_unix_time(area_key) if lag_state is not None else None
+
+    incremental = last is not None and last == day_start - _HOUR_MS
+    if lag_state is not None and not incremental:
+        if last is not None and last >= day_start:
+            lag_state = None
+        else:
+            lag_state.reset(area_key)
+
+    raw_prices = util.fetch_electricity_prices(
+        start_date=day if incremental else day - timedelta(days=LAG_HISTORY_DAYS),
+        end_date=day,
+        price_area=price_area,
+        show_progress=False,
+        request_pause=0,
+    )
+    logger.info(f"Prices: lags from {'saved state' if incremental else f'{LAG_HISTORY_DAYS} day(s) of history'}")
+
+    # price_feature_rows converts the fetched columns to the feature group dtypes
+    df = common.price_feature_rows(raw_prices, price_area, lag_state=lag_state)
+    return df.loc[df["date"].dt.date == day].dropna().reset_index(drop=True)
+
+
+def build_weather_rows(day: date, price_area: str, latitude: float, longitude: float, city: str):
+    """weather_hourly rows for one day."""
+    from src import util
+
+    weather = util.get_hourly_historical_weather(
+        latitude=latitude,
+        longitude=longitude,
+        start_date=day.isoformat(),
+        end_date=day.isoformat(),
+        city=city,
+    )
+    # Guard against API boundary effects (extra hours around the requested day)
+    weather = weather[weather["date"] == day]
+
+    df = common.weather_feature_rows(weather, price_area)
+    return df.dropna().reset_index(drop=True)
+
+
+def run(
+    day: Optional[date] = None,
+    price_area: str = common.DEFAULT_LOCATION["price_area"],
+    city: str = common.DEFAULT_LOCATION["city"],
+    latitude: float = common.DEFAULT_LOCATION["latitude"],
+    longitude: float = common.DEFAULT_LOCATION["longitude"],
+    dry_run: bool = False,
+    lag_state_path: Optional[Path] = LAG_STATE_PATH,
+) -> dict[str, int]:
+    """
+    Ingest one day of price and weather features.
+
+    Args:
+        day: Day to ingest (default: yesterday)
+        price_area: Price area (SE1-SE4)
+        city: City name for logging
+        latitude: Weather location latitude
+        longitude: Weather location longitude
+        dry_run: Build the rows but skip the Hopsworks login and inserts
+            (the lag state is not saved either)
+        lag_state_path: Saved PriceLagState (None = always fetch history)
+
+    Returns:
+        Number of rows per feature group
+    """
+    day = day or date.today() - timedelta(days=1)
+
+    lag_state = load_lag_state(lag_state_path)
+    df_prices = build_price_rows(day, price_area, lag_state)
+    df_weather = build_weather_rows(day, price_area, latitude, longitude, city)
+    counts = {common.PRICES_FG: len(df_prices), common.WEATHER_FG: len(df_weather)}
+
+    if dry_run:
+        logger.info(f"Dry run: built {counts} for {day}, nothing inserted")
+        return counts
+
+    project = common.login()
+    prices_fg, weather_fg = common.get_feature_groups(project.get_feature_store())
+
+    logger.info(f"Prices: inserting {len(df_prices)} row(s) for {day}")
+    common.insert_rows(prices_fg, df_prices, common.PRICES_FG, storage="both", wait=True)
+
+    if len(df_weather):
+        logger.info(f"Weather: inserting {len(df_weather)} row(s) for {day}")
+        common.insert_rows(weather_fg, df_weather, common.WEATHER_FG, storage="both", wait=True)
+    else:
+        logger.warning("Weather: no rows fetched.")
+
+    if lag_state is not None:
+        save_lag_state(lag_state, lag_state_path)
+
+    return counts
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = common.build_parser("ingest", __doc__.strip().splitlines()[0])
+    parser.add_argument("--date", type=common.parse_date, help="day to ingest (default: yesterday)")
+    parser.add_argument("--price-area", default=common.DEFAULT_LOCATION["price_area"])
+    parser.add_argument("--city", default=common.DEFAULT_LOCATION["city"])
+    parser.add_argument("--latitude", type=float, default=common.DEFAULT_LOCATION["latitude"])
+    parser.add_argument("--longitude", type=float, default=common.DEFAULT_LOCATION["longitude"])
+    parser.add_argument("--dry-run", action="store_true", help="build rows without writing to Hopsworks")
+    parser.add_argument("--lag-state", type=Path, default=LAG_STATE_PATH, help="saved price lag state")
+    parser.add_argument("--no-lag-state", action="store_true", help="compute lags from fetched history only")
+    args = parser.parse_args(argv)
+
+    with common.cli_session(args):
+        run(
+            day=args.date,
+            price_area=args.price_area,
+            city=args.city,
+            latitude=args.latitude,
+            longitude=args.longitude,
+            dry_run=args.dry_run,
+            lag_state_path=None if args.no_lag_state else args.lag_state,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,349 @@
+"""
+Model training (replaces notebook 3).
+
+Builds the weather + price feature view, syncs its new rows into the local
+memory-mapped feature matrix (src/matrix_store.py), tunes an XGBoost
+regressor on the mapped rows with a small randomized search (parallel,
+successive halving, early stopping) on a temporal validation split,
+evaluates it on the last 20% of the data and registers it in the Hopsworks
+model registry together with hindcast/feature-importance plots.
+
+    python -m src.pipelines train [--n-iter 20] [--n-jobs N] [--model-dir DIR] [--matrix-store DIR]
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+from . import common
+
+
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = common.ROOT_DIR / "NotebooksElectricity" / "electricity_prices_model"
+FEATURE_VIEW_VERSION = 2
+
+WEATHER_FEATURES = [
+    "price_area",
+    "unix_time",
+    "date",
+    "hour",
+    "temperature_2m", "apparent_temperature",
+    "precipitation", "rain", "snowfall",
+    "cloud_cover",
+    "wind_speed_10m", "wind_speed_100m",
+    "wind_direction_10m", "wind_direction_100m",
+    "wind_gusts_10m",
+    "surface_pressure",
+]
+
+PRICE_FEATURES = [
+    "price_area",
+    "unix_time",
+    "price_sek",
+    "weekday",
+    "is_weekend",
+    "month",
+    "season",
+    "is_holiday",
+    "price_lag_24",
+    "price_lag_48",
+    "price_lag_72",
+    "price_roll3d",
+]
+
+BASE_PARAMS = dict(
+    objective="reg:squarederror",
+    tree_method="hist",
+    n_estimators=5000,          # early stopping decides how many trees we need
+    learning_rate=0.03,
+    n_jobs=-1,
+    random_state=42,
+)
+
+PARAM_DISTRIBUTIONS = {
+    "max_depth": [3, 4, 5, 6, 8],
+    "min_child_weight": [1, 3, 5, 10],
+    "subsample": [0.6, 0.8, 1.0],
+    "colsample_bytree": [0.6, 0.8, 1.0],
+    "reg_lambda": [0.5, 1.0, 2.0, 5.0],
+    "reg_alpha": [0.0, 0.1, 0.5, 1.0],
+    "gamma": [0.0, 0.1, 0.5, 1.0],
+}
+
+
+def model_name(price_area: str) -> str:
+    return f"electricity_prices_xgboost_model_lags_{price_area.lower()}"
+
+
+def feature_columns(columns) -> list[str]:
+    """Model inputs among the feature view columns (keys and the raw timestamp dropped)."""
+    return [c for c in columns if c not in ("date", "unix_time") and "price_area" not in c]
+
+
+def get_feature_view(fs, price_area: str):
+    """Feature view joining weather and price features on (price_area, unix_time)."""
+    prices_fg, weather_fg = common.get_feature_groups(fs)
+
+    price_feats = prices_fg.select(PRICE_FEATURES).filter(prices_fg["price_area"] == price_area.lower())
+    weather_feats = weather_fg.select(WEATHER_FEATURES).filter(weather_fg["price_area"] == price_area.lower())
+    features = weather_feats.join(price_feats, on=["price_area", "unix_time"])
+
+    return fs.get_or_create_feature_view(
+        name=f"electricity_prices_fv_{price_area.lower()}",
+        description=f"weather + electricity prices features for {price_area} (with calendar, holiday, lags)",
+        version=FEATURE_VIEW_VERSION,
+        labels=["price_sek"],
+        query=features,
+    )
+
+
+def sync_feature_matrix(feature_view, price_area: str, store=None):
+    """
+    Append feature view rows newer than the last stored hour to the local
+    feature matrix (src/matrix_store.py) and map it.
+
+    Args:
+        feature_view: Feature view from get_feature_view
+        price_area: Area partition of the store
+        store: FeatureMatrixStore (default: data/features)
+
+    Returns:
+        FeatureMatrix of the area
+    """
+    import pandas as pd
+
+    from src.matrix_store import FeatureMatrixStore
+
+    store = store or FeatureMatrixStore()
+    last = store.last_unix_time(price_area)
+    start_time = pd.Timestamp(last + 1, unit="ms", tz="UTC") if last is not None else None
+
+    X, y = feature_view.training_data(start_time=start_time, description="feature matrix sync")
+    if len(X):
+        df = X.copy()
+        df["price_sek"] = y.iloc[:, 0].to_numpy()
+        written = store.write(price_area, df, columns=feature_columns(X.columns))
+        logger.info(f"Feature matrix {price_area}: {written} new row(s)")
+    return store.open(price_area)
+
+
+def tune(
+    X_train,
+    y_train,
+    n_iter: int = 20,
+    val_frac: float = 0.10,
+    early_stopping_rounds: int = 50,
+    n_jobs: Optional[int] = None,
+) -> dict:
+    """
+    Randomized search over PARAM_DISTRIBUTIONS on a temporal validation split.
+
+    Candidates are evaluated in parallel worker processes on shared quantized
+    matrices, with successive halving of the boosting-round budget (see
+    src/tuning.py).
+
+    Args:
+        X_train: Training features (DataFrame or array), sorted by time
+        y_train: Training target, same order
+        n_iter: Number of sampled parameter sets
+        val_frac: Fraction of the (latest) rows used for validation
+        early_stopping_rounds: Early stopping patience on the validation RMSE
+        n_jobs: Cores to use (default: all)
+
+    Returns:
+        {"rmse", "params", "best_n_estimators", "trials"} of the best parameter set
+    """
+    from sklearn.model_selection import ParameterSampler
+
+    from src import tuning
+
+    split_idx = int(len(X_train) * (1 - val_frac))
+    X_tr, X_val = X_train[:split_idx], X_train[split_idx:]
+    y_tr, y_val = y_train[:split_idx], y_train[split_idx:]
+
+    best = tuning.search(
+        X_tr,
+        y_tr,
+        X_val,
+        y_val,
+        ParameterSampler(PARAM_DISTRIBUTIONS, n_iter=n_iter, random_state=42),
+        BASE_PARAMS,
+        early_stopping_rounds=early_stopping_rounds,
+        n_jobs=n_jobs,
+    )
+
+    logger.info(f"Best validation RMSE: {best['rmse']}")
+    logger.info(f"Best params: {best['params']}")
+    logger.info(f"Best n_estimators: {best['best_n_estimators']}")
+    return best
+
+
+def evaluate(y_true, y_pred) -> dict[str, float]:
+    """MSE/RMSE/MAE/R squared as stored in the model registry."""
+    import numpy as np
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    mse = mean_squared_error(y_true, y_pred)
+    return {
+        "MSE": float(mse),
+        "RMSE": float(np.sqrt(mse)),
+        "MAE": float(mean_absolute_error(y_true, y_pred)),
+        "R squared": float(r2_score(y_true, y_pred)),
+    }
+
+
+def plot_importance(importance: dict, file_path: str) -> None:
+    """Feature importance bar chart (booster.get_score(importance_type="weight"))."""
+    from matplotlib.figure import Figure
+    from xgboost import plot_importance as xgb_plot_importance
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
+    xgb_plot_importance(importance, ax=ax)
+    ax.set_title("Feature importance", fontsize=14)
+    fig.tight_layout()
+    fig.savefig(file_path)
+
+
+def save_artifacts(model, hindcast_df, price_area: str, model_dir: Path) -> None:
+    """Write model.json and the hindcast/feature-importance plots to model_dir."""
+    from src import render, util
+
+    images_dir = model_dir / "images"
+    images_dir.mkdir(parents=True, exist_ok=True)
+
+    render.render([
+        render.RenderJob(
+            images_dir / "electricity_price_hindcast.png",
+            util.plot_electricity_price_forecast,
+            (price_area, hindcast_df),
+            {"hindcast": True, "window_days": 21},
+        ),
+        render.RenderJob(
+            images_dir / "feature_importance.png",
+            plot_importance,
+            (model.get_booster().get_score(importance_type="weight"),),
+        ),
+    ])
+
+    model.save_model(str(model_dir / "model.json"))
+
+
+def run(
+    location: Optional[dict] = None,
+    n_iter: int = 20,
+    model_dir: Path = MODEL_DIR,
+    register: bool = True,
+    n_jobs: Optional[int] = None,
+    matrix_store: Optional[Path] = None,
+) -> dict[str, float]:
+    """
+    Train, evaluate and register the model for the configured price area.
+
+    Args:
+        location: Location config (default: the ELECTRICITY_LOCATION_JSON secret)
+        n_iter: Parameter sets tried in the randomized search
+        model_dir: Directory for model.json and plots
+        register: Save the model to the Hopsworks model registry
+        n_jobs: Cores for the parameter search (default: all)
+        matrix_store: Feature matrix directory (default: data/features, or
+            ELPRICE_MATRIX_DIR if set)
+
+    Returns:
+        Test-set metrics
+    """
+    import numpy as np
+    import pandas as pd
+    from xgboost import XGBRegressor
+
+    from src.matrix_store import FeatureMatrixStore
+
+    project = common.login()
+    fs = project.get_feature_store()
+    location = location or common.load_location()
+    price_area = location["price_area"]
+
+    feature_view = get_feature_view(fs, price_area)
+    matrix = sync_feature_matrix(feature_view, price_area, FeatureMatrixStore(matrix_store))
+
+    # Rows without an actual price (not labelled yet) cannot be trained or scored on
+    matrix_y = np.asarray(matrix.y)
+    if np.isnan(matrix_y).any():
+        keep = ~np.isnan(matrix_y)
+        X_all, y_all, times = matrix.X[keep], matrix_y[keep], matrix.unix_time[keep]
+    else:
+        X_all, y_all, times = matrix.X, matrix_y, matrix.unix_time
+    t_min, t_max = int(times[0]), int(times[-1])
+    logger.info(
+        f"Feature matrix range: {pd.Timestamp(t_min, unit='ms').date()} → {pd.Timestamp(t_max, unit='ms').date()} "
+        f"({len(times)} rows)"
+    )
+
+    # First 80% of the time range is train (rows are sorted by unix_time)
+    test_start = t_min + (t_max - t_min) * 0.8
+    split = int(np.searchsorted(times, test_start, "left"))
+    X_train, X_test = X_all[:split], X_all[split:]
+    y_train, y_test = y_all[:split], y_all[split:]
+    logger.info(f"Using {len(matrix.columns)} features: {matrix.columns}")
+
+    best = tune(X_train, y_train, n_iter=n_iter, n_jobs=n_jobs)
+
+    # Final model on all training data with the tuned params + chosen number of trees
+    final_params = {**BASE_PARAMS, **best["params"], "n_estimators": best["best_n_estimators"]}
+    model = XGBRegressor(**final_params)
+    model.fit(X_train, y_train, verbose=False)
+    # The matrix is unnamed; serving and inference look columns up by name
+    model.get_booster().feature_names = list(matrix.columns)
+
+    y_pred = model.predict(X_test)
+    metrics = evaluate(y_test, y_pred)
+    for name, value in metrics.items():
+        logger.info(f"{name}: {value}")
+
+    hindcast = pd.DataFrame({
+        "price_sek": y_test,
+        "predicted_price_sek": y_pred,
+        "date": pd.to_datetime(times[split:], unit="ms", utc=True),
+    })
+
+    model_dir = Path(model_dir)
+    save_artifacts(model, hindcast, price_area, model_dir)
+
+    if register:
+        mr = project.get_model_registry()
+        ep_model = mr.python.create_model(
+            name=model_name(price_area),
+            metrics=metrics,
+            feature_view=feature_view,
+            description=f"Electricity price predictor with lag features for {price_area}",
+        )
+        ep_model.save(str(model_dir))
+        logger.info(f"Registered {model_name(price_area)} v{ep_model.version}")
+
+    return metrics
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = common.build_parser("train", __doc__.strip().splitlines()[0])
+    parser.add_argument("--n-iter", type=int, default=20, help="parameter sets in the randomized search")
+    parser.add_argument("--n-jobs", type=int, help="cores for the parameter search (default: all)")
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument("--no-register", action="store_true", help="skip the model registry upload")
+    parser.add_argument("--matrix-store", type=Path,
+                        help="feature matrix directory (default: data/features or ELPRICE_MATRIX_DIR)")
+    args = parser.parse_args(argv)
+
+    with common.cli_session(args):
+        run(
+            n_iter=args.n_iter,
+            model_dir=args.model_dir,
+            register=not args.no_register,
+            n_jobs=args.n_jobs,
+            matrix_store=args.matrix_store,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
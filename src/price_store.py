@@ -0,0 +1,147 @@
+"""
+Local on-disk store for hourly electricity prices.
+
+Prices are kept as Parquet files partitioned by price area and month of the
+delivery day (Europe/Stockholm), e.g.:
+
+    data/elprices/price_area=SE3/2024-01.parquet
+
+Only days with a complete set of hourly prices are written, so days that were
+missing or returned an unexpected number of records are fetched again on the
+next run.
+"""
+
+import os
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+
+PRICE_STORE_DIR = Path(
+    os.getenv(
+        "ELPRICE_STORE_DIR",
+        Path(__file__).resolve().parent.parent / "data" / "elprices",
+    )
+)
+
+LOCAL_TZ = "Europe/Stockholm"
+
+
+def _as_fetched(df: pd.DataFrame) -> pd.DataFrame:
+    """Stored rows in the dtypes of util.fetch_electricity_prices (time units included)."""
+    from .util.schema import conform, fetched_prices_schema
+
+    return conform(df, fetched_prices_schema())
+
+
+def _delivery_days(timestamps: pd.Series) -> pd.Series:
+    """Local (Europe/Stockholm) delivery day for each UTC timestamp."""
+    return timestamps.dt.tz_convert(LOCAL_TZ).dt.date
+
+
+def _hours_in_day(days: pd.Index) -> pd.Series:
+    """Number of hours in each local day (23/25 on DST switch days)."""
+    start = pd.DatetimeIndex(days).tz_localize(LOCAL_TZ)
+    end = (pd.DatetimeIndex(days) + pd.Timedelta(days=1)).tz_localize(LOCAL_TZ)
+    return pd.Series(((end - start) / pd.Timedelta(hours=1)).astype(int), index=days)
+
+
+class PriceStore:
+    """
+    Parquet price store partitioned by price area and month.
+
+    Args:
+        root: Directory of the store (default: data/elprices in the repo, or
+            ELPRICE_STORE_DIR if set)
+    """
+
+    def __init__(self, root: Optional[Path | str] = None):
+        self.root = Path(root) if root is not None else PRICE_STORE_DIR
+
+    def _area_dir(self, price_area: str) -> Path:
+        return self.root / f"price_area={price_area}"
+
+    def _partition_path(self, price_area: str, month: str) -> Path:
+        return self._area_dir(price_area) / f"{month}.parquet"
+
+    def _partitions(self, price_area: str, start_date: date, end_date: date) -> list[Path]:
+        months = pd.period_range(start_date, end_date, freq="M").strftime("%Y-%m")
+        paths = [self._partition_path(price_area, m) for m in months]
+        return [p for p in paths if p.exists()]
+
+    def complete_days(self, price_area: str, start_date: date, end_date: date) -> set[date]:
+        """
+        Days in [start_date, end_date] that the store holds completely.
+
+        Only the small delivery_day column is read from each partition.
+        """
+        days: set[date] = set()
+        for path in self._partitions(price_area, start_date, end_date):
+            part = pd.read_parquet(path, columns=["delivery_day"])
+            days.update(d for d in part["delivery_day"].unique() if start_date <= d <= end_date)
+        return days
+
+    def read(self, price_area: str, start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        Read stored prices for days in [start_date, end_date].
+
+        Returns:
+            DataFrame in the hourly price schema, sorted by timestamp
+            (empty if nothing is stored)
+        """
+        parts = [pd.read_parquet(p) for p in self._partitions(price_area, start_date, end_date)]
+        if not parts:
+            return pd.DataFrame()
+
+        df = pd.concat(parts, ignore_index=True)
+        mask = (df["delivery_day"] >= start_date) & (df["delivery_day"] <= end_date)
+        df = df.loc[mask].drop(columns=["delivery_day"])
+        df = _as_fetched(df)
+        return df.sort_values("timestamp").reset_index(drop=True)
+
+    def write(self, price_area: str, df: pd.DataFrame) -> int:
+        """
+        Merge fetched prices into the store.
+
+        Days without a full set of hourly rows are skipped. Stored rows for the
+        written days are replaced.
+
+        Args:
+            price_area: Price area partition to write to
+            df: Hourly prices as returned by fetch_electricity_prices
+
+        Returns:
+            Number of complete days written
+        """
+        if df.empty:
+            return 0
+
+        df = df.copy()
+        df["delivery_day"] = _delivery_days(df["timestamp"])
+
+        counts = df.groupby("delivery_day").size()
+        expected = _hours_in_day(counts.index)
+        complete = counts.index[counts.values == expected.values]
+        df = df[df["delivery_day"].isin(complete)]
+        if df.empty:
+            return 0
+
+        month = pd.to_datetime(df["delivery_day"]).dt.strftime("%Y-%m")
+        for m, new_rows in df.groupby(month):
+            path = self._partition_path(price_area, m)
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            if path.exists():
+                old_rows = pd.read_parquet(path)
+                old_rows = old_rows[~old_rows["delivery_day"].isin(new_rows["delivery_day"].unique())]
+                # Files written under another pandas may hold other time units
+                new_rows = pd.concat([_as_fetched(old_rows), _as_fetched(new_rows)], ignore_index=True)
+
+            new_rows = new_rows.sort_values("timestamp").reset_index(drop=True)
+            tmp_path = path.with_suffix(".parquet.tmp")
+            new_rows.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+
+        return len(complete)
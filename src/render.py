@@ -0,0 +1,221 @@
+"""
+Dashboard image rendering.
+
+Every plot is a RenderJob: a module-level plot function, its input data and
+the PNG it writes. render() hashes the inputs of each job (data, arguments,
+the plot function's code and the style) and skips the job when the PNG
+exists and was rendered from the same hash; the hashes are kept next to the
+images in .render_hashes.json. The remaining jobs are drawn in a pool of
+spawned worker processes on the Agg backend, or in this process (keeping its
+matplotlib backend) when there are only a few jobs or one core. A job that
+fails makes render() raise once all jobs have run.
+
+Plot functions draw on matplotlib.figure.Figure objects that are never
+registered with pyplot, so nothing accumulates in the pyplot figure list;
+figures a function does open through pyplot (src.util.plotting) are closed
+after the job, also when it fails.
+
+    jobs = [
+        RenderJob(img_dir / "price_trend.png", plot_price_trend, (history, actual, "SE3", day)),
+        RenderJob(img_dir / "feature_importance.png", plot_feature_importance, (importance,)),
+    ]
+    render(jobs, style=dashboard_style())   # {"price_trend.png": "rendered", ...}
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+
+logger = logging.getLogger(__name__)
+
+HASH_FILE = ".render_hashes.json"
+
+# A spawned worker takes ~2 s to import pandas/matplotlib/seaborn and a plot
+# ~0.8 s to draw, so each worker needs a few images to pay for itself
+MIN_JOBS_PER_WORKER = 4
+
+# Bump to re-render every image after a change outside the plot functions
+RENDER_VERSION = 1
+
+# rcParams on top of seaborn's "whitegrid" axes style (see dashboard_style)
+DASHBOARD_RC = {"font.size": 12}
+
+
+class RenderJob(NamedTuple):
+    """
+    One image: func(*args, file_path=str(path), **kwargs).
+
+    func must be importable by name (a module-level function) so that worker
+    processes can run it.
+    """
+    path: Path
+    func: Callable
+    args: tuple = ()
+    kwargs: dict = {}
+
+
+def dashboard_style() -> dict:
+    """rcParams of the dashboard plots (seaborn whitegrid + DASHBOARD_RC)."""
+    import seaborn as sns
+
+    return {**sns.axes_style("whitegrid"), **DASHBOARD_RC}
+
+
+# =============================================================================
+# Input hashes
+# =============================================================================
+
+def _update_hash(h, value: Any) -> None:
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(value, pd.DataFrame):
+        h.update(repr((list(value.columns), value.dtypes.tolist(), value.shape)).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(repr((value.name, value.dtype, value.shape)).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(repr((value.dtype, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        h.update(b"{")
+        for key in sorted(value, key=repr):
+            h.update(repr(key).encode())
+            _update_hash(h, value[key])
+        h.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        h.update(b"[")
+        for item in value:
+            _update_hash(h, item)
+        h.update(b"]")
+    else:
+        h.update(repr(value).encode())
+
+
+def input_hash(job: RenderJob, style: Optional[dict] = None) -> str:
+    """Hash of everything a job's image depends on."""
+    h = hashlib.blake2b(digest_size=16)
+    code = job.func.__code__
+    h.update(f"{RENDER_VERSION}:{job.func.__module__}.{job.func.__qualname__}".encode())
+    h.update(code.co_code)
+    h.update(repr(code.co_consts).encode())
+    _update_hash(h, job.args)
+    _update_hash(h, job.kwargs)
+    _update_hash(h, style or {})
+    return h.hexdigest()
+
+
+def _load_hashes(directory: Path) -> dict:
+    path = directory / HASH_FILE
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_hashes(directory: Path, hashes: dict) -> None:
+    tmp = directory / f"{HASH_FILE}.tmp"
+    tmp.write_text(json.dumps(hashes, indent=2, sort_keys=True))
+    os.replace(tmp, directory / HASH_FILE)
+
+
+# =============================================================================
+# Workers
+# =============================================================================
+
+def _init_worker() -> None:
+    """Fix the Agg backend before pyplot is imported."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render_job(job: RenderJob, style: Optional[dict]) -> Optional[str]:
+    """Draw one job; returns the error message if it failed."""
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    open_before = set(plt.get_fignums())
+    try:
+        with matplotlib.rc_context(style or {}):
+            job.func(*job.args, file_path=str(job.path), **job.kwargs)
+        return None
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+    finally:
+        for num in set(plt.get_fignums()) - open_before:
+            plt.close(num)
+
+
+# =============================================================================
+# Render
+# =============================================================================
+
+def render(
+    jobs: list[RenderJob],
+    style: Optional[dict] = None,
+    n_jobs: Optional[int] = None,
+    force: bool = False,
+) -> dict[str, str]:
+    """
+    Render the jobs whose inputs changed since their image was last written.
+
+    Args:
+        jobs: Images to render (paths must be unique)
+        style: rcParams applied to every job (e.g. dashboard_style())
+        n_jobs: Worker processes (default: one per core, at most one per
+            MIN_JOBS_PER_WORKER jobs)
+        force: Render every job regardless of the stored hashes
+
+    Returns:
+        {file name: "rendered" | "skipped"}
+
+    Raises:
+        RuntimeError: If any job failed (after the other jobs were rendered
+            and the hashes saved, so a re-run only redraws the failed ones)
+    """
+    hashes = {job.path: input_hash(job, style) for job in jobs}
+    stored = {d: _load_hashes(d) for d in {Path(job.path).parent for job in jobs}}
+
+    status = {Path(job.path).name: "skipped" for job in jobs}
+    todo = [
+        job for job in jobs
+        if force
+        or not Path(job.path).exists()
+        or stored[Path(job.path).parent].get(Path(job.path).name) != hashes[job.path]
+    ]
+
+    cores = n_jobs if n_jobs and n_jobs > 0 else (os.cpu_count() or 1)
+    workers = min(cores, len(todo) // MIN_JOBS_PER_WORKER)
+    if workers > 1:
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn"), initializer=_init_worker) as pool:
+            errors = list(pool.map(_render_job, todo, [style] * len(todo)))
+    else:
+        errors = [_render_job(job, style) for job in todo]
+
+    for job, error in zip(todo, errors):
+        path = Path(job.path)
+        if error is None:
+            status[path.name] = "rendered"
+            stored[path.parent][path.name] = hashes[job.path]
+            logger.info(f"Graph saved to: {path}")
+        else:
+            status[path.name] = "failed"
+            stored[path.parent].pop(path.name, None)
+            logger.warning(f"Rendering {path.name} failed: {error}")
+
+    for directory, directory_hashes in stored.items():
+        directory.mkdir(parents=True, exist_ok=True)
+        _save_hashes(directory, directory_hashes)
+
+    logger.info(f"Rendered {len(todo)} image(s) with {max(workers, 1)} process(es), {len(jobs) - len(todo)} unchanged")
+    failed = sorted(name for name, result in status.items() if result == "failed")
+    if failed:
+        raise RuntimeError(f"Rendering failed for {len(failed)} image(s): {', '.join(failed)}")
+    return status
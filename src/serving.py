@@ -0,0 +1,556 @@
+"""
+Local HTTP service for next-day price forecasts.
+
+Keeps the booster of each price area (see src/inference.py) and its latest
+forecast features in memory and answers:
+
+    GET /health                    model, areas and feature refresh times
+    GET /forecast/<area>           next-day hourly prices, cheapest/most expensive
+                                   hours and cheapest 4-hour window
+    GET /forecast/<area>/<hour>    predicted price for one local hour (0-23)
+    GET /metrics                   src.metrics registry, Prometheus text format
+
+Features are reloaded in the background every refresh_seconds and each
+area's day is predicted once per reload; responses are kept encoded, so a
+poll is a dictionary lookup. Predictions go through a micro-batcher: one
+worker thread collects the feature rows of all pending requests for up to
+max_wait_ms and predicts them with a single BatchPredictor.predict_matrix
+call, so a reload of every area that shares a model (or a burst of requests
+right after one) costs one booster call.
+
+    python -m src.serving --features-dir data/serving        # <AREA>.parquet per area, one model
+    python -m src.serving --hopsworks --areas SE3 SE4        # features + best model of each area from Hopsworks
+"""
+
+import argparse
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from . import metrics
+from .inference import BatchPredictor, feature_matrix
+
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TZ = "Europe/Stockholm"
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MODEL_PATH = Path(__file__).resolve().parent.parent / "NotebooksElectricity" / "electricity_prices_model" / "model.json"
+
+# Micro-batching: wait at most this long for more requests, up to this many rows
+MAX_WAIT_MS = 1.0
+MAX_BATCH_ROWS = 8192
+
+REFRESH_SECONDS = 3600
+
+# Hours in the "cheapest window" of the summary (same as forecast_summary.json)
+BEST_WINDOW_HOURS = 4
+
+FeatureSource = Callable[[str], pd.DataFrame]
+
+
+# =============================================================================
+# Micro-batching
+# =============================================================================
+
+class MicroBatcher:
+    """
+    Coalesce concurrent prediction requests into single predict calls.
+
+    Args:
+        predictor: Predictor whose predict_matrix is called with the stacked rows
+        max_wait_ms: How long the first request of a batch waits for others
+        max_batch_rows: Row limit of one batch
+    """
+
+    def __init__(self, predictor: BatchPredictor, max_wait_ms: float = MAX_WAIT_MS, max_batch_rows: int = MAX_BATCH_ROWS):
+        self.predictor = predictor
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_rows = max_batch_rows
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="microbatch", daemon=True)
+        self._worker.start()
+
+    def submit(self, X: np.ndarray) -> Future:
+        """Queue a float32 feature matrix; the future resolves to its predictions."""
+        future: Future = Future()
+        self._queue.put((X, future))
+        return future
+
+    def predict(self, X: np.ndarray, timeout: Optional[float] = 5.0) -> np.ndarray:
+        return self.submit(X).result(timeout)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker.join()
+
+    def _collect(self, first) -> list:
+        batch, rows = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while rows < self.max_batch_rows:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            try:
+                X = batch[0][0] if len(batch) == 1 else np.concatenate([x for x, _ in batch])
+                out = self.predictor.predict_matrix(X)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for x, future in batch:
+                future.set_result(out[offset:offset + len(x)])
+                offset += len(x)
+
+
+# =============================================================================
+# Forecast state
+# =============================================================================
+
+class _AreaForecast:
+    """
+    One area's forecast day: model inputs prepared for fast lookups, plus the
+    predictions and encoded responses once they have been computed.
+    """
+
+    def __init__(self, area: str, features: pd.DataFrame, feature_names: Sequence[str], batcher: MicroBatcher):
+        features = features.sort_values("date")
+        local = pd.to_datetime(features["date"], utc=True).dt.tz_convert(LOCAL_TZ)
+
+        # Keep the local day most rows fall on (the day being forecast)
+        self.date_local = local.dt.date.mode().iloc[0] if len(local) else None
+        keep = (local.dt.date == self.date_local).to_numpy()
+
+        self.area = area
+        self.batcher = batcher
+        self.X = feature_matrix(features.loc[keep], feature_names)
+        self.hours_local = local[keep].dt.hour.to_numpy()
+        self.times_utc = [t.isoformat() for t in local[keep].dt.tz_convert("UTC")]
+        self.refreshed_at = datetime.now(timezone.utc).isoformat()
+
+        self.prices: Optional[np.ndarray] = None
+        self.summary: bytes = b""
+        self.hours: dict[int, bytes] = {}
+        self._pending: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    def ensure_predicted(self, timeout: Optional[float] = 5.0) -> None:
+        """Predict the day once; concurrent callers wait for the same batch."""
+        if self.prices is not None:
+            return
+        with self._lock:
+            if self.prices is None and self._pending is None:
+                self._pending = self.batcher.submit(self.X)
+            pending = self._pending
+        if pending is None:
+            return
+
+        try:
+            prices = pending.result(timeout)
+        except BaseException:
+            # Drop a failed or timed-out batch, so the next call resubmits
+            with self._lock:
+                if self._pending is pending:
+                    self._pending = None
+            raise
+        with self._lock:
+            if self.prices is None:
+                self._encode(prices)
+                self.prices = prices
+            self._pending = None
+
+    def _encode(self, prices: np.ndarray) -> None:
+        self.summary = json.dumps(summarize(self.area, self, prices)).encode()
+        self.hours = {}
+        for i, (h, t, p) in enumerate(zip(self.hours_local, self.times_utc, prices)):
+            # The repeated hour of the autumn DST switch keeps its first slot
+            self.hours.setdefault(int(h), json.dumps({
+                "region": self.area,
+                "date_local": str(self.date_local),
+                "hour_local": int(h),
+                "time_utc": t,
+                "price": float(p),
+            }).encode())
+
+
+def _hour_prices(hours: np.ndarray, prices: np.ndarray, idx) -> list[dict]:
+    return [{"hour_local": int(hours[i]), "price": float(prices[i])} for i in idx]
+
+
+def summarize(area: str, state: _AreaForecast, prices: np.ndarray, window: int = BEST_WINDOW_HOURS) -> dict:
+    """Forecast response in the layout of forecast_summary.json."""
+    order = np.argsort(prices, kind="stable")
+
+    best_window = None
+    if len(prices) >= window:
+        means = np.convolve(prices.astype(float), np.ones(window) / window, mode="valid")
+        start = int(np.argmin(means))
+        best_window = {
+            "start_hour": int(state.hours_local[start]),
+            "end_hour": int(state.hours_local[start + window - 1]),
+            "avg_price": float(means[start]),
+        }
+
+    return {
+        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "features_refreshed_at_utc": state.refreshed_at,
+        "timezone": LOCAL_TZ,
+        "region": area,
+        "date_local": str(state.date_local) if state.date_local else None,
+        "predicted_prices": [
+            {"time_utc": t, "hour_local": int(h), "price": float(p)}
+            for t, h, p in zip(state.times_utc, state.hours_local, prices)
+        ],
+        "cheapest_hours": _hour_prices(state.hours_local, prices, order[:3]),
+        "most_expensive_hours": _hour_prices(state.hours_local, prices, order[::-1][:3]),
+        "best_window_hours": best_window,
+    }
+
+
+class ForecastService:
+    """
+    In-memory forecasts for a set of price areas.
+
+    Each area's forecast day is predicted once per feature refresh, through
+    the micro-batcher of its model, so the first requests after a refresh
+    share one booster call per model; later requests are served from the
+    encoded responses.
+
+    Args:
+        predictor: Predictor for every area, or area -> predictor (models
+            are trained per price area; each area needs an entry)
+        feature_source: Callable returning the forecast-day feature rows
+            (model columns + 'date') of an area
+        areas: Price areas to serve
+        refresh_seconds: Interval of the background feature reload (0 = never)
+        max_wait_ms: Micro-batching window
+    """
+
+    def __init__(
+        self,
+        predictor: Union[BatchPredictor, Mapping[str, BatchPredictor]],
+        feature_source: FeatureSource,
+        areas: Sequence[str],
+        refresh_seconds: float = REFRESH_SECONDS,
+        max_wait_ms: float = MAX_WAIT_MS,
+    ):
+        self.feature_source = feature_source
+        self.areas = [a.upper() for a in areas]
+        if isinstance(predictor, BatchPredictor):
+            self.predictors = {area: predictor for area in self.areas}
+        else:
+            by_area = {a.upper(): p for a, p in predictor.items()}
+            missing = [a for a in self.areas if a not in by_area]
+            if missing:
+                raise ValueError(f"No model for price area(s) {', '.join(missing)}")
+            self.predictors = {area: by_area[area] for area in self.areas}
+
+        # One batcher per model: only rows of the same booster can share a call
+        batchers: dict[int, MicroBatcher] = {}
+        for p in self.predictors.values():
+            if id(p) not in batchers:
+                batchers[id(p)] = MicroBatcher(p, max_wait_ms=max_wait_ms)
+        self.batchers = {area: batchers[id(p)] for area, p in self.predictors.items()}
+        self._state: dict[str, _AreaForecast] = {}
+        self._stop = threading.Event()
+
+        self.refresh()
+        if refresh_seconds:
+            threading.Thread(target=self._refresh_loop, args=(refresh_seconds,), name="refresh", daemon=True).start()
+
+    def refresh(self, predict: bool = True) -> None:
+        """
+        Reload the features of every area and, with predict, compute the new
+        forecasts in one batch per model. Areas whose features or prediction
+        fail keep their old forecast.
+        """
+        for p in {id(p): p for p in self.predictors.values()}.values():
+            p.clear_memo()
+        fresh = []
+        for area in self.areas:
+            try:
+                state = _AreaForecast(
+                    area, self.feature_source(area), self.predictors[area].feature_names, self.batchers[area]
+                )
+            except Exception as e:
+                logger.warning(f"Feature refresh failed for {area}: {e}")
+                continue
+            fresh.append(state)
+            logger.info(f"Features for {area}: {len(state.X)} hour(s) on {state.date_local}")
+
+        if predict:
+            # Submit every area before waiting so they land in the same batch
+            for state in fresh:
+                with state._lock:
+                    state._pending = state.batcher.submit(state.X)
+            predicted = []
+            for state in fresh:
+                try:
+                    state.ensure_predicted()
+                except Exception as e:
+                    logger.warning(f"Prediction failed for {state.area}: {e!r}")
+                    continue
+                predicted.append(state)
+            fresh = predicted
+
+        for state in fresh:
+            self._state[state.area] = state
+
+    def _refresh_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Feature refresh failed")
+
+    def close(self) -> None:
+        self._stop.set()
+        for batcher in {id(b): b for b in self.batchers.values()}.values():
+            batcher.close()
+
+    def _area_state(self, area: str) -> _AreaForecast:
+        state = self._state.get(area.upper())
+        if state is None:
+            raise KeyError(area)
+        state.ensure_predicted()
+        return state
+
+    def forecast_json(self, area: str) -> bytes:
+        """Encoded next-day forecast of an area."""
+        return self._area_state(area).summary
+
+    def hour_json(self, area: str, hour_local: int) -> bytes:
+        """Encoded forecast of one local hour."""
+        hour = self._area_state(area).hours.get(hour_local)
+        if hour is None:
+            raise KeyError(f"{area}/{hour_local}")
+        return hour
+
+    def forecast(self, area: str) -> dict:
+        return json.loads(self.forecast_json(area))
+
+    def hour(self, area: str, hour_local: int) -> dict:
+        return json.loads(self.hour_json(area, hour_local))
+
+    def health(self) -> dict:
+        return {
+            "status": "ok" if self._state else "no features",
+            "areas": {
+                area: {
+                    "features": len(self.predictors[area].feature_names),
+                    "date_local": str(s.date_local),
+                    "hours": len(s.X),
+                    "refreshed_at_utc": s.refreshed_at,
+                }
+                for area, s in self._state.items()
+            },
+        }
+
+
+# =============================================================================
+# HTTP
+# =============================================================================
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "elprice-forecast"
+
+    service: ForecastService
+
+    def do_GET(self):
+        started = time.perf_counter()
+        parts = [p for p in self.path.split("?", 1)[0].split("/") if p]
+        endpoint = "/".join(parts[:1]) or "root"
+        try:
+            status, body = self._route(parts)
+        except KeyError as e:
+            status, body = 404, {"error": f"unknown area or hour: {e.args[0]}"}
+        except Exception as e:
+            logger.exception("Request failed")
+            status, body = 500, {"error": str(e)}
+
+        if isinstance(body, bytes):
+            payload, content_type = body, "application/json"
+        elif isinstance(body, str):
+            payload, content_type = body.encode(), "text/plain; version=0.0.4"
+        else:
+            payload, content_type = json.dumps(body).encode(), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+        metrics.inc("elprice_serving_requests_total", endpoint=endpoint, status=status)
+        metrics.observe("elprice_serving_request_seconds", time.perf_counter() - started, endpoint=endpoint)
+
+    def _route(self, parts: list[str]) -> tuple[int, dict | str | bytes]:
+        if parts == ["health"]:
+            return 200, self.service.health()
+        if parts == ["metrics"]:
+            return 200, metrics.to_prometheus()
+        if len(parts) == 2 and parts[0] == "forecast":
+            return 200, self.service.forecast_json(parts[1])
+        if len(parts) == 3 and parts[0] == "forecast":
+            if not parts[2].isdigit() or not 0 <= int(parts[2]) <= 23:
+                return 400, {"error": "hour must be 0-23"}
+            return 200, self.service.hour_json(parts[1], int(parts[2]))
+        return 404, {"error": "use /health, /metrics, /forecast/<area> or /forecast/<area>/<hour>"}
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(service: ForecastService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """HTTP server for the service (call serve_forever() to run it)."""
+    handler = type("ForecastHandler", (_Handler,), {"service": service})
+    server_cls = type("ForecastServer", (ThreadingHTTPServer,), {"request_queue_size": 128, "daemon_threads": True})
+    return server_cls((host, port), handler)
+
+
+# =============================================================================
+# Feature sources
+# =============================================================================
+
+def parquet_feature_source(directory: Path | str) -> FeatureSource:
+    """Read <directory>/<AREA>.parquet (model columns + 'date') on every refresh."""
+    directory = Path(directory)
+
+    def load(area: str) -> pd.DataFrame:
+        return pd.read_parquet(directory / f"{area.upper()}.parquet")
+
+    return load
+
+
+def hopsworks_feature_source(project, default_location: Optional[dict] = None) -> FeatureSource:
+    """
+    Build tomorrow's features from Hopsworks and the weather forecast.
+
+    Areas other than the configured location use the first (main) weather
+    point of util.PRICE_AREA_WEATHER_POINTS. An area without recent rows in
+    the electricity_prices feature group (the daily ingest only writes the
+    configured area) raises ValueError instead of serving NaN price lags.
+    """
+    from src import util
+    from src.pipelines import common
+    from src.pipelines.infer import LAG_BUFFER_DAYS, build_forecast_features, recent_prices
+
+    prices_fg, _ = common.get_feature_groups(project.get_feature_store())
+
+    def load(area: str) -> pd.DataFrame:
+        location = default_location
+        if location is None or location["price_area"].upper() != area:
+            lat, lon, _ = util.PRICE_AREA_WEATHER_POINTS[area][0]
+            location = {"price_area": area, "latitude": lat, "longitude": lon}
+        hist_prices = recent_prices(prices_fg, area)
+        if not hist_prices["price_sek"].notna().any():
+            raise ValueError(f"No prices for {area} in the last {LAG_BUFFER_DAYS} days of {common.PRICES_FG}")
+        return build_forecast_features(prices_fg, location, hist_prices)
+
+    return load
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from . import inference
+
+    parser = argparse.ArgumentParser(prog="python -m src.serving", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--areas", nargs="+", default=["SE3"], help="price areas to serve")
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH, help="model.json to serve")
+    parser.add_argument("--features-dir", type=Path, help="read <AREA>.parquet feature files from here")
+    parser.add_argument("--hopsworks", action="store_true",
+                        help="serve the best registered model of each area with features built from Hopsworks")
+    parser.add_argument("--refresh-seconds", type=float, default=REFRESH_SECONDS)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS, help="micro-batching window")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.features_dir is None and not args.hopsworks:
+        parser.error("give --features-dir or --hopsworks")
+
+    from src.pipelines import common
+
+    common.configure_logging(args.verbose)
+    metrics.enable()
+
+    # Forecasts are cached per refresh, so the row memo would only add hashing
+    if args.hopsworks:
+        from src.pipelines.train import model_name
+
+        project = common.login()
+        location = common.load_location()
+        predictor = {}
+        for area in args.areas:
+            try:
+                booster, _ = inference.load_registry_booster(project, model_name(area))
+            except ValueError as e:
+                logger.error(f"Cannot serve {area.upper()}: {e}")
+                return 1
+            predictor[area] = BatchPredictor(booster, memo_size=0)
+        source = hopsworks_feature_source(project, location)
+    else:
+        predictor = BatchPredictor(inference.load_booster(args.model), memo_size=0)
+        source = parquet_feature_source(args.features_dir)
+
+    service = ForecastService(
+        predictor,
+        source,
+        args.areas,
+        refresh_seconds=args.refresh_seconds,
+        max_wait_ms=args.max_wait_ms,
+    )
+    missing = [area for area in service.areas if area not in service._state]
+    if missing:
+        logger.error(f"No forecast features for {', '.join(missing)}; not serving")
+        service.close()
+        return 1
+
+    server = make_server(service, args.host, args.port)
+    logger.info(f"Serving {', '.join(service.areas)} on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,262 @@
+"""
+Parallel hyperparameter search with successive halving.
+
+The training and validation rows are quantized once into QuantileDMatrix
+objects (the validation matrix reuses the training bin edges) in every worker
+process, instead of once per candidate. Candidates are trained with the
+native xgboost.train API on a pool of spawned workers. Every rung splits the
+cores over the candidates it trains (nthread = cores // candidates), so the
+pool does not oversubscribe the machine and the last rungs, with few
+candidates left, still use all cores.
+
+Successive halving: every candidate first gets a small budget of boosting
+rounds; only the best 1/reduction_factor (by validation RMSE) continue, from
+their current booster, to a reduction_factor times larger budget, up to
+max_rounds. Early stopping on the validation RMSE still applies within each
+rung, and a candidate that stops early keeps its score without using more
+rounds.
+
+    best = search(X_tr, y_tr, X_val, y_val, candidates, base_params)
+    best["params"], best["best_n_estimators"], best["rmse"]
+"""
+
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import numpy as np
+
+from . import metrics
+
+if TYPE_CHECKING:
+    import xgboost
+
+
+logger = logging.getLogger(__name__)
+
+MIN_ROUNDS = 100
+REDUCTION_FACTOR = 3
+MAX_BIN = 256
+
+# XGBRegressor arguments that have a different name (or no meaning) in xgboost.train
+_SKLEARN_TO_NATIVE = {"n_jobs": "nthread", "random_state": "seed"}
+_SKLEARN_ONLY = {"n_estimators", "early_stopping_rounds", "eval_metric"}
+
+# Per-process quantized matrices: (dtrain, dval)
+_matrices: Optional[tuple["xgboost.DMatrix", "xgboost.DMatrix"]] = None
+
+
+# =============================================================================
+# Parameters and budgets
+# =============================================================================
+
+def native_params(params: dict, nthread: int) -> dict:
+    """Translate XGBRegressor keyword arguments into xgboost.train params."""
+    out = {"eval_metric": "rmse"}
+    for key, value in params.items():
+        if key in _SKLEARN_ONLY:
+            continue
+        out[_SKLEARN_TO_NATIVE.get(key, key)] = value
+    out["nthread"] = nthread
+    return out
+
+
+def rung_budgets(min_rounds: int, max_rounds: int, reduction_factor: int) -> list[int]:
+    """Boosting rounds per rung, e.g. 100, 300, 900, 2700, 5000."""
+    budgets = [min(min_rounds, max_rounds)]
+    while budgets[-1] < max_rounds:
+        budgets.append(min(budgets[-1] * reduction_factor, max_rounds))
+    return budgets
+
+
+def worker_layout(n_candidates: int, n_jobs: Optional[int] = None) -> tuple[int, int]:
+    """(worker processes, threads per worker) for n_jobs cores."""
+    cores = n_jobs if n_jobs and n_jobs > 0 else (os.cpu_count() or 1)
+    workers = max(1, min(cores, n_candidates))
+    return workers, max(1, cores // workers)
+
+
+def _float32(values) -> np.ndarray:
+    """C-contiguous float32 copy of a frame/series/array (pd.NA becomes NaN)."""
+    if hasattr(values, "to_numpy"):
+        values = values.to_numpy(dtype=np.float32, na_value=np.nan)
+    return np.ascontiguousarray(values, dtype=np.float32)
+
+
+# =============================================================================
+# Workers
+# =============================================================================
+
+def _init_worker(X_tr, y_tr, X_val, y_val, nthread: int, max_bin: int) -> None:
+    """Quantize the training/validation rows once per process."""
+    global _matrices
+    import xgboost
+
+    dtrain = xgboost.QuantileDMatrix(X_tr, label=y_tr, max_bin=max_bin, nthread=nthread)
+    dval = xgboost.QuantileDMatrix(X_val, label=y_val, ref=dtrain, nthread=nthread)
+    _matrices = (dtrain, dval)
+
+
+def _train_candidate(task: dict) -> dict:
+    """
+    Train one candidate up to task["budget"] rounds, continuing from its
+    previous booster if it has one.
+    """
+    import xgboost
+
+    dtrain, dval = _matrices
+    patience = task["early_stopping_rounds"]
+    start = task["rounds"]
+
+    class _Stop(xgboost.callback.TrainingCallback):
+        # Early stopping on the best RMSE over all rungs, not just this one
+        def __init__(self):
+            super().__init__()
+            self.best_rmse = task["rmse"]
+            self.best_iteration = task["best_iteration"]
+
+        def after_iteration(self, model, epoch, evals_log) -> bool:
+            iteration = start + epoch
+            rmse = evals_log["val"]["rmse"][-1]
+            if rmse < self.best_rmse:
+                self.best_rmse, self.best_iteration = rmse, iteration
+            return iteration - self.best_iteration >= patience
+
+    stop = _Stop()
+    booster = xgboost.train(
+        native_params(task["params"], task["nthread"]),
+        dtrain,
+        num_boost_round=task["budget"] - start,
+        evals=[(dval, "val")],
+        callbacks=[stop],
+        verbose_eval=False,
+        xgb_model=xgboost.Booster(model_file=task["model"]) if task["model"] is not None else None,
+    )
+    rounds = booster.num_boosted_rounds()
+    return {
+        **task,
+        "model": booster.save_raw("ubj"),
+        "rounds": rounds,
+        "rmse": float(stop.best_rmse),
+        "best_iteration": int(stop.best_iteration),
+        "stopped": rounds < task["budget"] or rounds - 1 - stop.best_iteration >= patience,
+    }
+
+
+# =============================================================================
+# Search
+# =============================================================================
+
+def search(
+    X_tr,
+    y_tr,
+    X_val,
+    y_val,
+    candidates: Iterable[dict],
+    base_params: dict,
+    max_rounds: Optional[int] = None,
+    early_stopping_rounds: int = 50,
+    min_rounds: int = MIN_ROUNDS,
+    reduction_factor: int = REDUCTION_FACTOR,
+    n_jobs: Optional[int] = None,
+    max_bin: int = MAX_BIN,
+) -> dict:
+    """
+    Successive-halving search over candidate parameter sets.
+
+    Args:
+        X_tr, y_tr: Training rows (DataFrame/array), sorted by time
+        X_val, y_val: Validation rows (the latest part of the time range)
+        candidates: Parameter sets (XGBRegressor keyword arguments)
+        base_params: XGBRegressor arguments shared by all candidates
+        max_rounds: Largest number of boosting rounds (default: base_params["n_estimators"])
+        early_stopping_rounds: Patience on the validation RMSE
+        min_rounds: Rounds every candidate gets in the first rung
+        reduction_factor: Keep 1/reduction_factor of the candidates per rung
+        n_jobs: Cores to use (default: base_params["n_jobs"], -1/None = all)
+        max_bin: Histogram bins of the quantized matrices
+
+    Returns:
+        {"rmse", "params", "best_n_estimators", "trials"} where trials lists
+        every candidate's params, RMSE and rounds trained
+    """
+    candidates = list(candidates)
+    if not candidates:
+        raise ValueError("No candidates to search")
+
+    max_rounds = max_rounds or base_params.get("n_estimators", 1000)
+    n_jobs = n_jobs if n_jobs is not None else base_params.get("n_jobs")
+    workers, nthread = worker_layout(len(candidates), n_jobs)
+    cores = workers * nthread
+    budgets = rung_budgets(min_rounds, max_rounds, reduction_factor)
+
+    data = tuple(_float32(a) for a in (X_tr, y_tr, X_val, y_val))
+
+    trials = [
+        {
+            "id": i,
+            "params": params,
+            "budget": 0,
+            "model": None,
+            "rounds": 0,
+            "rmse": math.inf,
+            "best_iteration": -1,
+            "stopped": False,
+            "early_stopping_rounds": early_stopping_rounds,
+        }
+        for i, params in enumerate(candidates)
+    ]
+    logger.info(
+        f"Searching {len(trials)} candidates with {workers} worker(s) x {nthread} thread(s), "
+        f"rung budgets {budgets}"
+    )
+
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            workers, mp_context=get_context("spawn"), initializer=_init_worker, initargs=(*data, nthread, max_bin)
+        )
+        run_batch = lambda tasks: list(pool.map(_train_candidate, tasks))  # noqa: E731
+    else:
+        pool = None
+        _init_worker(*data, nthread, max_bin)
+        run_batch = lambda tasks: [_train_candidate(t) for t in tasks]  # noqa: E731
+
+    alive = trials
+    try:
+        with metrics.timer("elprice_stage_seconds", pipeline="train", stage="tune"):
+            for rung, budget in enumerate(budgets):
+                pending = [t for t in alive if not t["stopped"] and t["rounds"] < budget]
+                threads = max(1, cores // max(1, len(pending)))
+                tasks = [
+                    {**t, "params": {**base_params, **t["params"]}, "budget": budget, "nthread": threads}
+                    for t in pending
+                ]
+                for result in run_batch(tasks):
+                    trial = trials[result["id"]]
+                    trial.update({k: result[k] for k in ("model", "rounds", "rmse", "best_iteration", "stopped")})
+
+                alive = sorted(alive, key=lambda t: t["rmse"])
+                logger.info(
+                    f"Rung {rung}: {len(tasks)} candidate(s) trained to {budget} rounds, "
+                    f"best RMSE {alive[0]['rmse']:.5f}"
+                )
+                if budget >= max_rounds:
+                    break
+                alive = alive[:max(1, math.ceil(len(alive) / reduction_factor))]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    best = min(trials, key=lambda t: t["rmse"])
+    return {
+        "rmse": best["rmse"],
+        "params": best["params"],
+        "best_n_estimators": best["best_iteration"] + 1,
+        "trials": [
+            {"params": t["params"], "rmse": t["rmse"], "rounds": t["rounds"]}
+            for t in sorted(trials, key=lambda t: t["rmse"])
+        ],
+    }
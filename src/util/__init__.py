@@ -0,0 +1,112 @@
+"""
+Utility functions for electricity price prediction.
+
+The helpers live in submodules that are imported on first use:
+- weather: historical and forecast weather from Open-Meteo
+- prices: electricity prices from the elprisetjustnu.se API
+- features: calendar, time and price lag features
+- plotting: forecast plots (matplotlib)
+- schema: column layouts of the price/weather frames and a dtype converter
+- intraday: compact prices at native (15-minute) resolution
+
+`from src import util` loads none of them; `util.<name>` imports the
+submodule that defines <name> the first time it is accessed, so the old
+flat names keep working. Module-level settings such as ELPRICE_BASE_URL are
+read by the submodule, so override them there (util.prices.ELPRICE_BASE_URL).
+"""
+
+import importlib
+
+
+SUBMODULES = ("weather", "prices", "features", "plotting", "schema", "intraday")
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    **dict.fromkeys([
+        "HOURLY_WEATHER_VARIABLES",
+        "DAILY_WEATHER_VARIABLES",
+        "get_city_coordinates",
+        "OPENMETEO_ARCHIVE_URL",
+        "OPENMETEO_FORECAST_URL",
+        "ARCHIVE_CHUNK_FREQ",
+        "ARCHIVE_MAX_WORKERS",
+        "get_hourly_historical_weather",
+        "get_hourly_weather_forecast",
+        "get_daily_historical_weather",
+        "get_yesterday_hourly_weather",
+        "PRICE_AREA_WEATHER_POINTS",
+        "get_price_area_hourly_weather",
+        "iter_hourly_historical_weather",
+    ], "weather"),
+    **dict.fromkeys([
+        "ELPRICE_EARLIEST_DATE",
+        "DEFAULT_PRICE_AREA",
+        "PRICE_AREAS",
+        "ELPRICE_BASE_URL",
+        "ELPRICE_PROXY_BASE_URL",
+        "PRICE_RATE_MIN",
+        "PRICE_RATE_MAX",
+        "PRICE_FETCH_ATTEMPTS",
+        "RETRY_AFTER_MAX",
+        "PriceFetchController",
+        "PriceStore",
+        "fetch_electricity_prices_for_date",
+        "fetch_electricity_prices",
+        "fetch_electricity_prices_multi_area",
+        "fetch_electricity_prices_native",
+        "PRICE_VALUE_FIELDS",
+        "align_electricity_price_schema",
+        "get_today_electricity_prices",
+        "get_tomorrow_electricity_prices",
+        "iter_electricity_prices",
+    ], "prices"),
+    **dict.fromkeys([
+        "SEASON_MAP",
+        "CALENDAR_YEARS",
+        "get_calendar_table",
+        "add_calendar_features",
+        "add_time_features",
+        "add_price_lag_features",
+        "FEATURE_PRICE_LAGS",
+        "FEATURE_ROLL_WINDOW",
+        "add_feature_group_price_lags",
+        "PriceLagState",
+    ], "features"),
+    **dict.fromkeys([
+        "plot_electricity_price_forecast",
+        "plot_next_day_price_forecast",
+    ], "plotting"),
+    **dict.fromkeys([
+        "Schema",
+        "SCHEMAS",
+        "ELECTRICITY_PRICES_RAW",
+        "ELECTRICITY_PRICES",
+        "WEATHER_HOURLY",
+        "get_schema",
+        "conform",
+        "unix_time_ms",
+    ], "schema"),
+    "PriceSeries": "intraday",
+    "STREAM_CHUNK_FREQS": "_dates",
+}
+
+__all__ = [*SUBMODULES, *_EXPORTS]
+
+
+def __getattr__(name: str):
+    if name in SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    if callable(value):
+        # Functions and classes never change, so skip __getattr__ next time
+        globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
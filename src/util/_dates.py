@@ -0,0 +1,41 @@
+"""
+Date-range chunking shared by the weather and price fetchers.
+"""
+
+from typing import Optional
+
+import pandas as pd
+
+
+def _split_date_range(
+    start_date: str,
+    end_date: str,
+    chunk_freq: Optional[str],
+) -> list[tuple[str, str]]:
+    """
+    Split an inclusive YYYY-MM-DD range into consecutive chunks.
+    
+    Chunk boundaries follow a pandas frequency (e.g. "QS" for quarters,
+    "MS" for months). With chunk_freq=None the range is returned as is.
+    """
+    if not chunk_freq:
+        return [(start_date, end_date)]
+    
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    starts = [start] + [b for b in pd.date_range(start, end, freq=chunk_freq) if b > start]
+    ends = [s - pd.Timedelta(days=1) for s in starts[1:]] + [end]
+    return [(s.date().isoformat(), e.date().isoformat()) for s, e in zip(starts, ends)]
+
+
+# Chunk sizes for the streaming generators (pandas frequencies of chunk starts)
+STREAM_CHUNK_FREQS = {
+    "day": "D",
+    "week": "W-MON",
+    "month": "MS",
+}
+
+
+def _stream_chunks(start_date, end_date, chunk: str) -> list[tuple[str, str]]:
+    if chunk not in STREAM_CHUNK_FREQS:
+        raise ValueError(f"chunk must be one of {list(STREAM_CHUNK_FREQS)}, got {chunk!r}")
+    return _split_date_range(str(start_date), str(end_date), STREAM_CHUNK_FREQS[chunk])
@@ -0,0 +1,322 @@
+"""
+Feature engineering: calendar/holiday lookups, time features and price lags.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# =============================================================================
+# Feature Engineering Helpers
+# =============================================================================
+
+# 0=winter, 1=spring, 2=summer, 3=autumn
+SEASON_MAP = {12: 0, 1: 0, 2: 0, 3: 1, 4: 1, 5: 1, 6: 2, 7: 2, 8: 2, 9: 3, 10: 3, 11: 3}
+
+# Years covered by the default precomputed calendar table
+CALENDAR_YEARS = (2022, 2035)
+
+# Cyclical hour encodings, indexed by hour 0-23
+_HOUR_SIN = np.sin(2 * np.pi * np.arange(24) / 24).astype('float32')
+_HOUR_COS = np.cos(2 * np.pi * np.arange(24) / 24).astype('float32')
+
+
+@lru_cache(maxsize=4)
+def get_calendar_table(
+    start_year: int = CALENDAR_YEARS[0],
+    end_year: int = CALENDAR_YEARS[1],
+) -> pd.DataFrame:
+    """
+    Precomputed per-day calendar features, built once per process.
+    
+    Row i is the day start_year-01-01 + i days, so features for any timestamp
+    are a single integer-indexed lookup. Treat the returned frame as read-only.
+    
+    Returns:
+        DataFrame indexed by day with weekday, is_weekend, month, season,
+        is_holiday, dow_sin and dow_cos
+    """
+    days = pd.date_range(f"{start_year}-01-01", f"{end_year}-12-31", freq="D")
+    weekday = days.weekday.to_numpy()
+    month = days.month.to_numpy()
+    
+    try:
+        import holidays
+        se_holidays = holidays.Sweden(years=range(start_year, end_year + 1))
+        is_holiday = pd.Index(days.date).isin(list(se_holidays.keys()))
+    except Exception:
+        # If holidays package not available, default to 0
+        is_holiday = np.zeros(len(days), dtype=bool)
+    
+    return pd.DataFrame(
+        {
+            'weekday': weekday.astype('int8'),
+            'is_weekend': (weekday >= 5).astype('int8'),
+            'month': month.astype('int8'),
+            'season': pd.Series(month).map(SEASON_MAP).to_numpy().astype('int8'),
+            'is_holiday': is_holiday.astype('int8'),
+            'dow_sin': np.sin(2 * np.pi * weekday / 7).astype('float32'),
+            'dow_cos': np.cos(2 * np.pi * weekday / 7).astype('float32'),
+        },
+        index=days,
+    )
+
+
+def _calendar_positions(timestamps: pd.Series) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Map timestamps to row positions in the calendar table.
+    
+    Days are taken in the series' own timezone (UTC for the feature store
+    'date' columns), matching .dt.weekday/.dt.month on the same series.
+    """
+    ts = timestamps
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        ts = pd.to_datetime(ts)
+    if isinstance(ts.dtype, pd.DatetimeTZDtype):
+        ts = ts.dt.tz_localize(None)
+    day = ts.to_numpy().astype('datetime64[D]').astype(np.int64)
+    if len(day) == 0:
+        return get_calendar_table(), day
+    
+    start_year, end_year = CALENDAR_YEARS
+    first = pd.Timestamp(int(day.min()), unit='D').year
+    last = pd.Timestamp(int(day.max()), unit='D').year
+    table = get_calendar_table(min(start_year, first), max(end_year, last))
+    origin = table.index[0].to_datetime64().astype('datetime64[D]').astype(np.int64)
+    return table, day - origin
+
+
+def add_calendar_features(df: pd.DataFrame, time_col: str = 'date') -> pd.DataFrame:
+    """
+    Add the feature-group calendar columns from the precomputed calendar table.
+    
+    Adds weekday (0=Mon), is_weekend, month, season (0 winter ... 3 autumn)
+    and is_holiday (Swedish public holidays), all int8.
+    
+    Args:
+        df: DataFrame with a datetime column
+        time_col: Column to derive the calendar day from
+        
+    Returns:
+        DataFrame with calendar features
+    """
+    df = df.copy()
+    table, pos = _calendar_positions(df[time_col])
+    for col in ['weekday', 'is_weekend', 'month', 'season', 'is_holiday']:
+        df[col] = table[col].to_numpy()[pos]
+    return df
+
+
+def add_time_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add time-based features useful for electricity price prediction.
+    
+    Calendar values and cyclical encodings come from the precomputed calendar
+    table instead of being recomputed per row.
+    
+    Args:
+        df: DataFrame with 'timestamp' column
+        
+    Returns:
+        DataFrame with additional time features
+    """
+    df = df.copy()
+    table, pos = _calendar_positions(df['timestamp'])
+    
+    # Basic time features
+    df['day_of_week'] = table['weekday'].to_numpy()[pos].astype('int16')  # 0=Monday
+    df['is_weekend'] = table['is_weekend'].to_numpy()[pos].astype('int16')
+    df['month'] = table['month'].to_numpy()[pos].astype('int16')
+    
+    # Cyclical encoding for hour (for neural networks)
+    hour = df['hour'].to_numpy()
+    df['hour_sin'] = _HOUR_SIN[hour]
+    df['hour_cos'] = _HOUR_COS[hour]
+    
+    # Cyclical encoding for day of week
+    df['dow_sin'] = table['dow_sin'].to_numpy()[pos]
+    df['dow_cos'] = table['dow_cos'].to_numpy()[pos]
+    
+    return df
+
+
+def add_price_lag_features(
+    df: pd.DataFrame,
+    lags: list[int] = [1, 24, 168],
+    group_col: Optional[str] = None,
+    roll_window: Optional[int] = None,
+    lag_name: str = "price_lag_{lag}h",
+    roll_name: str = "price_roll_{window}h",
+) -> pd.DataFrame:
+    """
+    Add lagged price features for time series prediction.
+    
+    Args:
+        df: DataFrame with 'price_sek' column, sorted by timestamp
+        lags: List of lag periods (hours). Default: 1h, 24h (1 day), 168h (1 week)
+        group_col: Optional column (e.g. 'price_area') to lag within each group
+        roll_window: Optional window (rows) for a rolling mean of price_sek
+        lag_name: Column name template for lags
+        roll_name: Column name template for the rolling mean
+        
+    Returns:
+        DataFrame with lag features
+    """
+    df = df.copy()
+    sort_col = 'timestamp' if 'timestamp' in df.columns else 'unix_time'
+    df = df.sort_values([group_col, sort_col] if group_col else sort_col)
+    
+    prices = df.groupby(group_col, observed=True)['price_sek'] if group_col else df['price_sek']
+    for lag in lags:
+        df[lag_name.format(lag=lag)] = prices.shift(lag).astype('float32')
+    
+    if roll_window:
+        roll = prices.rolling(roll_window, min_periods=1).mean()
+        if group_col:
+            roll = roll.reset_index(level=0, drop=True)
+        df[roll_name.format(window=roll_window)] = roll.astype('float32')
+    
+    return df
+
+
+# Lag/rolling features stored in the electricity_prices feature group
+FEATURE_PRICE_LAGS = [24, 48, 72]
+FEATURE_ROLL_WINDOW = 72
+
+
+def add_feature_group_price_lags(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Batch price_lag_24/48/72 and price_roll3d per price_area, as stored in the
+    electricity_prices feature group.
+    """
+    return add_price_lag_features(
+        df,
+        lags=FEATURE_PRICE_LAGS,
+        group_col='price_area',
+        roll_window=FEATURE_ROLL_WINDOW,
+        lag_name="price_lag_{lag}",
+        roll_name="price_roll3d",
+    )
+
+
+class PriceLagState:
+    """
+    Incremental version of add_feature_group_price_lags.
+    
+    Keeps a fixed-size buffer of the most recent hourly prices per price area
+    and computes lag and rolling features for newly arrived hours only, with
+    the same values as the batch path. The daily cost therefore does not
+    depend on the lookback window. State can be saved to and loaded from a
+    small .npz file between runs.
+    
+    Args:
+        lags: Lag periods (rows/hours)
+        roll_window: Rolling mean window (rows/hours)
+    """
+    
+    def __init__(
+        self,
+        lags: list[int] = FEATURE_PRICE_LAGS,
+        roll_window: int = FEATURE_ROLL_WINDOW,
+    ):
+        self.lags = list(lags)
+        self.roll_window = int(roll_window)
+        self.capacity = max(max(self.lags), self.roll_window)
+        self._buffers: dict[str, np.ndarray] = {}
+        self._last_unix_time: dict[str, int] = {}
+    
+    def last_unix_time(self, price_area: str) -> Optional[int]:
+        """unix_time of the last stored hour of an area (None if none)."""
+        return self._last_unix_time.get(price_area)
+    
+    def reset(self, price_area: str) -> None:
+        """Forget the stored hours of an area (e.g. before a gap is refilled)."""
+        self._buffers.pop(price_area, None)
+        self._last_unix_time.pop(price_area, None)
+    
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Append new hours and return them with lag/rolling features.
+        
+        Rows at or before the last hour already stored for their price area
+        are ignored, so re-running a day is harmless. Trailing rows without a
+        price (forecast hours) get features but are not stored, so a later
+        update with their actual prices is taken as new hours; hours without
+        a price followed by priced ones are stored as missing, as in the
+        batch path.
+        
+        Args:
+            df: Rows with price_area, unix_time and price_sek (NaN for hours
+                whose price is not known yet, e.g. forecast rows)
+            
+        Returns:
+            The new rows with price_lag_{lag} and price_roll3d columns
+        """
+        out = []
+        for area, rows in df.sort_values(['price_area', 'unix_time']).groupby('price_area', sort=False, observed=True):
+            last = self._last_unix_time.get(area)
+            if last is not None:
+                rows = rows[rows['unix_time'] > last]
+            if rows.empty:
+                continue
+            
+            history = self._buffers.get(area, np.empty(0, dtype=np.float64))
+            new = rows['price_sek'].to_numpy(dtype=np.float64, na_value=np.nan)
+            series = np.concatenate([history, new])
+            m, n = len(history), len(new)
+            idx = np.arange(m, m + n)
+            
+            rows = rows.copy()
+            for lag in self.lags:
+                src = idx - lag
+                lagged = np.full(n, np.nan)
+                ok = src >= 0
+                lagged[ok] = series[src[ok]]
+                rows[f'price_lag_{lag}'] = lagged.astype('float32')
+            
+            # Rolling mean over the last roll_window rows (min_periods=1, NaN skipped)
+            valid = ~np.isnan(series)
+            csum = np.concatenate([[0.0], np.cumsum(np.where(valid, series, 0.0))])
+            ccount = np.concatenate([[0], np.cumsum(valid)])
+            start = np.maximum(idx - self.roll_window + 1, 0)
+            total = csum[idx + 1] - csum[start]
+            count = ccount[idx + 1] - ccount[start]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                rows['price_roll3d'] = np.where(count > 0, total / count, np.nan).astype('float32')
+            
+            # Store up to the last priced hour only
+            known = np.flatnonzero(~np.isnan(new))
+            if len(known):
+                stored = m + known[-1] + 1
+                self._buffers[area] = series[max(stored - self.capacity, 0):stored].copy()
+                self._last_unix_time[area] = int(rows['unix_time'].iloc[known[-1]])
+            out.append(rows)
+        
+        if not out:
+            return df.iloc[0:0].copy()
+        return pd.concat(out, ignore_index=True)
+    
+    def save(self, path: str) -> None:
+        """Persist the state to an .npz file."""
+        arrays = {
+            "lags": np.asarray(self.lags),
+            "roll_window": np.asarray(self.roll_window),
+            "areas": np.asarray(list(self._buffers), dtype=str),
+        }
+        for i, area in enumerate(self._buffers):
+            arrays[f"values_{i}"] = self._buffers[area]
+            arrays[f"last_{i}"] = np.asarray(self._last_unix_time[area], dtype=np.int64)
+        np.savez(path, **arrays)
+    
+    @classmethod
+    def load(cls, path: str) -> "PriceLagState":
+        """Load a state saved with save()."""
+        with np.load(path) as data:
+            state = cls(lags=data["lags"].tolist(), roll_window=int(data["roll_window"]))
+            for i, area in enumerate(data["areas"].tolist()):
+                state._buffers[area] = data[f"values_{i}"]
+                state._last_unix_time[area] = int(data[f"last_{i}"])
+        return state
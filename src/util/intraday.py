@@ -0,0 +1,260 @@
+"""
+Electricity prices at their native (15-minute) resolution.
+
+Since the move to quarter-hour settlement the price API returns 96 points a
+day. PriceSeries keeps them compactly, as int32 minute offsets from a base
+epoch (UTC midnight of the first point) plus one float32 array per price
+column, i.e. 8 bytes per point for price_sek, and derives coarser views on
+demand:
+
+    series = util.fetch_electricity_prices_native(start, end, "SE3")
+    series.hourly()          # DataFrame in the fetch_electricity_prices schema
+    series.resample(60)      # PriceSeries of hourly means
+    series.daily()           # PriceSeries of local-day means
+    series.lag_features()    # price_lag_24/48/72, price_roll3d at native resolution
+
+Days before the switch come as hourly points and are kept as such, so a
+series may mix 60- and 15-minute spacing; means over coarser buckets are
+unaffected.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Delivery days (and daily means) are local to the Nordic market
+LOCAL_TZ = "Europe/Stockholm"
+
+_MINUTES_PER_DAY = 1440
+
+
+def _bucket_means(values: dict[str, np.ndarray], starts: np.ndarray) -> dict[str, np.ndarray]:
+    """NaN-ignoring float32 means of the runs of values beginning at starts."""
+    means = {}
+    for col, v in values.items():
+        valid = ~np.isnan(v)
+        sums = np.add.reduceat(np.where(valid, v, 0).astype(np.float64), starts)
+        counts = np.add.reduceat(valid.astype(np.int32), starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[col] = np.where(counts > 0, sums / counts, np.nan).astype(np.float32)
+    return means
+
+
+class PriceSeries:
+    """
+    Prices of one price area as minute offsets plus float32 value columns.
+
+    Args:
+        base_epoch: UTC epoch seconds of offset 0 (a UTC midnight)
+        minutes: int32 minute offsets from base_epoch, strictly increasing
+        values: Column (e.g. 'price_sek') -> float32 values, one per offset
+        price_area: Price area label
+    """
+
+    def __init__(self, base_epoch: int, minutes: np.ndarray, values: dict[str, np.ndarray], price_area: str):
+        self.base_epoch = int(base_epoch)
+        self.minutes = np.asarray(minutes, dtype=np.int32)
+        self.values = {c: np.asarray(v, dtype=np.float32) for c, v in values.items()}
+        self.price_area = price_area
+
+    @classmethod
+    def from_epochs(
+        cls,
+        epoch: np.ndarray,
+        values: dict[str, np.ndarray],
+        price_area: str,
+    ) -> "PriceSeries":
+        """
+        Build a series from UTC epoch seconds in any order.
+
+        Duplicate points keep the last value.
+        """
+        epoch = np.asarray(epoch, dtype=np.int64)
+        if not len(epoch):
+            return cls(0, np.empty(0, np.int32), {c: np.empty(0, np.float32) for c in values}, price_area)
+
+        order = np.argsort(epoch, kind="stable")
+        epoch = epoch[order]
+        # Last of each run of equal timestamps
+        keep = np.append(epoch[1:] != epoch[:-1], True)
+        base = int(epoch[0] - epoch[0] % 86400)
+        minutes = (epoch[keep] - base) // 60
+        return cls(base, minutes, {c: np.asarray(v)[order][keep] for c, v in values.items()}, price_area)
+
+    def __len__(self) -> int:
+        return len(self.minutes)
+
+    def __repr__(self) -> str:
+        span = f"{self.times[0]} .. {self.times[-1]}" if len(self) else "empty"
+        return f"PriceSeries({self.price_area}, {len(self)} points, {span})"
+
+    @property
+    def nbytes(self) -> int:
+        return self.minutes.nbytes + sum(v.nbytes for v in self.values.values())
+
+    @property
+    def step_minutes(self) -> Optional[int]:
+        """Smallest spacing between points (None for fewer than two points)."""
+        return int(np.diff(self.minutes).min()) if len(self) > 1 else None
+
+    def epoch_seconds(self) -> np.ndarray:
+        return self.base_epoch + self.minutes.astype(np.int64) * 60
+
+    @property
+    def times(self) -> pd.DatetimeIndex:
+        return pd.to_datetime(self.epoch_seconds(), unit="s", utc=True)
+
+    def _subset(self, minutes: np.ndarray, values: dict[str, np.ndarray]) -> "PriceSeries":
+        return PriceSeries(self.base_epoch, minutes, values, self.price_area)
+
+    def between(self, start=None, end=None) -> "PriceSeries":
+        """Points with start <= time < end (dates or timestamps, naive = UTC)."""
+        def offset(value) -> int:
+            ts = pd.Timestamp(value)
+            ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts
+            return (ts.value // 10**9 - self.base_epoch) // 60
+
+        a = 0 if start is None else int(np.searchsorted(self.minutes, offset(start), "left"))
+        b = len(self) if end is None else int(np.searchsorted(self.minutes, offset(end), "left"))
+        b = max(a, b)
+        return self._subset(self.minutes[a:b], {c: v[a:b] for c, v in self.values.items()})
+
+    # -------------------------------------------------------------------------
+    # Coarser views
+    # -------------------------------------------------------------------------
+
+    def resample(self, minutes: int) -> "PriceSeries":
+        """
+        Means over buckets of `minutes`, aligned to UTC midnight.
+
+        Args:
+            minutes: Bucket length; must divide a day (15, 60, 180, 1440, ...)
+        """
+        if minutes <= 0 or _MINUTES_PER_DAY % minutes:
+            raise ValueError(f"Bucket length must divide {_MINUTES_PER_DAY} minutes, got {minutes}")
+        if not len(self):
+            return self._subset(self.minutes, self.values)
+
+        buckets = self.minutes // minutes
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        return self._subset(buckets[starts] * minutes, _bucket_means(self.values, starts))
+
+    def daily(self, tz: Optional[str] = LOCAL_TZ) -> "PriceSeries":
+        """
+        Means per calendar day of tz (None = UTC days); each point is stamped
+        with the UTC instant of its day's midnight.
+        """
+        if tz is None or not len(self):
+            return self.resample(_MINUTES_PER_DAY)
+
+        local_days = self.times.tz_convert(tz).normalize()
+        starts = np.flatnonzero(np.r_[True, local_days[1:] != local_days[:-1]])
+        midnight = (local_days[starts] - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(minutes=1)
+        return self._subset(np.asarray(midnight) - self.base_epoch // 60, _bucket_means(self.values, starts))
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        One row per point in the fetch_electricity_prices schema plus a
+        'minute' column (minute of the hour).
+        """
+        epoch = self.epoch_seconds()
+        df = pd.DataFrame({
+            'timestamp': pd.to_datetime(epoch * 10**6, unit='us', utc=True),
+            'date': pd.to_datetime(epoch - epoch % 86400, unit='s'),
+            'hour': ((epoch % 86400) // 3600).astype('int16'),
+            'minute': ((epoch % 3600) // 60).astype('int8'),
+            'price_area': self.price_area,
+        })
+        for col, v in self.values.items():
+            df[col] = v
+        return df
+
+    def hourly(self) -> pd.DataFrame:
+        """
+        Hourly means in the schema of fetch_electricity_prices (hours without
+        a price_sek dropped).
+        """
+        df = self.resample(60).to_frame().drop(columns='minute')
+        if 'price_sek' in df.columns:
+            df = df.dropna(subset=['price_sek']).reset_index(drop=True)
+        return df
+
+    # -------------------------------------------------------------------------
+    # Features
+    # -------------------------------------------------------------------------
+
+    def lag_features(
+        self,
+        lags: Optional[list[int]] = None,
+        roll_window: Optional[int] = None,
+        column: str = 'price_sek',
+        lag_name: str = "price_lag_{lag}",
+        roll_name: str = "price_roll3d",
+    ) -> pd.DataFrame:
+        """
+        Price lags and a trailing rolling mean at the series' own resolution.
+
+        Windows are in hours of wall time, so the same features come out of a
+        15-minute and an hourly series: a lag is the value exactly `lag`
+        hours earlier (NaN if that point is missing) and the rolling mean
+        covers the points in (t - roll_window h, t]. On a gapless hourly
+        series this equals add_feature_group_price_lags.
+
+        Args:
+            lags: Lag periods in hours (default: FEATURE_PRICE_LAGS)
+            roll_window: Rolling mean window in hours (default: FEATURE_ROLL_WINDOW)
+            column: Price column to lag
+            lag_name: Column name template for lags
+            roll_name: Column name of the rolling mean
+
+        Returns:
+            to_frame() with the float32 lag and rolling columns added
+        """
+        from .features import FEATURE_PRICE_LAGS, FEATURE_ROLL_WINDOW
+
+        lags = FEATURE_PRICE_LAGS if lags is None else lags
+        roll_window = FEATURE_ROLL_WINDOW if roll_window is None else roll_window
+
+        df = self.to_frame()
+        n = len(self)
+        prices = self.values[column]
+        for lag in lags:
+            target = self.minutes - lag * 60
+            pos = np.searchsorted(self.minutes, target)
+            hit = (pos < n) & (self.minutes[np.minimum(pos, n - 1)] == target)
+            df[lag_name.format(lag=lag)] = np.where(hit, prices[np.minimum(pos, n - 1)], np.nan).astype(np.float32)
+
+        if roll_window:
+            start = np.searchsorted(self.minutes, self.minutes - roll_window * 60, "right")
+            valid = ~np.isnan(prices)
+            sums = np.r_[0.0, np.cumsum(np.where(valid, prices, 0).astype(np.float64))]
+            counts = np.r_[0, np.cumsum(valid)]
+            end = np.arange(1, n + 1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                roll = (sums[end] - sums[start]) / (counts[end] - counts[start])
+            df[roll_name] = roll.astype(np.float32)
+        return df
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Write the series to an .npz file."""
+        np.savez(
+            path,
+            base_epoch=np.asarray(self.base_epoch, dtype=np.int64),
+            minutes=self.minutes,
+            price_area=np.asarray(self.price_area),
+            columns=np.asarray(list(self.values), dtype=str),
+            **{f"values_{i}": v for i, v in enumerate(self.values.values())},
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "PriceSeries":
+        """Load a series written with save()."""
+        with np.load(path) as data:
+            values = {c: data[f"values_{i}"] for i, c in enumerate(data["columns"].tolist())}
+            return cls(int(data["base_epoch"]), data["minutes"], values, str(data["price_area"]))
@@ -0,0 +1,173 @@
+"""
+Forecast plots (matplotlib).
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.ticker import MaxNLocator
+
+
+# =============================================================================
+# Plotting Helpers
+# =============================================================================
+
+def plot_electricity_price_forecast(
+    price_area: str,
+    df: pd.DataFrame,
+    file_path: str,
+    hindcast: bool = False,
+    window_days: int | None = 21,
+) -> plt.Figure:
+    """
+    Plot predicted electricity prices (and actuals if hindcast).
+
+    Args:
+        price_area: Price area label, e.g. "SE3"
+        df: DataFrame with columns:
+            - date
+            - predicted_price_sek
+            - actual price column (electricity_prices_price_sek or price_sek) if hindcast
+        file_path: Path to save the figure
+        hindcast: If True, also plot actuals and set x-limits to recent period
+    """
+    # If hindcast, optionally limit to recent window for readability
+    if hindcast and window_days is not None and "date" in df.columns:
+        try:
+            df = df.copy()
+            df["date"] = pd.to_datetime(df["date"])
+            cutoff = df["date"].max() - pd.Timedelta(days=window_days)
+            df = df[df["date"] >= cutoff]
+        except Exception:
+            pass
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    day = pd.to_datetime(df["date"])
+    ax.plot(
+        day,
+        df["predicted_price_sek"],
+        label="Predicted price (SEK/kWh)",
+        color="red",
+        linewidth=2,
+        marker="o",
+        markersize=4,
+        markerfacecolor="white",
+    )
+
+    actual_col = "electricity_prices_price_sek" if "electricity_prices_price_sek" in df.columns else "price_sek"
+    if hindcast and actual_col in df.columns:
+        ax.plot(
+            day,
+            df[actual_col],
+            label="Actual price (SEK/kWh)",
+            color="black",
+            linewidth=2,
+            marker="^",
+            markersize=4,
+            markerfacecolor="grey",
+        )
+
+    ax.set_xlabel("Date")
+    ax.set_ylabel("SEK / kWh")
+    ax.set_title(f"Electricity price hindcast for {price_area}")
+    ax.grid(True, linestyle="--", alpha=0.4)
+    ax.xaxis.set_major_locator(MaxNLocator(nbins=10))
+    ax.tick_params(axis="x", labelrotation=45)
+
+    # Keep y-axis reasonable
+    try:
+        y_min = min(df["predicted_price_sek"].min(), df[actual_col].min() if hindcast and actual_col in df.columns else np.inf)
+        y_max = max(df["predicted_price_sek"].max(), df[actual_col].max() if hindcast and actual_col in df.columns else -np.inf)
+        if np.isfinite(y_min) and np.isfinite(y_max):
+            pad = (y_max - y_min) * 0.1 if y_max > y_min else 0.1
+            ax.set_ylim(bottom=y_min - pad, top=y_max + pad)
+    except Exception:
+        pass
+
+    if hindcast:
+        try:
+            x_left = pd.Timestamp(df["date"].min()) - pd.Timedelta(days=2)
+            x_right = pd.Timestamp(df["date"].max()) + pd.Timedelta(days=2)
+            ax.set_xlim(left=x_left, right=x_right)
+        except Exception:
+            pass
+
+    ax.legend(loc="best")
+    fig.tight_layout()
+    fig.savefig(file_path)
+    return fig
+
+
+def plot_next_day_price_forecast(
+    forecast_df: pd.DataFrame,
+    price_area: str,
+    file_path: str | None = None,
+) -> plt.Figure:
+    """
+    Plot next-day hourly price forecast and highlight cheapest/expensive hours.
+
+    Args:
+        forecast_df: DataFrame with columns ['date','hour','predicted_price_sek']
+        price_area: Price area label
+        file_path: Optional path to save figure
+
+    Returns:
+        The figure; if it was saved to file_path it is also closed in pyplot
+        (it can still be displayed or saved again)
+    """
+    df = forecast_df.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.sort_values(['date', 'hour'])
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.bar(df['hour'], df['predicted_price_sek'], color="#1f77b4", alpha=0.8, label="Predicted price")
+
+    # Highlight cheapest / 2nd cheapest and most / 2nd most expensive
+    idx_min = df['predicted_price_sek'].idxmin()
+    idx_second_min = df.nsmallest(2, 'predicted_price_sek').index[-1] if len(df) > 1 else idx_min
+    idx_max = df['predicted_price_sek'].idxmax()
+    idx_second_max = df.nlargest(2, 'predicted_price_sek').index[-1] if len(df) > 1 else idx_max
+
+    ax.bar(df.loc[idx_min, 'hour'], df.loc[idx_min, 'predicted_price_sek'], color="green", alpha=0.9, label="Cheapest")
+    if idx_second_min != idx_min:
+        ax.bar(df.loc[idx_second_min, 'hour'], df.loc[idx_second_min, 'predicted_price_sek'], color="#90ee90", alpha=0.9, label="2nd cheapest")
+
+    ax.bar(df.loc[idx_max, 'hour'], df.loc[idx_max, 'predicted_price_sek'], color="red", alpha=0.9, label="Most expensive")
+    if idx_second_max != idx_max:
+        ax.bar(df.loc[idx_second_max, 'hour'], df.loc[idx_second_max, 'predicted_price_sek'], color="#ffa500", alpha=0.9, label="2nd most expensive")
+
+    # Annotate primary extremes
+    ax.annotate(
+        f"Min {df.loc[idx_min, 'predicted_price_sek']:.3f} SEK",
+        xy=(df.loc[idx_min, 'hour'], df.loc[idx_min, 'predicted_price_sek']),
+        xytext=(0, 12),
+        textcoords="offset points",
+        ha="center",
+        color="green",
+        fontsize=9,
+        fontweight="bold",
+    )
+    ax.annotate(
+        f"Max {df.loc[idx_max, 'predicted_price_sek']:.3f} SEK",
+        xy=(df.loc[idx_max, 'hour'], df.loc[idx_max, 'predicted_price_sek']),
+        xytext=(0, -14),
+        textcoords="offset points",
+        ha="center",
+        color="red",
+        fontsize=9,
+        fontweight="bold",
+    )
+
+    ax.set_xlabel("Hour (0-23)")
+    ax.set_ylabel("Predicted price (SEK/kWh)")
+    ax.set_title(f"Next-day hourly electricity price forecast – {price_area}")
+    ax.grid(True, axis="y", linestyle="--", alpha=0.4)
+    ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+    ax.legend(loc="best")
+    fig.tight_layout()
+
+    if file_path:
+        fig.savefig(file_path)
+        plt.close(fig)
+    return fig
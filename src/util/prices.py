@@ -0,0 +1,1101 @@
+"""
+Electricity prices from elprisetjustnu.se (elpris.eu proxy as fallback).
+
+Day-by-day fetching with a shared rate/backoff controller, optional
+concurrency and a local PriceStore cache, parsing into the hourly price
+schema, and a chunked streaming variant for long backfills. The native mode
+(fetch_electricity_prices_native) keeps the 15-minute points as a compact
+intraday.PriceSeries instead of reducing them to hours.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import requests
+
+from .. import metrics
+from ..price_store import PriceStore
+from ._dates import _stream_chunks
+from .intraday import PriceSeries
+from .schema import ELECTRICITY_PRICES_RAW, conform, fetched_prices_schema
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Electricity Price Functions
+# =============================================================================
+
+# Earliest date with historical data according to elprisetjustnu.se docs
+ELPRICE_EARLIEST_DATE = date(2022, 11, 1)
+
+# Use .env if available, otherwise fall back to sane defaults
+DEFAULT_PRICE_AREA = os.getenv("ELPRICE_AREA", "SE3")
+PRICE_AREAS = ["SE1", "SE2", "SE3", "SE4"]
+ELPRICE_BASE_URL = os.getenv(
+    "ELPRICE_BASE_URL",
+    "https://www.elprisetjustnu.se/api/v1/prices"
+)
+ELPRICE_PROXY_BASE_URL = "https://api.elpris.eu/api/v1/prices"
+
+
+try:
+    # Optional fast JSON decoder for the per-day price payloads
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+
+def _build_elprisetjustnu_url(target_date: date, price_area: str) -> str:
+    year = target_date.year
+    month = f"{target_date.month:02d}"
+    day = f"{target_date.day:02d}"
+    return f"{ELPRICE_BASE_URL}/{year}/{month}-{day}_{price_area}.json"
+
+
+def _build_proxy_legacy_url(target_date: date, price_area: str) -> str:
+    """
+    Elpris Proxy API in legacy=1 mode.
+    Always returns 24 hourly prices (aggregated from 15 min if needed).
+    """
+    year = target_date.year
+    month = f"{target_date.month:02d}"
+    day = f"{target_date.day:02d}"
+    return f"{ELPRICE_PROXY_BASE_URL}/{year}/{month}-{day}_{price_area}.json?legacy=1"
+
+
+def _build_proxy_url(target_date: date, price_area: str) -> str:
+    """Elpris Proxy API at native resolution (96 quarter-hours per day)."""
+    year = target_date.year
+    month = f"{target_date.month:02d}"
+    day = f"{target_date.day:02d}"
+    return f"{ELPRICE_PROXY_BASE_URL}/{year}/{month}-{day}_{price_area}.json"
+
+
+# Adaptive request-rate bounds (requests/s) for price fetching; an uncapped
+# controller cuts from PRICE_RATE_MAX on its first 429/5xx
+PRICE_RATE_MIN = 0.5
+PRICE_RATE_MAX = 20.0
+# Attempts per source (proxy, direct) for one day
+PRICE_FETCH_ATTEMPTS = 3
+# Longest Retry-After honoured before the request is retried anyway
+RETRY_AFTER_MAX = 120.0
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = when.timestamp() - time.time()
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
+
+
+class _SourceHealth:
+    """
+    Consecutive-failure breaker for one price source.
+
+    After `threshold` failures in a row the source is skipped for `cooldown`
+    seconds; the next request after that probes it again.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def available(self, now: float) -> bool:
+        return self.failures < self.threshold or now >= self.open_until
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.open_until = now + self.cooldown
+
+
+class PriceFetchController:
+    """
+    Shared request pacing, backoff and source health for price fetching.
+    
+    Requests are paced at initial_rate (None = unlimited). With adaptive, a
+    429 or 5xx cuts the rate by `decrease` (at most once per second, so a
+    burst of throttled in-flight requests counts as one signal) and every
+    healthy response raises it by the factor `increase` until it is back at
+    initial_rate, so healthy traffic runs at the configured rate throughout.
+    A Retry-After header pauses all workers until it has passed. Retries of
+    a single request wait an exponentially growing, jittered delay.
+    
+    Proxy and direct sources keep separate health: a source that keeps
+    failing (transport errors, 5xx) is skipped for `cooldown` seconds instead
+    of costing every day its full set of attempts.
+    
+    Args:
+        initial_rate: Rate cap in requests/s (None = unlimited); the adaptive
+            rate starts here and never exceeds it
+        adaptive: Cut the rate on 429/5xx and recover it on healthy responses
+        min_rate: Lower bound for the adaptive rate
+        max_rate: Rate the first cut starts from when initial_rate is None
+        increase: Multiplicative increase per healthy response while cut
+        decrease: Multiplicative decrease factor on 429/5xx
+        backoff_base: First retry delay in seconds
+        backoff_cap: Longest retry delay in seconds
+        failure_threshold: Consecutive failures before a source is skipped
+        cooldown: Seconds a failing source is skipped
+    """
+    
+    def __init__(
+        self,
+        initial_rate: Optional[float] = None,
+        adaptive: bool = False,
+        min_rate: float = PRICE_RATE_MIN,
+        max_rate: float = PRICE_RATE_MAX,
+        increase: float = 1.1,
+        decrease: float = 0.5,
+        backoff_base: float = 0.25,
+        backoff_cap: float = 30.0,
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+    ):
+        if initial_rate is not None and initial_rate <= 0:
+            raise ValueError("initial_rate must be positive")
+        self.rate = initial_rate
+        self.cap = initial_rate
+        self.adaptive = adaptive
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._health: dict[str, _SourceHealth] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until the next request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.rate is None:
+                    return
+                else:
+                    self._tokens = min(1.0, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def _source(self, source: str) -> _SourceHealth:
+        health = self._health.get(source)
+        if health is None:
+            health = self._health[source] = _SourceHealth(self.failure_threshold, self.cooldown)
+        return health
+    
+    def source_available(self, source: str) -> bool:
+        with self._lock:
+            return self._source(source).available(time.monotonic())
+    
+    def record_success(self, source: str) -> None:
+        """A usable response (200 or 404) from `source`."""
+        with self._lock:
+            self._source(source).record_success()
+            if self.adaptive and self.rate is not None and self.rate != self.cap:
+                ceiling = self.cap if self.cap is not None else self.max_rate
+                rate = self.rate * self.increase
+                # Back at the configured pacing (unlimited again if uncapped)
+                self.rate = rate if rate < ceiling else self.cap
+    
+    def record_failure(
+        self,
+        source: str,
+        throttled: bool = False,
+        retry_after: Optional[float] = None,
+        unhealthy: bool = True,
+    ) -> None:
+        """
+        A failed attempt at `source`.
+        
+        Args:
+            source: Source label ("proxy" or "direct")
+            throttled: The server signalled overload (429 or 5xx); slows down
+                all workers
+            retry_after: Seconds from a Retry-After header
+            unhealthy: Count towards skipping the source (False for 429, which
+                says the source is up but busy)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if unhealthy:
+                self._source(source).record_failure(now)
+            if throttled and self.adaptive and now - self._last_decrease >= 1.0:
+                rate = self.rate if self.rate is not None else self.max_rate
+                self.rate = max(self.min_rate, rate * self.decrease)
+                self._tokens = min(self._tokens, 0.0)
+                self._updated = now
+                self._last_decrease = now
+    
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry number `attempt` (0-based) of one request."""
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** attempt)
+        # Equal jitter: keep half the delay, randomize the rest
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+def fetch_electricity_prices_for_date(
+    target_date: date,
+    price_area: str = DEFAULT_PRICE_AREA,
+    session: Optional[requests.Session] = None,
+    controller: Optional[PriceFetchController] = None,
+    native: bool = False,
+) -> list:
+    """
+    Fetch electricity prices for a specific date and price area.
+    
+    Primary source: Elpris Proxy API (mirrors elprisetjustnu.se) with legacy=1,
+    which should return 24 hourly values (aggregated from 15-min if needed).
+    Fallback: the original elprisetjustnu.se endpoint.
+    With native=True the original endpoint comes first and the proxy is
+    asked for its native resolution, so quarter-hour days keep 96 records.
+    
+    Failed attempts are retried with jittered exponential backoff, honouring
+    Retry-After. A source the controller currently considers unhealthy is
+    skipped while another source is available.
+    
+    Args:
+        target_date: Day to fetch
+        price_area: Swedish price area (SE1, SE2, SE3, SE4)
+        session: Optional requests session to reuse connections
+        controller: Optional shared PriceFetchController for pacing, backoff and
+            source health (an unpaced, non-adaptive one is used if omitted)
+        native: Request the native (15-minute) resolution
+    
+    Returns:
+        List of dict records for that day (may be empty if no data).
+    """
+    if native:
+        sources = [
+            ("direct", _build_elprisetjustnu_url(target_date, price_area)),
+            ("proxy", _build_proxy_url(target_date, price_area)),
+        ]
+    else:
+        sources = [
+            ("proxy", _build_proxy_legacy_url(target_date, price_area)),
+            ("direct", _build_elprisetjustnu_url(target_date, price_area)),
+        ]
+    
+    if controller is None:
+        controller = PriceFetchController()
+    sources = [s for s in sources if controller.source_available(s[0])] or sources
+    
+    client = session if session is not None else requests
+    
+    for source, url in sources:
+        for attempt in range(PRICE_FETCH_ATTEMPTS):
+            # No backoff after the last attempt: move on to the next source
+            last_attempt = attempt == PRICE_FETCH_ATTEMPTS - 1
+            controller.acquire()
+            started = time.perf_counter()
+            try:
+                resp = client.get(url, timeout=10)
+            except requests.RequestException:
+                # Connection or other transport error, backoff and retry
+                metrics.inc("elprice_http_retries_total", api="elpris", reason="transport")
+                controller.record_failure(source)
+                if last_attempt or not controller.source_available(source):
+                    break
+                time.sleep(controller.backoff_delay(attempt))
+                continue
+            
+            if metrics.METRICS.enabled:
+                metrics.observe("elprice_http_request_seconds", time.perf_counter() - started, api="elpris", source=source)
+                metrics.inc("elprice_http_responses_total", api="elpris", status=resp.status_code)
+                metrics.inc("elprice_http_response_bytes_total", len(resp.content), api="elpris")
+            
+            # No data for this date at this source
+            if resp.status_code == 404:
+                controller.record_success(source)
+                break
+            
+            # Rate limited or server error: slow everyone down, back off and retry same URL
+            if resp.status_code == 429 or resp.status_code >= 500:
+                reason = "rate_limited" if resp.status_code == 429 else "status"
+                metrics.inc("elprice_http_retries_total", api="elpris", reason=reason)
+                retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+                controller.record_failure(
+                    source, throttled=True, retry_after=retry_after,
+                    unhealthy=resp.status_code != 429,
+                )
+                if last_attempt or not controller.source_available(source):
+                    break
+                time.sleep(controller.backoff_delay(attempt, retry_after))
+                continue
+            
+            # Other non-success codes, backoff and retry
+            if resp.status_code != 200:
+                metrics.inc("elprice_http_retries_total", api="elpris", reason="status")
+                controller.record_failure(source)
+                if last_attempt or not controller.source_available(source):
+                    break
+                time.sleep(controller.backoff_delay(attempt))
+                continue
+            
+            controller.record_success(source)
+            
+            # Status 200, try to parse JSON
+            try:
+                data = _json_loads(resp.content)
+            except ValueError:
+                data = []
+            
+            if data:
+                return data
+            
+            # Empty response, no point in retrying this URL again
+            break
+    
+    return []
+
+
+def _pooled_session(pool_size: int) -> requests.Session:
+    """Create a requests session whose connection pool fits `pool_size` workers."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _fetch_days_serial(
+    jobs: list[tuple[date, str]],
+    session: requests.Session,
+    show_progress: bool,
+    request_pause: float,
+    controller: PriceFetchController,
+    native: bool = False,
+) -> list[list]:
+    """
+    Fetch (day, price_area) jobs one at a time.
+    
+    With an adaptive controller the pacing comes from the controller alone;
+    otherwise the original fixed pauses are kept.
+    """
+    from tqdm import tqdm
+    
+    iterator = range(len(jobs))
+    if show_progress:
+        iterator = tqdm(iterator, desc="Fetching prices")
+    
+    results: list[list] = []
+    for i in iterator:
+        day, price_area = jobs[i]
+        results.append(
+            fetch_electricity_prices_for_date(
+                day, price_area=price_area, session=session, controller=controller, native=native
+            )
+        )
+        
+        if controller.adaptive:
+            continue
+        # Rate-limit: pause between requests
+        if request_pause:
+            time.sleep(request_pause)
+        # Additional small delay every 100 requests to be nice to the API
+        if i > 0 and i % 100 == 0:
+            time.sleep(0.5)
+    
+    return results
+
+
+def _fetch_days_concurrent(
+    jobs: list[tuple[date, str]],
+    session: requests.Session,
+    show_progress: bool,
+    max_workers: int,
+    controller: PriceFetchController,
+    native: bool = False,
+) -> list[list]:
+    """
+    Fetch (day, price_area) jobs on a bounded thread pool.
+    
+    All workers share one session and one controller, so the request rate is
+    set by the controller rather than by fixed sleeps. Results are returned
+    in the same order as `jobs`.
+    """
+    from tqdm import tqdm
+    
+    def _fetch(job: tuple[date, str]) -> list:
+        day, price_area = job
+        return fetch_electricity_prices_for_date(
+            day, price_area=price_area, session=session, controller=controller, native=native
+        )
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="elpris") as pool:
+        results = pool.map(_fetch, jobs)
+        if show_progress:
+            results = tqdm(results, total=len(jobs), desc="Fetching prices")
+        return list(results)
+
+
+def _default_price_controller(
+    max_workers: int,
+    request_pause: float,
+    requests_per_second: Optional[float],
+    adaptive: bool,
+) -> PriceFetchController:
+    """
+    Controller for one fetch: concurrent mode is paced at requests_per_second.
+    Serial mode keeps its fixed pauses and an unpaced controller, unless
+    adaptive, which paces it at 1/request_pause requests/s instead.
+    """
+    if max_workers > 1:
+        return PriceFetchController(requests_per_second, adaptive=adaptive)
+    if not adaptive:
+        return PriceFetchController()
+    return PriceFetchController(1.0 / request_pause if request_pause else None, adaptive=True)
+
+
+def _fetch_price_jobs(
+    jobs: list[tuple[date, str]],
+    show_progress: bool,
+    request_pause: float,
+    max_workers: int,
+    requests_per_second: Optional[float],
+    adaptive: bool = False,
+    controller: Optional[PriceFetchController] = None,
+    native: bool = False,
+) -> list[list]:
+    """Fetch raw records for (day, price_area) jobs over one shared session."""
+    if controller is None:
+        controller = _default_price_controller(max_workers, request_pause, requests_per_second, adaptive)
+    if max_workers > 1:
+        session = _pooled_session(max_workers)
+        return _fetch_days_concurrent(
+            jobs, session, show_progress, max_workers, controller, native
+        )
+    session = requests.Session()
+    return _fetch_days_serial(jobs, session, show_progress, request_pause, controller, native)
+
+
+def _resolve_price_date_range(start_date: date, end_date: date) -> list[date]:
+    """Parse, clamp and validate a price date range; return every day in it."""
+    # Accept strings for convenience
+    if isinstance(start_date, str):
+        start_date = date.fromisoformat(start_date)
+    if isinstance(end_date, str):
+        end_date = date.fromisoformat(end_date)
+    
+    # Clamp to earliest available date
+    if start_date < ELPRICE_EARLIEST_DATE:
+        logger.info(
+            f"Start date {start_date} is before earliest available "
+            f"{ELPRICE_EARLIEST_DATE}. Adjusting."
+        )
+        start_date = ELPRICE_EARLIEST_DATE
+    
+    if end_date < start_date:
+        raise ValueError("end_date cannot be earlier than start_date")
+    
+    total_days = (end_date - start_date).days + 1
+    return [start_date + timedelta(days=i) for i in range(total_days)]
+
+
+def fetch_electricity_prices(
+    start_date: date,
+    end_date: date,
+    price_area: str = DEFAULT_PRICE_AREA,
+    show_progress: bool = True,
+    request_pause: float = 0.5,
+    max_workers: int = 1,
+    requests_per_second: Optional[float] = 4.0,
+    store: Optional[PriceStore] = None,
+    adaptive: bool = False,
+    controller: Optional[PriceFetchController] = None,
+) -> pd.DataFrame:
+    """
+    Fetch electricity prices for a date range.
+    
+    Uses Elpris Proxy API (legacy=1) when possible to always get 24 hourly
+    values per day, and falls back to the original elprisetjustnu.se API.
+    
+    The start_date is automatically clamped to the earliest available date
+    (2022-11-01) to avoid unnecessary requests.
+    
+    With max_workers > 1 days are fetched concurrently, paced by one shared
+    PriceFetchController instead of sleeping request_pause after every day.
+    The returned DataFrame is identical to the serial path.
+    
+    With adaptive=True the request rate is cut on 429/5xx and recovers to
+    requests_per_second (concurrent) or 1/request_pause (serial, replacing the
+    fixed pauses) while responses are healthy; see PriceFetchController.
+    
+    If a local PriceStore is given, days it already holds completely are read
+    from disk and only missing or incomplete days are fetched from the network.
+    Newly fetched complete days are written back to the store.
+    
+    Args:
+        start_date: Start date (inclusive)
+        end_date: End date (inclusive)
+        price_area: Swedish price area (SE1, SE2, SE3, SE4)
+        show_progress: Whether to show progress bar
+        request_pause: Seconds to pause between day-requests to avoid rate limits
+            (serial mode only)
+        max_workers: Number of days fetched in parallel (1 = serial)
+        requests_per_second: Shared request rate cap in concurrent mode
+            (None = unlimited)
+        store: Optional local price store to read from and fill incrementally
+        adaptive: Slow down on 429/5xx and recover while healthy
+        controller: Optional PriceFetchController shared across calls; overrides
+            requests_per_second and adaptive
+        
+    Returns:
+        DataFrame with hourly electricity prices
+    """
+    dates = _resolve_price_date_range(start_date, end_date)
+    start_date, end_date = dates[0], dates[-1]
+    
+    stored = None
+    if store is not None:
+        cached_days = store.complete_days(price_area, start_date, end_date)
+        if cached_days:
+            stored = store.read(price_area, start_date, end_date)
+            dates = [d for d in dates if d not in cached_days]
+        logger.info(f"Local price store: {len(cached_days)} day(s) cached, {len(dates)} day(s) to fetch")
+    
+    if dates:
+        logger.info(f"Fetching electricity prices from {start_date} to {end_date} for {price_area}...")
+        
+        with metrics.timer("elprice_stage_seconds", pipeline="prices", stage="fetch"):
+            day_records = _fetch_price_jobs(
+                [(d, price_area) for d in dates],
+                show_progress, request_pause, max_workers, requests_per_second,
+                adaptive, controller,
+            )
+        df = _price_records_to_frame(dates, day_records, price_area)
+    else:
+        df = pd.DataFrame()
+    
+    if store is None:
+        return df
+    
+    if not df.empty:
+        store.write(price_area, df)
+    if stored is None or stored.empty:
+        return df
+    if df.empty:
+        return stored
+    return pd.concat([stored, df], ignore_index=True).sort_values('timestamp').reset_index(drop=True)
+
+
+def fetch_electricity_prices_multi_area(
+    start_date: date,
+    end_date: date,
+    price_areas: list[str] = PRICE_AREAS,
+    show_progress: bool = True,
+    request_pause: float = 0.5,
+    max_workers: int = 8,
+    requests_per_second: Optional[float] = 4.0,
+    store: Optional[PriceStore] = None,
+    adaptive: bool = False,
+    controller: Optional[PriceFetchController] = None,
+) -> pd.DataFrame:
+    """
+    Fetch electricity prices for several price areas in one call.
+    
+    Every (area, day) request goes through one pooled session and one
+    PriceFetchController, so the areas share the connections, the backoff and
+    the source health. The rate budget is per area: the shared controller is
+    paced at requests_per_second times the number of areas (and the serial
+    pause divided by it), so each area is fetched at the rate a single-area
+    call would use and four areas take about as long as one.
+    
+    Args:
+        start_date: Start date (inclusive)
+        end_date: End date (inclusive)
+        price_areas: Price areas to fetch (default: SE1-SE4)
+        show_progress: Whether to show progress bar
+        request_pause: Seconds to pause between requests of one area (serial
+            mode only)
+        max_workers: Number of requests in flight (1 = serial)
+        requests_per_second: Request rate cap per area in concurrent mode
+            (None = unlimited)
+        store: Optional local price store to read from and fill incrementally
+        adaptive: Slow down on 429/5xx and recover while healthy
+        controller: Optional PriceFetchController shared across calls; its
+            own rate applies to all areas together
+        
+    Returns:
+        Long DataFrame with hourly prices for all areas. `price_area` is a
+        categorical column ordered as in `price_areas`.
+    """
+    price_areas = list(dict.fromkeys(price_areas))
+    dates = _resolve_price_date_range(start_date, end_date)
+    start_date, end_date = dates[0], dates[-1]
+    
+    frames: list[pd.DataFrame] = []
+    pending: dict[str, list[date]] = {}
+    for area in price_areas:
+        area_dates = dates
+        if store is not None:
+            cached_days = store.complete_days(area, start_date, end_date)
+            if cached_days:
+                frames.append(store.read(area, start_date, end_date))
+                area_dates = [d for d in dates if d not in cached_days]
+            logger.info(f"Local price store ({area}): {len(cached_days)} day(s) cached, {len(area_dates)} day(s) to fetch")
+        pending[area] = area_dates
+    
+    jobs = [(d, area) for area in price_areas for d in pending[area]]
+    if jobs:
+        logger.info(
+            f"Fetching electricity prices from {start_date} to {end_date} "
+            f"for {', '.join(price_areas)} ({len(jobs)} request(s))..."
+        )
+        # One rate budget per area on the shared controller
+        n_areas = len(price_areas)
+        if requests_per_second is not None:
+            requests_per_second *= n_areas
+        with metrics.timer("elprice_stage_seconds", pipeline="prices", stage="fetch"):
+            job_records = _fetch_price_jobs(
+                jobs, show_progress, request_pause / n_areas, max_workers, requests_per_second,
+                adaptive, controller,
+            )
+        
+        offset = 0
+        for area in price_areas:
+            area_dates = pending[area]
+            area_records = job_records[offset:offset + len(area_dates)]
+            offset += len(area_dates)
+            if not area_dates:
+                continue
+            df_area = _price_records_to_frame(area_dates, area_records, area)
+            if store is not None and not df_area.empty:
+                store.write(area, df_area)
+            frames.append(df_area)
+    
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    
+    df = pd.concat(frames, ignore_index=True)
+    df['price_area'] = pd.Categorical(df['price_area'], categories=price_areas)
+    return df.sort_values(['price_area', 'timestamp']).reset_index(drop=True)
+
+
+def fetch_electricity_prices_native(
+    start_date: date,
+    end_date: date,
+    price_area: str = DEFAULT_PRICE_AREA,
+    show_progress: bool = True,
+    request_pause: float = 0.5,
+    max_workers: int = 1,
+    requests_per_second: Optional[float] = 4.0,
+    adaptive: bool = False,
+    controller: Optional[PriceFetchController] = None,
+) -> PriceSeries:
+    """
+    Fetch electricity prices at the API's native resolution.
+    
+    Opt-in counterpart of fetch_electricity_prices: quarter-hour days keep
+    all 96 points instead of being averaged to 24 hours, and days before the
+    switch keep their hourly points. The result is a compact PriceSeries
+    (int32 minute offsets + float32 prices); hourly or daily views and lag
+    features are derived from it without refetching.
+    
+    The local PriceStore holds hourly data only and is not used here.
+    
+    Args:
+        start_date: Start date (inclusive)
+        end_date: End date (inclusive)
+        price_area: Swedish price area (SE1, SE2, SE3, SE4)
+        show_progress: Whether to show progress bar
+        request_pause: Seconds to pause between requests (serial mode only)
+        max_workers: Number of days fetched in parallel (1 = serial)
+        requests_per_second: Shared request rate cap in concurrent mode
+        adaptive: Slow down on 429/5xx and recover while healthy
+        controller: Optional PriceFetchController shared across calls
+        
+    Returns:
+        PriceSeries of the range (empty if nothing was returned)
+    """
+    dates = _resolve_price_date_range(start_date, end_date)
+    logger.info(f"Fetching native-resolution prices from {dates[0]} to {dates[-1]} for {price_area}...")
+    
+    with metrics.timer("elprice_stage_seconds", pipeline="prices", stage="fetch"):
+        day_records = _fetch_price_jobs(
+            [(d, price_area) for d in dates],
+            show_progress, request_pause, max_workers, requests_per_second,
+            adaptive, controller, native=True,
+        )
+    return _price_records_to_series(dates, day_records, price_area)
+
+
+# API field -> output column for the price values
+PRICE_VALUE_FIELDS = {
+    'SEK_per_kWh': 'price_sek',
+    'EUR_per_kWh': 'price_eur',
+    'EXR': 'exchange_rate',
+}
+
+
+def _parse_iso_epoch(values: list[str]) -> np.ndarray:
+    """
+    Parse ISO-8601 timestamps with a UTC offset into int64 epoch seconds.
+    
+    The API format ("2024-03-01T00:00:00+01:00") is split into a wall-clock
+    part parsed by NumPy and an offset looked up per distinct suffix; other
+    formats fall back to pandas.
+    """
+    if values and all(len(v) == 25 for v in values):
+        try:
+            wall = np.array([v[:19] for v in values], dtype="datetime64[s]").astype(np.int64)
+            offsets = {}
+            for suffix in {v[19:] for v in values}:
+                sign = -1 if suffix[0] == "-" else 1
+                offsets[suffix] = sign * (int(suffix[1:3]) * 3600 + int(suffix[4:6]) * 60)
+            return wall - np.fromiter((offsets[v[19:]] for v in values), np.int64, len(values))
+        except (ValueError, KeyError, IndexError):
+            pass
+    return pd.to_datetime(pd.Series(values), utc=True).to_numpy().astype("datetime64[s]").astype(np.int64)
+
+
+def _decode_price_day(records: list[dict]) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """
+    Decode one day of price records into typed columns at native resolution.
+    
+    Returns:
+        (epoch seconds, {column: float64 values}) in record order
+    """
+    first = records[0]
+    if 'time_start' in first:
+        time_key = 'time_start'
+    elif 'timestamp' in first:
+        time_key = 'timestamp'
+    else:
+        raise ValueError("Price response missing time_start/timestamp fields")
+    
+    epoch = _parse_iso_epoch([r[time_key] for r in records])
+    columns = {}
+    for field, col in PRICE_VALUE_FIELDS.items():
+        key = field if field in first else (col if col in first else None)
+        if key is not None:
+            columns[col] = np.array([r.get(key) for r in records], dtype=np.float64)
+    return epoch, columns
+
+
+def _parse_price_day(records: list[dict]) -> tuple[np.ndarray, dict[str, np.ndarray], bool]:
+    """
+    Decode one day of price records into typed columns at hourly resolution.
+    
+    Sub-hourly days (e.g. 96 quarter-hours) are reduced to hourly means by
+    reshaping when every hour is complete, or by a bincount over hour starts
+    otherwise.
+    
+    Returns:
+        (hour start epoch seconds, {column: float64 values}, coerced_to_hourly)
+    """
+    epoch, columns = _decode_price_day(records)
+    hour_start = epoch - epoch % 3600
+    if len(hour_start) < 2 or np.all(np.diff(hour_start) > 0):
+        return epoch, columns, False
+    
+    # Sub-hour resolution: average the values within each hour
+    order = np.argsort(epoch, kind="stable")
+    hour_start = hour_start[order]
+    n = len(hour_start)
+    if n % 4 == 0 and np.all(hour_start[::4] == hour_start[3::4]) and np.all(np.diff(hour_start[::4]) > 0):
+        hours = hour_start[::4]
+        reduced = {}
+        for c, v in columns.items():
+            # Mean of the known quarters, as the bincount path below
+            quarters = v[order].reshape(-1, 4)
+            valid = ~np.isnan(quarters)
+            n_valid = valid.sum(axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                reduced[c] = np.where(n_valid > 0, np.where(valid, quarters, 0.0).sum(axis=1) / n_valid, np.nan)
+    else:
+        hours, inverse = np.unique(hour_start, return_inverse=True)
+        reduced = {}
+        for c, v in columns.items():
+            v = v[order]
+            valid = ~np.isnan(v)
+            sums = np.bincount(inverse, weights=np.where(valid, v, 0.0), minlength=len(hours))
+            n_valid = np.bincount(inverse, weights=valid, minlength=len(hours))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                reduced[c] = np.where(n_valid > 0, sums / n_valid, np.nan)
+    return hours, reduced, True
+
+
+def _append_day_columns(values: dict[str, list[np.ndarray]], epochs: list[np.ndarray], columns: dict) -> None:
+    """
+    Add one day's columns (the day's epochs are epochs[-1]); days without a
+    field, before or at this one, get NaN for it.
+    """
+    for col, arr in columns.items():
+        values.setdefault(col, [np.full(len(e), np.nan) for e in epochs[:-1]]).append(arr)
+    for parts in values.values():
+        if len(parts) < len(epochs):
+            parts.append(np.full(len(epochs[-1]), np.nan))
+
+
+def _price_records_to_frame(
+    dates: list[date],
+    day_records: list[list],
+    price_area: str,
+) -> pd.DataFrame:
+    """
+    Turn raw per-day API records into the hourly price schema.
+    
+    Each day is decoded straight into int64 epoch seconds and float price
+    arrays; the DataFrame is built once from the concatenated columns.
+    
+    Args:
+        dates: Requested days
+        day_records: Raw API records for each day in `dates`
+        price_area: Price area label for the output
+        
+    Returns:
+        DataFrame with hourly electricity prices (empty if nothing was returned)
+    """
+    missing_dates: list[date] = []
+    bad_length_dates: list[tuple[date, int]] = []
+    success_days = 0
+    coerced_to_hourly = False
+    
+    epochs: list[np.ndarray] = []
+    values: dict[str, list[np.ndarray]] = {}
+    
+    with metrics.timer("elprice_stage_seconds", pipeline="prices", stage="parse"):
+        for current_date, records in zip(dates, day_records):
+            if not records:
+                missing_dates.append(current_date)
+                continue
+            
+            success_days += 1
+            # For proxy legacy we expect 24 values, so track deviations
+            if len(records) != 24:
+                bad_length_dates.append((current_date, len(records)))
+            
+            epoch, columns, coerced = _parse_price_day(records)
+            coerced_to_hourly |= coerced
+            epochs.append(epoch)
+            _append_day_columns(values, epochs, columns)
+    
+    if not epochs:
+        logger.warning("No electricity price data found!")
+        return pd.DataFrame()
+    
+    if coerced_to_hourly:
+        # Some sources return 15-min granularity (96 rows/day). They were
+        # reduced to hourly so feature store keys align with weather_hourly.
+        logger.info("Coerced electricity prices to hourly resolution (aggregated sub-hour data).")
+        # The per-day API record counts are expected to deviate (e.g., 96 instead of 24).
+        bad_length_dates = []
+    
+    with metrics.timer("elprice_stage_seconds", pipeline="prices", stage="coerce"):
+        epoch = np.concatenate(epochs)
+        order = np.argsort(epoch, kind="stable")
+        epoch = epoch[order]
+        
+        df = pd.DataFrame({
+            # Same units as parsing the API's ISO strings / calendar dates
+            'timestamp': pd.to_datetime(epoch * 10**6, unit='us', utc=True),
+            'date': pd.to_datetime(epoch - epoch % 86400, unit='s'),
+            'hour': ((epoch % 86400) // 3600).astype('int16'),
+            'price_area': price_area,
+        })
+        
+        # Float32 price columns (allow for missing eur/exchange if proxy format
+        # changes; days without a field are NaN)
+        for col in PRICE_VALUE_FIELDS.values():
+            parts = values.get(col)
+            if parts is not None:
+                df[col] = np.concatenate(parts)[order].astype('float32')
+        
+        df = df.dropna(subset=['price_sek']).reset_index(drop=True)
+        # No-op on the columns built above; pins the layout PriceStore reads back
+        df = conform(df, fetched_prices_schema(), copy=False)
+    
+    logger.info(f"Fetched {len(df)} hourly price records across {success_days} day(s)")
+    if missing_dates:
+        preview = ", ".join(str(d) for d in missing_dates[:3])
+        logger.warning(f"Missing price data for {len(missing_dates)} day(s). First missing: {preview}")
+    if bad_length_dates:
+        preview_bad = ", ".join(f"{d} (len={l})" for d, l in bad_length_dates[:3])
+        logger.warning(f"Unexpected record count for {len(bad_length_dates)} day(s). First: {preview_bad}")
+    
+    return df
+
+
+def _price_records_to_series(
+    dates: list[date],
+    day_records: list[list],
+    price_area: str,
+) -> PriceSeries:
+    """Raw per-day API records as a PriceSeries, without reducing sub-hour points."""
+    epochs: list[np.ndarray] = []
+    values: dict[str, list[np.ndarray]] = {}
+    missing_dates: list[date] = []
+    
+    with metrics.timer("elprice_stage_seconds", pipeline="prices", stage="parse"):
+        for current_date, records in zip(dates, day_records):
+            if not records:
+                missing_dates.append(current_date)
+                continue
+            epoch, columns = _decode_price_day(records)
+            epochs.append(epoch)
+            _append_day_columns(values, epochs, columns)
+        
+        columns = {col: np.concatenate(parts) for col, parts in values.items()}
+        epoch = np.concatenate(epochs) if epochs else np.empty(0, np.int64)
+        if columns:
+            # Points with no value at all; a missing price_sek alone is kept
+            # so the other columns' hourly means match _price_records_to_frame
+            keep = ~np.all(np.isnan(np.stack(list(columns.values()))), axis=0)
+            epoch = epoch[keep]
+            columns = {col: v[keep] for col, v in columns.items()}
+        series = PriceSeries.from_epochs(epoch, columns, price_area)
+    
+    if not len(series):
+        logger.warning("No electricity price data found!")
+    else:
+        logger.info(
+            f"Fetched {len(series)} price points across {len(epochs)} day(s) "
+            f"(finest step {series.step_minutes} min, {series.nbytes / 1024:.0f} KiB)"
+        )
+    if missing_dates:
+        preview = ", ".join(str(d) for d in missing_dates[:3])
+        logger.warning(f"Missing price data for {len(missing_dates)} day(s). First missing: {preview}")
+    return series
+
+
+def align_electricity_price_schema(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+    """
+    Align electricity price DataFrame to the stored price schema
+    (schema.ELECTRICITY_PRICES_RAW):
+    - timestamp/date as naive (UTC) datetime64[us]
+    - hour as int32, prices as float32
+
+    Each column is converted at most once and columns that already match are
+    not copied.
+
+    Args:
+        df: Hourly prices
+        inplace: Convert the columns of df itself instead of a new frame
+    """
+    with metrics.timer("elprice_stage_seconds", pipeline="prices", stage="align"):
+        return conform(df, ELECTRICITY_PRICES_RAW, copy=not inplace)
+
+
+def get_today_electricity_prices(price_area: str = DEFAULT_PRICE_AREA) -> pd.DataFrame:
+    """
+    Get today's electricity prices.
+    
+    Args:
+        price_area: Swedish price area
+        
+    Returns:
+        DataFrame with today's hourly prices
+    """
+    today = date.today()
+    df = fetch_electricity_prices(today, today, price_area, show_progress=False)
+    return align_electricity_price_schema(df)
+
+
+def get_tomorrow_electricity_prices(price_area: str = DEFAULT_PRICE_AREA) -> pd.DataFrame:
+    """
+    Get tomorrow's electricity prices (available after ~13:00 today).
+    
+    Args:
+        price_area: Swedish price area
+        
+    Returns:
+        DataFrame with tomorrow's hourly prices, or empty if not yet available
+    """
+    tomorrow = date.today() + timedelta(days=1)
+    df = fetch_electricity_prices(tomorrow, tomorrow, price_area, show_progress=False)
+    return align_electricity_price_schema(df)
+
+
+# =============================================================================
+# Streaming Backfill
+# =============================================================================
+
+def iter_electricity_prices(
+    start_date: date,
+    end_date: date,
+    price_area: str = DEFAULT_PRICE_AREA,
+    chunk: str = "month",
+    **fetch_kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Fetch electricity prices chunk by chunk.
+    
+    Yields one DataFrame per day, week or month in the same schema as
+    fetch_electricity_prices, so a backfill can be written to a sink chunk by
+    chunk while memory stays bounded by the chunk size. Empty chunks are
+    skipped.
+    
+    Args:
+        start_date: Start date (inclusive)
+        end_date: End date (inclusive)
+        price_area: Swedish price area (SE1, SE2, SE3, SE4)
+        chunk: Chunk size, one of "day", "week", "month"
+        **fetch_kwargs: Passed on to fetch_electricity_prices
+            (e.g. max_workers, requests_per_second, store)
+        
+    Yields:
+        DataFrame with hourly electricity prices for one chunk
+    """
+    dates = _resolve_price_date_range(start_date, end_date)
+    fetch_kwargs.setdefault("show_progress", False)
+    if fetch_kwargs.get("controller") is None:
+        # One controller for all chunks, so the learned rate and source health carry over
+        fetch_kwargs["controller"] = _default_price_controller(
+            fetch_kwargs.get("max_workers", 1),
+            fetch_kwargs.get("request_pause", 0.5),
+            fetch_kwargs.get("requests_per_second", 4.0),
+            fetch_kwargs.get("adaptive", False),
+        )
+    
+    for chunk_start, chunk_end in _stream_chunks(dates[0], dates[-1], chunk):
+        df = fetch_electricity_prices(
+            date.fromisoformat(chunk_start),
+            date.fromisoformat(chunk_end),
+            price_area=price_area,
+            **fetch_kwargs,
+        )
+        if not df.empty:
+            yield df
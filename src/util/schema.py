@@ -0,0 +1,209 @@
+"""
+Declarative column layouts and a single-pass dtype converter.
+
+Each Schema lists the dtype of every column of one layout: the hourly price
+frames returned by fetch_electricity_prices and stored by
+align_electricity_price_schema, and the rows of the electricity_prices and
+weather_hourly feature groups. conform() brings a
+frame to a layout in one pass over its columns: a column that already has
+the target dtype is left alone (no copy), every other column is converted
+once, and unix_time (ms) is computed from the schema's time column in the
+same pass.
+
+Naive timestamps are taken as UTC, the convention of the fetchers.
+
+    df = conform(raw_prices, "electricity_prices_raw")           # new frame, unchanged columns shared
+    conform(rows, ELECTRICITY_PRICES, copy=False)                # in place
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional, Union
+
+
+class Schema(NamedTuple):
+    """
+    Column layout.
+
+    Attributes:
+        name: Registry key
+        dtypes: Column -> dtype, in column order
+        time_column: Column unix_time (ms) is derived from, if the layout has one
+    """
+    name: str
+    dtypes: dict
+    time_column: Optional[str] = None
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.dtypes)
+
+
+_CALENDAR = {
+    "weekday": "int8",
+    "is_weekend": "int8",
+    "month": "int8",
+    "season": "int8",
+    "is_holiday": "int8",
+}
+
+_KEYS = {
+    "unix_time": "int64",
+    "date": "datetime64[ns, UTC]",
+    "hour": "int16",
+    "price_area": "string",
+}
+
+# Hourly prices as stored by align_electricity_price_schema
+ELECTRICITY_PRICES_RAW = Schema(
+    "electricity_prices_raw",
+    {
+        "timestamp": "datetime64[us]",
+        "date": "datetime64[us]",
+        "hour": "int32",
+        "price_sek": "float32",
+        "price_eur": "float32",
+        "exchange_rate": "float32",
+    },
+)
+
+# Rows of the electricity_prices feature group
+ELECTRICITY_PRICES = Schema(
+    "electricity_prices",
+    {
+        **_KEYS,
+        "price_sek": "float32",
+        **_CALENDAR,
+        "price_lag_24": "float32",
+        "price_lag_48": "float32",
+        "price_lag_72": "float32",
+        "price_roll3d": "float32",
+    },
+    time_column="date",
+)
+
+# Rows of the weather_hourly feature group
+WEATHER_HOURLY = Schema(
+    "weather_hourly",
+    {
+        **_KEYS,
+        **dict.fromkeys([
+            "temperature_2m", "apparent_temperature",
+            "precipitation", "rain", "snowfall",
+            "cloud_cover",
+            "wind_speed_10m", "wind_speed_100m",
+            "wind_direction_10m", "wind_direction_100m",
+            "wind_gusts_10m",
+            "surface_pressure",
+        ], "float32"),
+        **_CALENDAR,
+    },
+    time_column="date",
+)
+
+SCHEMAS = {s.name: s for s in (ELECTRICITY_PRICES_RAW, ELECTRICITY_PRICES, WEATHER_HOURLY)}
+
+
+@lru_cache(maxsize=None)
+def fetched_prices_schema() -> Schema:
+    """
+    Layout of the frames fetch_electricity_prices returns (and PriceStore
+    reads back): timestamps in the units pandas gives the API's ISO times
+    (us) and calendar dates (s), i.e. ns on pandas 2, which has no others.
+    """
+    import pandas as pd
+
+    ns_only = int(pd.__version__.split(".")[0]) < 3
+    return Schema(
+        "electricity_prices_fetched",
+        {
+            "timestamp": "datetime64[ns, UTC]" if ns_only else "datetime64[us, UTC]",
+            "date": "datetime64[ns]" if ns_only else "datetime64[s]",
+            "hour": "int16",
+            "price_sek": "float32",
+            "price_eur": "float32",
+            "exchange_rate": "float32",
+        },
+    )
+
+_PER_MS = {"ms": 1, "us": 10**3, "ns": 10**6}
+
+
+def get_schema(schema: Union[str, Schema]) -> Schema:
+    if isinstance(schema, Schema):
+        return schema
+    try:
+        return SCHEMAS[schema]
+    except KeyError:
+        raise ValueError(f"Unknown schema {schema!r}, expected one of {sorted(SCHEMAS)}") from None
+
+
+def _convert(series, dtype):
+    """series as dtype, converted at most once (series itself if it already matches)."""
+    import pandas as pd
+
+    target = pd.api.types.pandas_dtype(dtype)
+    if series.dtype == target:
+        return series
+
+    is_tz_target = isinstance(target, pd.DatetimeTZDtype)
+    if not (is_tz_target or target.kind == "M"):
+        return series.astype(target)
+
+    values = series
+    if not pd.api.types.is_datetime64_any_dtype(values.dtype):
+        values = pd.to_datetime(values, utc=True)
+    tz = getattr(values.dtype, "tz", None)
+    if is_tz_target:
+        values = values.dt.tz_localize("UTC") if tz is None else values
+        values = values.dt.tz_convert(target.tz) if str(target.tz) != "UTC" else values
+    elif tz is not None:
+        values = values.dt.tz_convert(None)
+    return values if values.dtype == target else values.astype(target)
+
+
+def unix_time_ms(series):
+    """int64 milliseconds since the epoch of a datetime series (naive = UTC), for any unit."""
+    import numpy as np
+    import pandas as pd
+
+    if not pd.api.types.is_datetime64_any_dtype(series.dtype):
+        series = pd.to_datetime(series, utc=True)
+    dtype = series.dtype
+    unit = dtype.unit if isinstance(dtype, pd.DatetimeTZDtype) else np.datetime_data(dtype)[0]
+    i8 = series.array.asi8
+    if unit == "s":
+        return i8 * 1000
+    return i8 // _PER_MS[unit]
+
+
+def conform(df, schema: Union[str, Schema], copy: bool = True):
+    """
+    Bring the schema's columns of df to their dtypes in one pass.
+
+    Columns not in the schema are kept as they are; schema columns missing
+    from df are not added, except unix_time, which is (re)computed from the
+    time column whenever the schema has one and df contains it.
+
+    Args:
+        df: Frame to convert
+        schema: Schema or its registry name
+        copy: Return a new frame (sharing the unchanged columns) instead of
+            converting df in place
+
+    Returns:
+        The converted frame (df itself if copy is False)
+    """
+    schema = get_schema(schema)
+    out = df.copy(deep=False) if copy else df
+
+    for col, dtype in schema.dtypes.items():
+        if col == "unix_time" or col not in out.columns:
+            continue
+        series = out[col]
+        converted = _convert(series, dtype)
+        if converted is not series:
+            out[col] = converted
+
+    if "unix_time" in schema.dtypes and schema.time_column in out.columns:
+        out["unix_time"] = unix_time_ms(out[schema.time_column])
+    return out
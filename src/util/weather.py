@@ -0,0 +1,685 @@
+"""
+Weather data from Open-Meteo.
+
+Hourly and daily historical weather (archive API), hourly forecasts and
+weighted multi-point weather per price area. openmeteo_requests,
+requests_cache, retry_requests and geopy are imported on first use.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from .. import metrics
+from ._dates import _split_date_range, _stream_chunks
+
+if TYPE_CHECKING:
+    import openmeteo_requests
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Weather Variables Configuration
+# =============================================================================
+
+# Hourly weather variables relevant for electricity price prediction
+# These affect power generation (wind, solar) and consumption (heating/cooling)
+HOURLY_WEATHER_VARIABLES = [
+    # Temperature - drives heating/cooling demand
+    "temperature_2m",
+    "apparent_temperature",
+    
+    # Precipitation - affects hydro power
+    "precipitation",
+    "rain",
+    "snowfall",
+    
+    # Cloud cover - affects solar power
+    "cloud_cover",
+    
+    # Wind - affects wind power generation
+    "wind_speed_10m",
+    "wind_speed_100m",      # Turbine height
+    "wind_direction_10m",
+    "wind_direction_100m",
+    "wind_gusts_10m",
+    
+    # Pressure - weather patterns
+    "surface_pressure",
+]
+
+# Daily weather variables (for aggregated features)
+DAILY_WEATHER_VARIABLES = [
+    "temperature_2m_mean",
+    "temperature_2m_max",
+    "temperature_2m_min",
+    "apparent_temperature_mean",
+    "precipitation_sum",
+    "rain_sum",
+    "snowfall_sum",
+    "wind_speed_10m_max",
+    "wind_gusts_10m_max",
+    "wind_direction_10m_dominant",
+    "sunshine_duration",        # Important for solar!
+    "shortwave_radiation_sum",  # Solar energy
+]
+
+
+# =============================================================================
+# Coordinate Functions
+# =============================================================================
+
+def get_city_coordinates(city_name: str) -> tuple[float, float]:
+    """
+    Get latitude and longitude for a city name.
+    
+    Args:
+        city_name: Name of the city (e.g., "Stockholm")
+        
+    Returns:
+        Tuple of (latitude, longitude) rounded to 4 decimal places
+    """
+    from geopy.geocoders import Nominatim
+    
+    geolocator = Nominatim(user_agent="electricity_price_predictor")
+    location = geolocator.geocode(city_name)
+    
+    if location is None:
+        raise ValueError(f"Could not find coordinates for city: {city_name}")
+    
+    return round(location.latitude, 4), round(location.longitude, 4)
+
+
+# =============================================================================
+# Weather Data Functions
+# =============================================================================
+
+OPENMETEO_ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+OPENMETEO_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+# Archive requests longer than this are split into chunks fetched in parallel
+ARCHIVE_CHUNK_FREQ = "QS"  # quarter start
+ARCHIVE_MAX_WORKERS = 4
+
+_openmeteo_clients: dict[tuple[int, int], "openmeteo_requests.Client"] = {}
+_openmeteo_lock = threading.Lock()
+
+
+def _record_openmeteo_response(response, *args, **kwargs) -> None:
+    """requests response hook feeding Open-Meteo cache, latency and retry metrics."""
+    if not metrics.METRICS.enabled:
+        return
+    from_cache = getattr(response, "from_cache", None)
+    if from_cache is None:
+        # Inner transport response; the cached session reports it again
+        return
+    if from_cache:
+        metrics.inc("elprice_cache_requests_total", api="openmeteo", result="hit")
+        return
+    
+    source = "archive" if "archive" in response.url else "forecast"
+    metrics.inc("elprice_cache_requests_total", api="openmeteo", result="miss")
+    metrics.observe("elprice_http_request_seconds", response.elapsed.total_seconds(), api="openmeteo", source=source)
+    metrics.inc("elprice_http_responses_total", api="openmeteo", status=response.status_code)
+    metrics.inc("elprice_http_response_bytes_total", len(response.content), api="openmeteo")
+    
+    # urllib3 retry history of the retry_requests adapter
+    history = getattr(getattr(response.raw, "retries", None), "history", None) or ()
+    for attempt in history:
+        if attempt.status == 429:
+            reason = "rate_limited"
+        elif attempt.error is not None:
+            reason = "transport"
+        else:
+            reason = "status"
+        metrics.inc("elprice_http_retries_total", api="openmeteo", reason=reason)
+
+
+def _get_openmeteo_client(expire_after: int) -> "openmeteo_requests.Client":
+    """
+    Return the process-wide Open-Meteo client for a given cache expiry.
+    
+    The cached session, retry wrapper and client are built once per process
+    and reused, instead of reopening the SQLite cache on every call. Responses
+    are reported to src.metrics (cache hits/misses, latency, bytes, retries).
+    
+    Args:
+        expire_after: Cache expiry in seconds (-1 = never expire)
+    """
+    key = (os.getpid(), expire_after)
+    client = _openmeteo_clients.get(key)
+    if client is None:
+        with _openmeteo_lock:
+            client = _openmeteo_clients.get(key)
+            if client is None:
+                import openmeteo_requests
+                import requests_cache
+                from retry_requests import retry
+                
+                cache_session = requests_cache.CachedSession('.cache', expire_after=expire_after)
+                cache_session.hooks['response'].append(_record_openmeteo_response)
+                retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
+                client = openmeteo_requests.Client(session=retry_session)
+                _openmeteo_clients[key] = client
+    return client
+
+
+def _hourly_timestamps(hourly) -> pd.DatetimeIndex:
+    """UTC timestamps of an Open-Meteo hourly block."""
+    return pd.date_range(
+        start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
+        end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
+        freq=pd.Timedelta(seconds=hourly.Interval()),
+        inclusive="left"
+    )
+
+
+def _hourly_block_to_frame(
+    block: np.ndarray,
+    timestamp: pd.DatetimeIndex,
+    label_col: str,
+    label: str,
+) -> pd.DataFrame:
+    """
+    Wrap a (variables x hours) float32 block as an hourly weather DataFrame.
+    
+    The transpose of a C-contiguous block is the (hours x variables) layout
+    pandas keeps internally, so the weather columns are not copied.
+    """
+    df = pd.DataFrame(block.T, columns=HOURLY_WEATHER_VARIABLES, copy=False)
+    df.insert(0, 'timestamp', timestamp)
+    
+    # Add metadata columns
+    df[label_col] = label
+    # Define date/hour in Europe/Stockholm to keep calendar-day filters stable.
+    local_wall = timestamp.tz_convert("Europe/Stockholm").tz_localize(None).values
+    local_day = local_wall.astype("datetime64[D]")
+    df['date'] = local_day.astype(object)
+    df['hour'] = ((local_wall - local_day) // np.timedelta64(1, "h")).astype('int16')
+    
+    return df
+
+
+def _hourly_to_frame(response, city: str) -> pd.DataFrame:
+    """
+    Decode the hourly block of one Open-Meteo response into a DataFrame.
+    
+    All HOURLY_WEATHER_VARIABLES are copied once from the FlatBuffers payload
+    into a preallocated float32 block, which the DataFrame wraps without a
+    further copy. Local (Europe/Stockholm) date and hour are derived in one
+    vectorized pass.
+    """
+    hourly = response.Hourly()
+    timestamp = _hourly_timestamps(hourly)
+    
+    block = np.empty((len(HOURLY_WEATHER_VARIABLES), len(timestamp)), dtype=np.float32)
+    for i in range(len(HOURLY_WEATHER_VARIABLES)):
+        block[i] = hourly.Variables(i).ValuesAsNumpy()
+    
+    return _hourly_block_to_frame(block, timestamp, 'city', city)
+
+
+def _fetch_archive_hourly(
+    openmeteo: "openmeteo_requests.Client",
+    latitude: float,
+    longitude: float,
+    chunk: tuple[str, str],
+):
+    """Request one archive date chunk for one location; return the response."""
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "start_date": chunk[0],
+        "end_date": chunk[1],
+        "hourly": HOURLY_WEATHER_VARIABLES,
+        "timezone": "Europe/Stockholm"
+    }
+    return openmeteo.weather_api(OPENMETEO_ARCHIVE_URL, params=params)[0]
+
+
+def get_hourly_historical_weather(
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str,
+    city: str = "Stockholm",
+    chunk_freq: Optional[str] = ARCHIVE_CHUNK_FREQ,
+    max_workers: int = ARCHIVE_MAX_WORKERS,
+) -> pd.DataFrame:
+    """
+    Fetch hourly historical weather data from Open-Meteo Archive API.
+    
+    Long ranges are split into chunks (per quarter by default) that are
+    fetched in parallel and stitched back into one frame.
+    
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        city: City name for labeling
+        chunk_freq: pandas frequency for chunk boundaries (None = one request)
+        max_workers: Number of chunks fetched in parallel
+        
+    Returns:
+        DataFrame with hourly weather data
+    """
+    openmeteo = _get_openmeteo_client(expire_after=-1)
+    
+    chunks = _split_date_range(str(start_date), str(end_date), chunk_freq)
+    
+    logger.info(f"Fetching historical weather for {city} ({latitude}, {longitude})...")
+    logger.info(f"Date range: {start_date} to {end_date} ({len(chunks)} chunk(s))")
+    
+    def _fetch_chunk(chunk: tuple[str, str]):
+        return _fetch_archive_hourly(openmeteo, latitude, longitude, chunk)
+    
+    with metrics.timer("elprice_stage_seconds", pipeline="weather", stage="fetch"):
+        if len(chunks) > 1 and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks)), thread_name_prefix="openmeteo") as pool:
+                responses = list(pool.map(_fetch_chunk, chunks))
+        else:
+            responses = [_fetch_chunk(c) for c in chunks]
+    
+    response = responses[0]
+    logger.info(f"Coordinates: {response.Latitude()}°N {response.Longitude()}°E")
+    logger.info(f"Elevation: {response.Elevation()} m asl")
+    
+    with metrics.timer("elprice_stage_seconds", pipeline="weather", stage="parse"):
+        frames = [_hourly_to_frame(r, city) for r in responses]
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    
+    logger.info(f"Fetched {len(df)} hourly weather records")
+    
+    return df
+
+
+def get_hourly_weather_forecast(
+    latitude: float,
+    longitude: float,
+    city: str = "Stockholm",
+    forecast_days: int = 7
+) -> pd.DataFrame:
+    """
+    Fetch hourly weather forecast from Open-Meteo Forecast API.
+    
+    This is used for predicting future electricity prices.
+    
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+        city: City name for labeling
+        forecast_days: Number of days to forecast (default 7)
+        
+    Returns:
+        DataFrame with hourly weather forecast
+    """
+    # Shared Open-Meteo client with cache (1 hour expiry for forecasts)
+    openmeteo = _get_openmeteo_client(expire_after=3600)
+    
+    url = OPENMETEO_FORECAST_URL
+    
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "hourly": HOURLY_WEATHER_VARIABLES,
+        "forecast_days": forecast_days,
+        "timezone": "Europe/Stockholm"
+    }
+    
+    logger.info(f"Fetching weather forecast for {city} ({latitude}, {longitude})...")
+    
+    with metrics.timer("elprice_stage_seconds", pipeline="weather", stage="fetch"):
+        responses = openmeteo.weather_api(url, params=params)
+    response = responses[0]
+    
+    logger.info(f"Coordinates: {response.Latitude()}°N {response.Longitude()}°E")
+    logger.info(f"Elevation: {response.Elevation()} m asl")
+    
+    with metrics.timer("elprice_stage_seconds", pipeline="weather", stage="parse"):
+        df = _hourly_to_frame(response, city)
+    
+    logger.info(f"Fetched {len(df)} hourly forecast records")
+    
+    return df
+
+
+def get_daily_historical_weather(
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str,
+    city: str = "Stockholm"
+) -> pd.DataFrame:
+    """
+    Fetch daily aggregated historical weather data from Open-Meteo Archive API.
+    
+    Useful for daily summary features like sunshine duration.
+    
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        city: City name for labeling
+        
+    Returns:
+        DataFrame with daily weather data
+    """
+    openmeteo = _get_openmeteo_client(expire_after=-1)
+    
+    url = OPENMETEO_ARCHIVE_URL
+    
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "start_date": start_date,
+        "end_date": end_date,
+        "daily": DAILY_WEATHER_VARIABLES,
+        "timezone": "Europe/Stockholm"
+    }
+    
+    logger.info(f"Fetching daily historical weather for {city}...")
+    
+    with metrics.timer("elprice_stage_seconds", pipeline="weather", stage="fetch"):
+        responses = openmeteo.weather_api(url, params=params)
+    response = responses[0]
+    
+    daily = response.Daily()
+    
+    daily_data = {
+        "date": pd.date_range(
+            start=pd.to_datetime(daily.Time(), unit="s"),
+            end=pd.to_datetime(daily.TimeEnd(), unit="s"),
+            freq=pd.Timedelta(seconds=daily.Interval()),
+            inclusive="left"
+        )
+    }
+    
+    for i, var_name in enumerate(DAILY_WEATHER_VARIABLES):
+        daily_data[var_name] = daily.Variables(i).ValuesAsNumpy()
+    
+    df = pd.DataFrame(data=daily_data)
+    df['city'] = city
+    
+    # Convert to float32
+    numeric_cols = [c for c in df.columns if c not in ['date', 'city']]
+    for col in numeric_cols:
+        df[col] = df[col].astype('float32')
+    
+    df = df.dropna()
+    
+    logger.info(f"Fetched {len(df)} daily weather records")
+    
+    return df
+
+
+def get_yesterday_hourly_weather(
+    latitude: float,
+    longitude: float,
+    city: str = "Stockholm"
+) -> pd.DataFrame:
+    """
+    Convenience helper to fetch yesterday's hourly weather for a location.
+    
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+        city: City name (metadata)
+    
+    Returns:
+        DataFrame with hourly weather records for yesterday.
+    """
+    yesterday = date.today() - timedelta(days=1)
+    iso_date = yesterday.isoformat()
+    
+    df = get_hourly_historical_weather(
+        latitude=latitude,
+        longitude=longitude,
+        start_date=iso_date,
+        end_date=iso_date,
+        city=city,
+    )
+    
+    # Guard against API boundary effects (e.g., extra hours around the requested day).
+    df = df[df["date"] == yesterday]
+    return df
+
+
+# =============================================================================
+# Price-Area Weather (multi-point)
+# =============================================================================
+
+# Representative (latitude, longitude, weight) points per price area. They mix
+# demand centres with wind and hydro regions; weights are relative within an area.
+PRICE_AREA_WEATHER_POINTS: dict[str, list[tuple[float, float, float]]] = {
+    "SE1": [
+        (65.5848, 22.1547, 1.0),   # Luleå
+        (67.8558, 20.2253, 1.0),   # Kiruna
+        (64.7507, 20.9528, 1.0),   # Skellefteå
+        (66.6086, 19.8226, 1.0),   # Jokkmokk (hydro)
+    ],
+    "SE2": [
+        (62.3908, 17.3069, 1.0),   # Sundsvall
+        (63.8258, 20.2630, 1.0),   # Umeå
+        (63.1792, 14.6357, 1.0),   # Östersund (wind/hydro)
+        (62.6323, 17.9379, 1.0),   # Härnösand
+    ],
+    "SE3": [
+        (59.3251, 18.0711, 2.0),   # Stockholm
+        (57.7089, 11.9746, 1.5),   # Göteborg
+        (59.8586, 17.6389, 1.0),   # Uppsala
+        (59.6099, 16.5448, 1.0),   # Västerås
+        (58.4108, 15.6214, 1.0),   # Linköping
+        (59.2753, 15.2134, 1.0),   # Örebro
+    ],
+    "SE4": [
+        (55.6050, 13.0038, 2.0),   # Malmö
+        (56.0465, 12.6945, 1.0),   # Helsingborg
+        (56.0294, 14.1567, 1.0),   # Kristianstad
+        (56.1612, 15.5869, 1.0),   # Karlskrona
+    ],
+}
+
+# Directions are averaged as unit vectors, not as plain degrees
+_DIRECTION_VARIABLES = [i for i, v in enumerate(HOURLY_WEATHER_VARIABLES) if "direction" in v]
+
+
+def _responses_to_cube(responses: list) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    """
+    Decode multi-location responses into one (points x hours x variables) array.
+    
+    All locations of a multi-point request share the same time axis.
+    """
+    hourly = responses[0].Hourly()
+    timestamp = _hourly_timestamps(hourly)
+    
+    # Filled as (points, variables, hours) so each copy is contiguous
+    cube = np.empty((len(responses), len(HOURLY_WEATHER_VARIABLES), len(timestamp)), dtype=np.float32)
+    for p, response in enumerate(responses):
+        hourly = response.Hourly()
+        for i in range(len(HOURLY_WEATHER_VARIABLES)):
+            cube[p, i] = hourly.Variables(i).ValuesAsNumpy()
+    
+    return timestamp, cube.transpose(0, 2, 1)
+
+
+def _weighted_area_block(cube: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Reduce a (points x hours x variables) cube to a (variables x hours) block.
+    
+    Uses a NaN-aware weighted mean over points; wind directions are averaged
+    on the unit circle.
+    """
+    valid = ~np.isnan(cube)
+    w = weights.astype(np.float32)[:, None, None] * valid
+    values = np.where(valid, cube, 0.0)
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total_w = w.sum(axis=0)
+        mean = (w * values).sum(axis=0) / total_w
+        
+        if _DIRECTION_VARIABLES:
+            rad = np.deg2rad(values[:, :, _DIRECTION_VARIABLES])
+            wd = w[:, :, _DIRECTION_VARIABLES]
+            sin_sum = (wd * np.sin(rad)).sum(axis=0)
+            cos_sum = (wd * np.cos(rad)).sum(axis=0)
+            direction = np.rad2deg(np.arctan2(sin_sum, cos_sum)) % 360.0
+            # arctan2(0, 0) is 0: hours without any valid point stay NaN
+            mean[:, _DIRECTION_VARIABLES] = np.where(wd.sum(axis=0) > 0, direction, np.nan)
+    
+    return np.ascontiguousarray(mean.T, dtype=np.float32)
+
+
+def get_price_area_hourly_weather(
+    price_areas: Optional[list[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    forecast_days: int = 7,
+    area_points: Optional[dict[str, list[tuple[float, float, float]]]] = None,
+    chunk_freq: Optional[str] = ARCHIVE_CHUNK_FREQ,
+    max_workers: int = ARCHIVE_MAX_WORKERS,
+) -> pd.DataFrame:
+    """
+    Fetch hourly weather for many points and aggregate it per price area.
+    
+    All points of all requested areas go into one batched Open-Meteo request
+    (one per chunk for long archive ranges), and the per-area features are a
+    weighted mean over the area's points computed on a
+    (points x hours x variables) array.
+    
+    With start_date/end_date the Archive API is used, otherwise the Forecast
+    API with forecast_days.
+    
+    Args:
+        price_areas: Areas to fetch (default: all areas in area_points)
+        start_date: Start date in YYYY-MM-DD format (historical mode)
+        end_date: End date in YYYY-MM-DD format (historical mode)
+        forecast_days: Number of days to forecast (forecast mode)
+        area_points: (lat, lon, weight) points per area
+            (default: PRICE_AREA_WEATHER_POINTS)
+        chunk_freq: pandas frequency for archive chunk boundaries
+        max_workers: Number of archive chunks fetched in parallel
+        
+    Returns:
+        Long DataFrame with one row per area and hour: timestamp, weather
+        variables, price_area, date, hour
+    """
+    area_points = area_points if area_points is not None else PRICE_AREA_WEATHER_POINTS
+    price_areas = price_areas if price_areas is not None else list(area_points)
+    
+    missing = [a for a in price_areas if not area_points.get(a)]
+    if missing:
+        raise ValueError(f"No weather points configured for price area(s): {missing}")
+    
+    points = [pt for area in price_areas for pt in area_points[area]]
+    latitudes = [pt[0] for pt in points]
+    longitudes = [pt[1] for pt in points]
+    
+    historical = start_date is not None or end_date is not None
+    if historical:
+        if start_date is None or end_date is None:
+            raise ValueError("start_date and end_date must be given together")
+        openmeteo = _get_openmeteo_client(expire_after=-1)
+        url = OPENMETEO_ARCHIVE_URL
+        chunks = _split_date_range(str(start_date), str(end_date), chunk_freq)
+        logger.info(f"Fetching historical weather for {', '.join(price_areas)} at {len(points)} point(s)...")
+        logger.info(f"Date range: {start_date} to {end_date} ({len(chunks)} chunk(s))")
+    else:
+        openmeteo = _get_openmeteo_client(expire_after=3600)
+        url = OPENMETEO_FORECAST_URL
+        chunks = [None]
+        logger.info(f"Fetching weather forecast for {', '.join(price_areas)} at {len(points)} point(s)...")
+    
+    def _fetch_chunk(chunk: Optional[tuple[str, str]]):
+        params = {
+            "latitude": latitudes,
+            "longitude": longitudes,
+            "hourly": HOURLY_WEATHER_VARIABLES,
+            "timezone": "Europe/Stockholm"
+        }
+        if chunk is None:
+            params["forecast_days"] = forecast_days
+        else:
+            params["start_date"], params["end_date"] = chunk
+        return _responses_to_cube(openmeteo.weather_api(url, params=params))
+    
+    with metrics.timer("elprice_stage_seconds", pipeline="area_weather", stage="fetch"):
+        if len(chunks) > 1 and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks)), thread_name_prefix="openmeteo") as pool:
+                decoded = list(pool.map(_fetch_chunk, chunks))
+        else:
+            decoded = [_fetch_chunk(c) for c in chunks]
+    
+    if len(decoded) == 1:
+        timestamp, cube = decoded[0]
+    else:
+        timestamp = decoded[0][0].append([d[0] for d in decoded[1:]])
+        cube = np.concatenate([d[1] for d in decoded], axis=1)
+    
+    frames = []
+    offset = 0
+    for area in price_areas:
+        n_points = len(area_points[area])
+        weights = np.asarray([pt[2] for pt in area_points[area]], dtype=np.float32)
+        block = _weighted_area_block(cube[offset:offset + n_points], weights)
+        offset += n_points
+        frames.append(_hourly_block_to_frame(block, timestamp, 'price_area', area))
+    
+    df = pd.concat(frames, ignore_index=True)
+    
+    logger.info(f"Fetched {len(df)} hourly area weather records")
+    
+    return df
+
+
+# =============================================================================
+# Streaming Backfill
+# =============================================================================
+
+def iter_hourly_historical_weather(
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str,
+    city: str = "Stockholm",
+    chunk: str = "month",
+) -> Iterator[pd.DataFrame]:
+    """
+    Fetch hourly historical weather chunk by chunk.
+    
+    Yields one DataFrame per day, week or month in the same schema as
+    get_hourly_historical_weather. The next chunk is requested while the
+    current one is being consumed, so at most two chunks are held in memory.
+    
+    Args:
+        latitude: Location latitude
+        longitude: Location longitude
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        city: City name for labeling
+        chunk: Chunk size, one of "day", "week", "month"
+        
+    Yields:
+        DataFrame with hourly weather data for one chunk
+    """
+    openmeteo = _get_openmeteo_client(expire_after=-1)
+    chunks = _stream_chunks(start_date, end_date, chunk)
+    
+    logger.info(f"Streaming historical weather for {city} ({latitude}, {longitude}) in {len(chunks)} chunk(s)...")
+    
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="openmeteo") as pool:
+        pending = pool.submit(_fetch_archive_hourly, openmeteo, latitude, longitude, chunks[0])
+        for i in range(len(chunks)):
+            response = pending.result()
+            if i + 1 < len(chunks):
+                pending = pool.submit(_fetch_archive_hourly, openmeteo, latitude, longitude, chunks[i + 1])
+            yield _hourly_to_frame(response, city)
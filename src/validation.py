@@ -0,0 +1,175 @@
+"""
+Data-quality checks for the feature-group rows.
+
+Rules are declared per layout (the schema names of src/util/schema.py) as
+column bounds. validate() copies the checked columns once into a float64
+block (one row per rule) and evaluates every bound of every rule in a single
+vectorized comparison, then reports only the failing rules: the number of
+failing rows, the observed range and the index labels of the first few.
+
+NaN values pass a bound (as in Great Expectations' between checks) unless
+the rule is not_null.
+
+    report = validate(df_prices, "electricity_prices")
+    if not report.success:
+        logger.warning(report)
+"""
+
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+
+from . import metrics
+
+
+# Index labels listed per failing rule
+MAX_REPORTED_ROWS = 5
+
+
+class Rule(NamedTuple):
+    """Every value of `column` in [min_value, max_value] (None = unbounded)."""
+    column: str
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    not_null: bool = False
+
+    @property
+    def name(self) -> str:
+        lo = "-inf" if self.min_value is None else f"{self.min_value:g}"
+        hi = "inf" if self.max_value is None else f"{self.max_value:g}"
+        return f"{self.column} in [{lo}, {hi}]" + (", not null" if self.not_null else "")
+
+
+_CALENDAR_RULES = [
+    Rule("hour", 0, 23, not_null=True),
+    Rule("weekday", 0, 6),
+    Rule("is_weekend", 0, 1),
+    Rule("month", 1, 12),
+    Rule("season", 0, 3),
+    Rule("is_holiday", 0, 1),
+]
+
+RULES = {
+    "electricity_prices": [
+        # Prices can occasionally be negative; upper bound is a sanity check
+        Rule("price_sek", -5.0, 50.0, not_null=True),
+        *_CALENDAR_RULES,
+    ],
+    "weather_hourly": [
+        Rule("temperature_2m", -20.0, 40.0),
+        Rule("wind_speed_10m", -0.1, 200.0),
+        Rule("precipitation", -0.1, 500.0),
+        *_CALENDAR_RULES,
+    ],
+}
+
+
+class RuleFailure(NamedTuple):
+    rule: Rule
+    failed: int
+    observed_min: float
+    observed_max: float
+    rows: list
+
+
+class ValidationReport:
+    """
+    Outcome of validate().
+
+    Attributes:
+        rows: Number of rows checked
+        failures: RuleFailure of every failing rule
+        missing_columns: Rule columns the frame does not have (not checked)
+    """
+
+    def __init__(self, rows: int, failures: list[RuleFailure], missing_columns: list[str]):
+        self.rows = rows
+        self.failures = failures
+        self.missing_columns = missing_columns
+
+    @property
+    def success(self) -> bool:
+        return not self.failures
+
+    def to_dict(self) -> dict:
+        return {
+            "success": self.success,
+            "rows": self.rows,
+            "failures": [
+                {
+                    "rule": f.rule.name,
+                    "failed": f.failed,
+                    "observed_min": f.observed_min,
+                    "observed_max": f.observed_max,
+                    "rows": [str(r) for r in f.rows],
+                }
+                for f in self.failures
+            ],
+            "missing_columns": self.missing_columns,
+        }
+
+    def __str__(self) -> str:
+        if self.success:
+            return f"{self.rows} row(s) passed"
+        lines = [f"{len(self.failures)} rule(s) failed on {self.rows} row(s):"]
+        for f in self.failures:
+            lines.append(
+                f"  {f.rule.name}: {f.failed} row(s), observed [{f.observed_min:g}, {f.observed_max:g}], "
+                f"first {list(f.rows)}"
+            )
+        return "\n".join(lines)
+
+
+def validate(df, rules: Union[str, list[Rule]], max_rows: int = MAX_REPORTED_ROWS) -> ValidationReport:
+    """
+    Check df against rules.
+
+    Args:
+        df: Frame to check
+        rules: Rules, or the name of a layout in RULES
+        max_rows: Index labels listed per failing rule
+
+    Returns:
+        ValidationReport (only failing rules are listed)
+    """
+    name = rules if isinstance(rules, str) else "custom"
+    rules = RULES[rules] if isinstance(rules, str) else list(rules)
+
+    with metrics.timer("elprice_stage_seconds", pipeline="validation", stage=name):
+        present = [r for r in rules if r.column in df.columns]
+        missing = sorted({r.column for r in rules} - {r.column for r in present})
+
+        block = np.empty((len(present), len(df)), dtype=np.float64)
+        for i, rule in enumerate(present):
+            block[i] = df[rule.column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        lo = np.array([-np.inf if r.min_value is None else r.min_value for r in present])[:, None]
+        hi = np.array([np.inf if r.max_value is None else r.max_value for r in present])[:, None]
+        not_null = np.array([r.not_null for r in present], dtype=bool)[:, None]
+        with np.errstate(invalid="ignore"):
+            bad = (block < lo) | (block > hi) | (np.isnan(block) & not_null)
+        counts = bad.sum(axis=1)
+
+        failures = []
+        for i in np.flatnonzero(counts):
+            rule = present[i]
+            values = block[i]
+            finite = values[~np.isnan(values)]
+            failures.append(RuleFailure(
+                rule=rule,
+                failed=int(counts[i]),
+                observed_min=float(finite.min()) if finite.size else float("nan"),
+                observed_max=float(finite.max()) if finite.size else float("nan"),
+                rows=df.index[np.flatnonzero(bad[i])[:max_rows]].tolist(),
+            ))
+            metrics.inc("elprice_validation_failures_total", int(counts[i]), rules=name, column=rule.column)
+
+    return ValidationReport(len(df), failures, missing)
+
+
+def check(df, rules: Union[str, list[Rule]]) -> ValidationReport:
+    """validate(), raising ValueError with the report if a rule fails."""
+    report = validate(df, rules)
+    if not report.success:
+        raise ValueError(str(report))
+    return report